@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark grouping triples by (head, relation) pairs for LCWA training on random triples.
+
+Run with ``python benchmarks/lcwa_instances.py``.
+"""
+
+import timeit
+from collections import defaultdict
+
+import click
+import numpy as np
+
+from pykeen.triples.triples_factory import _create_multi_label_instances
+
+
+def _create_multi_label_instances_with_dict(mapped_triples: np.ndarray):
+    """Group the triples with a Python-level loop, as it was done before the sort-based grouping."""
+    instance_to_multi_label = defaultdict(set)
+    for row in mapped_triples:
+        instance_to_multi_label[row[0], row[1]].add(row[2])
+    return {
+        key: list(value)
+        for key, value in instance_to_multi_label.items()
+    }
+
+
+@click.command()
+@click.option('--num-triples', type=int, default=1_000_000, show_default=True)
+@click.option('--num-entities', type=int, default=100_000, show_default=True)
+@click.option('--num-relations', type=int, default=100, show_default=True)
+@click.option('--seed', type=int, default=42, show_default=True)
+def main(num_triples: int, num_entities: int, num_relations: int, seed: int):
+    """Compare the sort-based grouping with the dictionary-based grouping."""
+    generator = np.random.RandomState(seed)
+    mapped_triples = np.stack([
+        generator.randint(num_entities, size=num_triples),
+        generator.randint(num_relations, size=num_triples),
+        generator.randint(num_entities, size=num_triples),
+    ], axis=-1)
+
+    start = timeit.default_timer()
+    pairs, offsets, indices = _create_multi_label_instances(
+        mapped_triples,
+        element_1_index=0,
+        element_2_index=1,
+        label_index=2,
+    )
+    sort_time = timeit.default_timer() - start
+    click.echo(f'sort: {sort_time:.2f}s for {pairs.shape[0]} pairs with {indices.shape[0]} labels')
+
+    start = timeit.default_timer()
+    reference = _create_multi_label_instances_with_dict(mapped_triples)
+    dict_time = timeit.default_timer() - start
+    click.echo(f'dict: {dict_time:.2f}s for {len(reference)} pairs (speed-up: {dict_time / sort_time:.1f}x)')
+
+    for (h, r), start, stop in zip(pairs.tolist(), offsets[:-1], offsets[1:]):
+        if sorted(reference[h, r]) != indices[start:stop].tolist():
+            raise ValueError(f'The groupings differ for ({h}, {r})')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark the backends of :func:`pykeen.triples.utils.load_triples` on a synthetic file.
+
+Run with ``python benchmarks/load_triples.py``. By default, a file with 10M lines is generated.
+"""
+
+import gzip
+import os
+import shutil
+import tempfile
+import timeit
+
+import click
+import numpy as np
+
+from pykeen.triples.utils import load_triples
+
+
+def _write_synthetic_triples(
+    path: str,
+    num_lines: int,
+    num_entities: int,
+    num_relations: int,
+    seed: int,
+    block_size: int = 1_000_000,
+) -> None:
+    """Write random triples with labels of the form ``e{id}`` and ``r{id}`` to a TSV file."""
+    generator = np.random.RandomState(seed)
+    with open(path, 'w') as file:
+        for start in range(0, num_lines, block_size):
+            size = min(block_size, num_lines - start)
+            heads = generator.randint(num_entities, size=size)
+            relations = generator.randint(num_relations, size=size)
+            tails = generator.randint(num_entities, size=size)
+            file.writelines(f'e{h}\tr{r}\te{t}\n' for h, r, t in zip(heads, relations, tails))
+
+
+@click.command()
+@click.option('--num-lines', type=int, default=10_000_000, show_default=True)
+@click.option('--num-entities', type=int, default=1_000_000, show_default=True)
+@click.option('--num-relations', type=int, default=1_000, show_default=True)
+@click.option('--compression', type=click.Choice(['none', 'gz']), default='none', show_default=True)
+@click.option('--num-workers', type=int, help='The number of threads of the pandas backend.')
+@click.option('--seed', type=int, default=42, show_default=True)
+def main(
+    num_lines: int,
+    num_entities: int,
+    num_relations: int,
+    compression: str,
+    num_workers: int,
+    seed: int,
+):
+    """Compare the chunked pandas reader with numpy.loadtxt."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'triples.tsv')
+        click.echo(f'Writing {num_lines} triples to {path}')
+        _write_synthetic_triples(
+            path=path,
+            num_lines=num_lines,
+            num_entities=num_entities,
+            num_relations=num_relations,
+            seed=seed,
+        )
+        if compression == 'gz':
+            with open(path, 'rb') as source, gzip.open(f'{path}.gz', 'wb') as target:
+                shutil.copyfileobj(source, target)
+            os.remove(path)
+            path = f'{path}.gz'
+
+        reference = None
+        for backend in ('pandas', 'numpy'):
+            start = timeit.default_timer()
+            triples = load_triples(path, backend=backend, num_workers=num_workers)
+            elapsed = timeit.default_timer() - start
+            click.echo(f'{backend:>6}: {elapsed:.2f}s ({triples.shape[0] / elapsed:,.0f} triples/s)')
+            if reference is None:
+                reference = triples
+            elif not (reference.astype(str) == triples).all():
+                raise ValueError('The backends returned different triples')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark mapping labeled triples to IDs on random triples.
+
+Run with ``python benchmarks/map_triples.py``.
+"""
+
+import timeit
+
+import click
+import numpy as np
+
+from pykeen.triples.triples_factory import _map_labels_to_ids
+from pykeen.utils import slice_triples
+
+
+def _map_labels_to_ids_with_vectorize(labels: np.ndarray, label_to_id) -> np.ndarray:
+    """Look up every single label in the dictionary, as it was done before the binary search."""
+    return np.vectorize(label_to_id.get)(labels, -1)
+
+
+@click.command()
+@click.option('--num-triples', type=int, default=1_000_000, show_default=True)
+@click.option('--num-entities', type=int, default=100_000, show_default=True)
+@click.option('--num-relations', type=int, default=100, show_default=True)
+@click.option('--seed', type=int, default=42, show_default=True)
+def main(num_triples: int, num_entities: int, num_relations: int, seed: int):
+    """Compare the binary search with the vectorized dictionary lookup."""
+    generator = np.random.RandomState(seed)
+    triples = np.stack([
+        np.char.add('e', generator.randint(num_entities, size=num_triples).astype(str)),
+        np.char.add('r', generator.randint(num_relations, size=num_triples).astype(str)),
+        np.char.add('e', generator.randint(num_entities, size=num_triples).astype(str)),
+    ], axis=-1)
+    entity_to_id = {label: i for i, label in enumerate(sorted(set(triples[:, 0]).union(triples[:, 2])))}
+    relation_to_id = {label: i for i, label in enumerate(sorted(set(triples[:, 1])))}
+    heads, relations, tails = slice_triples(triples)
+
+    mapped_triples, seconds = {}, {}
+    for name, fn in (
+        ('searchsorted', _map_labels_to_ids),
+        ('vectorize', _map_labels_to_ids_with_vectorize),
+    ):
+        start = timeit.default_timer()
+        mapped_triples[name] = np.concatenate([
+            fn(heads, entity_to_id),
+            fn(relations, relation_to_id),
+            fn(tails, entity_to_id),
+        ], axis=1)
+        seconds[name] = timeit.default_timer() - start
+        click.echo(f'{name}: {seconds[name]:.2f}s for {num_triples} triples')
+
+    click.echo(f'speed-up: {seconds["vectorize"] / seconds["searchsorted"]:.1f}x')
+    if not np.array_equal(mapped_triples['searchsorted'], mapped_triples['vectorize']):
+        raise ValueError('The mappings differ')
+
+
+if __name__ == '__main__':
+    main()
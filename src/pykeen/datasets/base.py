@@ -2,14 +2,17 @@
 
 """Utility classes for constructing datasets."""
 
+import hashlib
 import logging
 import os
 import shutil
 import tarfile
 import zipfile
 from abc import abstractmethod
+from functools import lru_cache
 from io import BytesIO
-from typing import Optional, TextIO, Tuple, Union
+from operator import itemgetter
+from typing import Mapping, Optional, TextIO, Tuple, Union
 from urllib.parse import urlparse
 
 import numpy as np
@@ -149,6 +152,7 @@ class PathDataSet(LazyDataSet):
         validation_path: Union[str, TextIO],
         eager: bool = False,
         create_inverse_triples: bool = False,
+        binary_cache: bool = True,
     ) -> None:
         """Initialize the data set.
 
@@ -157,42 +161,120 @@ class PathDataSet(LazyDataSet):
         :param validation_path: Path to the validation triples file or validation triples file.
         :param eager: Should the data be loaded eagerly? Defaults to false.
         :param create_inverse_triples: Should inverse triples be created? Defaults to false.
+        :param binary_cache: Should the parsed triples factories be cached in a binary format? The cache is stored
+         in the ``binary`` directory of the default PyKEEN directory and is keyed by a hash of the contents of the
+         source files, such that subsequent loads skip parsing and mapping the triples entirely. Defaults to true.
         """
         self.training_path = training_path
         self.testing_path = testing_path
         self.validation_path = validation_path
 
         self.create_inverse_triples = create_inverse_triples
+        self.binary_cache = binary_cache
 
         if eager:
             self._load()
             self._load_validation()
 
     def _load(self) -> None:
-        self._training = TriplesFactory(
-            path=self.training_path,
-            create_inverse_triples=self.create_inverse_triples,
-        )
-        self._testing = TriplesFactory(
-            path=self.testing_path,
-            entity_to_id=self._training.entity_to_id,  # share entity index with training
-            relation_to_id=self._training.relation_to_id,  # share relation index with training
-        )
+        self._training = self._load_factory(self.training_path)
+        self._testing = self._load_factory(self.testing_path, reference=self._training)
 
     def _load_validation(self) -> None:
         # don't call this function by itself. assumes called through the `validation`
         # property and the _training factory has already been loaded
-        self._validation = TriplesFactory(
-            path=self.validation_path,
-            entity_to_id=self._training.entity_to_id,  # share entity index with training
-            relation_to_id=self._training.relation_to_id,  # share relation index with training
-        )
+        self._validation = self._load_factory(self.validation_path, reference=self._training)
+
+    def _load_factory(
+        self,
+        path: Union[str, TextIO],
+        reference: Optional[TriplesFactory] = None,
+    ) -> TriplesFactory:
+        """Load a triples factory, either from the binary cache or from the given file.
+
+        :param path: The path to the triples file.
+        :param reference: If given, the loaded factory shares the entity and relation index with this factory.
+            Otherwise, the factory creates its own index and inverse triples, if requested.
+        """
+        if reference is None:
+            kwargs = dict(create_inverse_triples=self.create_inverse_triples)
+        else:
+            kwargs = dict(
+                entity_to_id=reference.entity_to_id,  # share entity index with training
+                relation_to_id=reference.relation_to_id,  # share relation index with training
+            )
+
+        cache_directory = self._get_binary_cache_directory(path, reference=reference)
+        if cache_directory is None:
+            return TriplesFactory(path=path, **kwargs)
+
+        if os.path.isdir(cache_directory):
+            logger.debug('loading %s from binary cache at %s', path, cache_directory)
+            kwargs.pop('create_inverse_triples', None)
+            return TriplesFactory.from_binary(cache_directory, **kwargs)
+
+        rv = TriplesFactory(path=path, **kwargs)
+        # write to a temporary directory first, such that concurrent runs never see a partially written cache
+        temporary_directory = f'{cache_directory}.{os.getpid()}.tmp'
+        try:
+            rv.to_binary(temporary_directory)
+            os.replace(temporary_directory, cache_directory)
+        except OSError as e:
+            shutil.rmtree(temporary_directory, ignore_errors=True)
+            # another process might have written the same cache in the meantime
+            if not os.path.isdir(cache_directory):
+                logger.warning('could not write binary cache for %s to %s: %s', path, cache_directory, e)
+        else:
+            logger.debug('wrote binary cache for %s to %s', path, cache_directory)
+        return rv
+
+    def _get_binary_cache_directory(
+        self,
+        path: Union[str, TextIO],
+        reference: Optional[TriplesFactory] = None,
+    ) -> Optional[str]:
+        """Get the directory of the binary cache for the given triples file, or None if it should not be cached."""
+        if not self.binary_cache or not isinstance(path, str) or not os.path.isfile(path):
+            return None
+        key = hashlib.sha256()
+        key.update(_hash_file(path).encode())
+        if reference is None:
+            key.update(f'create_inverse_triples={self.create_inverse_triples}'.encode())
+        else:
+            # the cached IDs are only valid for exactly the reference's index, which includes its inverse relations
+            key.update(_hash_mapping(reference.entity_to_id).encode())
+            key.update(_hash_mapping(reference.relation_to_id).encode())
+        return os.path.join(PYKEEN_HOME, 'binary', key.hexdigest())
 
     def __repr__(self) -> str:  # noqa: D105
         return f'{self.__class__.__name__}(training_path="{self.training_path}", testing_path="{self.testing_path}",' \
                f' validation_path="{self.validation_path}")'
 
 
+def _hash_file(path: str) -> str:
+    """Compute the SHA-256 hash of a file's contents, reusing the result as long as the file is not modified."""
+    stat = os.stat(path)
+    return _hash_file_contents(os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+def _hash_mapping(mapping: Mapping[str, int]) -> str:
+    """Compute the SHA-256 hash of a label-to-ID mapping, independent of the order of its items."""
+    digest = hashlib.sha256()
+    for label, index in sorted(mapping.items(), key=itemgetter(1)):
+        digest.update(f'{index}\t{label}\n'.encode())
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _hash_file_contents(path: str, mtime_ns: int, size: int, chunk_size: int = 2 ** 20) -> str:
+    """Compute the SHA-256 hash of a file's contents without loading it into memory at once."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
 def _urlretrieve(url, path, clean_on_failure: bool = True) -> None:
     """Download a file from a given URL.
 
@@ -223,6 +305,7 @@ class RemoteDataSet(PathDataSet):
         cache_root: Optional[str] = None,
         eager: bool = False,
         create_inverse_triples: bool = False,
+        binary_cache: bool = True,
     ):
         """Initialize dataset.
 
@@ -231,6 +314,8 @@ class RemoteDataSet(PathDataSet):
         :param cache_root:
             An optional directory to store the extracted files. Is none is given, the default PyKEEN directory is used.
             This is defined either by the environment variable ``PYKEEN_HOME`` or defaults to ``~/.pykeen``.
+        :param binary_cache:
+            Should the parsed triples factories be cached in a binary format, cf. :class:`PathDataSet`?
         """
         if cache_root is None:
             cache_root = PYKEEN_HOME
@@ -249,6 +334,7 @@ class RemoteDataSet(PathDataSet):
             validation_path=validation_path,
             eager=eager,
             create_inverse_triples=create_inverse_triples,
+            binary_cache=binary_cache,
         )
 
     def _get_paths(self) -> Tuple[str, str, str]:  # noqa: D401
@@ -239,7 +239,6 @@ class Evaluator(ABC):
             values_dict[key] = start_value
             values_dict['slice_size'] = None
         elif key == 'slice_size':
-            self._check_slicing_availability(model, batch_size=1)
             values_dict[key] = start_value
             values_dict['batch_size'] = 1
         else:
@@ -299,19 +298,6 @@ class Evaluator(ABC):
 
         return values_dict[key], evaluated_once
 
-    @staticmethod
-    def _check_slicing_availability(model: Model, batch_size: int) -> None:
-        # Test if slicing is implemented for the required functions of this model
-        if model.triples_factory.create_inverse_triples:
-            if not model.can_slice_t:
-                raise MemoryError(f"The current model can't be evaluated on this hardware with these parameters, as "
-                                  f"evaluation batch_size={batch_size} is too big and slicing is not implemented for "
-                                  f"this model yet.")
-        elif not model.can_slice_t or not model.can_slice_h:
-            raise MemoryError(f"The current model can't be evaluated on this hardware with these parameters, as "
-                              f"evaluation batch_size={batch_size} is too big and slicing is not implemented for this "
-                              f"model yet.")
-
 
 def create_sparse_positive_filter_(
     hrt_batch: MappedTriples,
@@ -484,6 +470,10 @@ def evaluate(
     # Send tensors to device
     mapped_triples = mapped_triples.to(device=device)
 
+    # Group the triples by relation, such that relation-specific computations can be shared across the rows of a
+    # batch, and across batches, cf. Model.projection_cache. The metrics do not depend on the order of the triples.
+    mapped_triples = mapped_triples[mapped_triples[:, 1].argsort()]
+
     # Prepare batches
     if batch_size is None:
         batch_size = 1
@@ -495,7 +485,7 @@ def evaluate(
     # Flag to check when to quit the size probing
     evaluated_once = False
 
-    # Disable gradient tracking
+    # Disable gradient tracking, and release the cached projections once the evaluation is over
     with optional_context_manager(
         use_tqdm,
         tqdm(
@@ -506,7 +496,7 @@ def evaluate(
             # Choosing no progress bar (use_tqdm=False) would still show the initial progress bar without disable=True
             disable=not use_tqdm,
         ),
-    ) as progress_bar, torch.no_grad():
+    ) as progress_bar, model.projection_cache, torch.no_grad():
         # batch-wise processing
         for batch in batches:
             batch_size = batch.shape[0]
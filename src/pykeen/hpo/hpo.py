@@ -511,7 +511,7 @@ def hpo_pipeline(
         The name of the training approach (``'slcwa'`` or ``'lcwa'``) or the training loop class
         to pass to :func:`pykeen.pipeline.pipeline`
     :param negative_sampler:
-        The name of the negative sampler (``'basic'`` or ``'bernoulli'``) or the negative sampler class
+        The name of the negative sampler (``'basic'``, ``'bernoulli'``, or ``'unigram'``) or the negative sampler class
         to pass to :func:`pykeen.pipeline.pipeline`. Only allowed when training with sLCWA.
     :param negative_sampler_kwargs:
         Keyword arguments to pass to the negative sampler class on instantiation
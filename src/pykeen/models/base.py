@@ -5,9 +5,13 @@
 import inspect
 import logging
 from abc import abstractmethod
-from collections import defaultdict
-from typing import Any, ClassVar, Collection, Dict, Iterable, List, Mapping, Optional, Set, Type, Union
+from collections import OrderedDict, defaultdict
+from typing import (
+    Any, Callable, ClassVar, Collection, Dict, Hashable, Iterable, List, Mapping, Optional, Sequence, Set, Type,
+    Union,
+)
 
+import numpy as np
 import pandas as pd
 import torch
 from torch import nn
@@ -17,7 +21,7 @@ from ..regularizers import NoRegularizer, Regularizer
 from ..tqdmw import tqdm
 from ..triples import TriplesFactory
 from ..typing import MappedTriples
-from ..utils import NoRandomSeedNecessary, get_embedding, resolve_device, set_random_seed
+from ..utils import NoRandomSeedNecessary, clamp_norm, get_embedding, resolve_device, set_random_seed
 from ..version import get_version
 
 __all__ = [
@@ -25,6 +29,7 @@ __all__ = [
     'EntityEmbeddingModel',
     'EntityRelationEmbeddingModel',
     'MultimodalModel',
+    'ProjectionCache',
 ]
 
 logger = logging.getLogger(__name__)
@@ -39,7 +44,7 @@ UNSUPPORTED_FOR_SUBBATCHING = (  # must be a tuple
 
 def _extend_batch(
     batch: MappedTriples,
-    all_ids: List[int],
+    all_ids: Union[List[int], torch.LongTensor],
     dim: int,
 ) -> MappedTriples:
     """Extend batch for 1-to-all scoring by explicit enumeration.
@@ -58,7 +63,7 @@ def _extend_batch(
     extended_batch = batch.repeat_interleave(repeats=len(all_ids), dim=0)
 
     # Create a tensor of all IDs
-    ids = torch.tensor(all_ids, dtype=torch.long, device=batch.device)
+    ids = torch.as_tensor(all_ids, dtype=torch.long, device=batch.device)
 
     # Extend all IDs to the number of pairs such that each ID can be combined with every pair
     extended_ids = ids.repeat(batch.shape[0])
@@ -71,6 +76,91 @@ def _extend_batch(
     return hrt_batch
 
 
+class ProjectionCache:
+    """A bounded LRU cache for relation-specific projections of all entities.
+
+    Models like :class:`pykeen.models.TransR` project all entities into a relation-specific space in order to score
+    all tails (or heads) for a (head, relation) pair. During evaluation the parameters do not change, so the projection
+    can be shared by all pairs with the same relation. The cache holds at most ``max_entries`` entries and
+    ``max_bytes`` bytes, and evicts the least recently used entries first. Values which do not fit into the memory
+    budget at all are not stored.
+
+    Used as a context manager, the cache is cleared on exit, such that the cached tensors do not stay resident after
+    the scoped computation, e.g. an evaluation.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 128,
+        max_bytes: int = 2 ** 30,
+    ):
+        """Initialize the cache.
+
+        :param max_entries: >=0
+            The maximum number of cached entries. 0 disables the cache.
+        :param max_bytes: >=0
+            The maximum number of bytes occupied by all cached tensors. 0 disables the cache.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data: 'OrderedDict[Hashable, Sequence[torch.Tensor]]' = OrderedDict()
+        self.num_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:  # noqa: D105
+        return len(self._data)
+
+    def __enter__(self) -> 'ProjectionCache':  # noqa: D105
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:  # noqa: D105
+        # scoped usage, e.g. one evaluation: release the memory once it is over
+        self.clear()
+
+    @staticmethod
+    def _get_num_bytes(value: Sequence[torch.Tensor]) -> int:
+        return sum(x.numel() * x.element_size() for x in value)
+
+    def get(
+        self,
+        key: Hashable,
+        compute: Callable[[], Sequence[torch.Tensor]],
+    ) -> Sequence[torch.Tensor]:
+        """Look up the value for the key, or compute and store it.
+
+        :param key: The key, e.g., a pair of a name and a relation ID.
+        :param compute: A function which computes the value, a sequence of tensors, if it is not cached.
+
+        :return: The (cached) value.
+        """
+        value = self._data.get(key)
+        if value is not None:
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        value = tuple(compute())
+        num_bytes = self._get_num_bytes(value)
+        if self.max_entries < 1 or num_bytes > self.max_bytes:
+            return value
+
+        # evict least recently used entries
+        while self._data and (len(self._data) >= self.max_entries or self.num_bytes + num_bytes > self.max_bytes):
+            _, evicted = self._data.popitem(last=False)
+            self.num_bytes -= self._get_num_bytes(evicted)
+
+        self._data[key] = value
+        self.num_bytes += num_bytes
+        return value
+
+    def clear(self) -> None:
+        """Remove all entries, e.g., after the parameters have been updated."""
+        self._data.clear()
+        self.num_bytes = 0
+
+
 class Model(nn.Module):
     """A base module for all of the KGE models."""
 
@@ -91,6 +181,9 @@ class Model(nn.Module):
     regularizer_default_kwargs: ClassVar[Optional[Mapping[str, Any]]] = None
     #: The instance of the regularizer
     regularizer: Regularizer
+    #: Whether the score factorizes as f(encode(h, r), t) with an expensive encoder of (head, relation) pairs, such
+    #: that the sLCWA training loop scores negatives via :meth:`score_t_candidates`, encoding each pair only once
+    factorizes_hr: ClassVar[bool] = False
 
     def __init__(
         self,
@@ -168,20 +261,26 @@ class Model(nn.Module):
         # This allows to store the optimized parameters
         self.automatic_memory_optimization = automatic_memory_optimization
 
+        # The IDs enumerated by the generic 1-to-all scoring functions, cf. Model._get_id_range
+        self._id_range: Optional[torch.LongTensor] = None
+
+        # The relation-specific projections of all entities used for evaluation, cf. Model._get_projection
+        self.projection_cache = ProjectionCache()
+
     @property
     def can_slice_h(self) -> bool:
-        """Whether score_h supports slicing."""
-        return _can_slice(self.score_h)
+        """Whether score_h supports slicing, which is the case for all models, cf. Model.score_h_sliced."""
+        return True
 
     @property
     def can_slice_r(self) -> bool:
-        """Whether score_r supports slicing."""
-        return _can_slice(self.score_r)
+        """Whether score_r supports slicing, which is the case for all models, cf. Model.score_r_sliced."""
+        return True
 
     @property
     def can_slice_t(self) -> bool:
-        """Whether score_t supports slicing."""
-        return _can_slice(self.score_t)
+        """Whether score_t supports slicing, which is the case for all models, cf. Model.score_t_sliced."""
+        return True
 
     @property
     def modules_not_supporting_sub_batching(self) -> Collection[nn.Module]:
@@ -237,6 +336,7 @@ class Model(nn.Module):
         """Transfer model to device."""
         self.to(self.device)
         self.regularizer.to(self.device)
+        self.projection_cache.clear()
         torch.cuda.empty_cache()
         return self
 
@@ -291,10 +391,7 @@ class Model(nn.Module):
         """
         # Enforce evaluation mode
         self.eval()
-        if slice_size is None:
-            scores = self.score_t(hr_batch)
-        else:
-            scores = self.score_t(hr_batch, slice_size=slice_size)
+        scores = self.score_t_sliced(hr_batch, slice_size=slice_size)
         if self.predict_with_sigmoid:
             scores = torch.sigmoid(scores)
         return scores
@@ -332,16 +429,9 @@ class Model(nn.Module):
         relation_id = self.triples_factory.relation_to_id[relation_label]
         rt_batch = torch.tensor([[relation_id, tail_id]], dtype=torch.long, device=self.device)
         scores = self.predict_scores_all_heads(rt_batch)
-        scores = scores[0, :].tolist()
-        rv = pd.DataFrame(
-            [
-                (entity_id, entity_label, scores[entity_id])
-                for entity_label, entity_id in self.triples_factory.entity_to_id.items()
-            ],
-            columns=['head_id', 'head_label', 'score'],
-        ).sort_values('score', ascending=False)
+        rv = self._get_prediction_df(scores=scores[0, :], column='head').sort_values('score', ascending=False)
         if add_novelties or remove_known:
-            rv['novel'] = rv['head_id'].map(lambda head_id: self._novel(head_id, relation_id, tail_id))
+            rv['novel'] = ~rv['head_id'].isin(self.triples_factory.get_known_heads(relation_id, tail_id))
         if remove_known:
             rv = rv[rv['novel']]
             del rv['novel']
@@ -380,25 +470,31 @@ class Model(nn.Module):
         relation_id = self.triples_factory.relation_to_id[relation_label]
         batch = torch.tensor([[head_id, relation_id]], dtype=torch.long, device=self.device)
         scores = self.predict_scores_all_tails(batch)
-        scores = scores[0, :].tolist()
-        rv = pd.DataFrame(
-            [
-                (entity_id, entity_label, scores[entity_id])
-                for entity_label, entity_id in self.triples_factory.entity_to_id.items()
-            ],
-            columns=['tail_id', 'tail_label', 'score'],
-        ).sort_values('score', ascending=False)
+        rv = self._get_prediction_df(scores=scores[0, :], column='tail').sort_values('score', ascending=False)
         if add_novelties or remove_known:
-            rv['novel'] = rv['tail_id'].map(lambda tail_id: self._novel(head_id, relation_id, tail_id))
+            rv['novel'] = ~rv['tail_id'].isin(self.triples_factory.get_known_tails(head_id, relation_id))
         if remove_known:
             rv = rv[rv['novel']]
             del rv['novel']
         return rv
 
+    def _get_prediction_df(self, scores: torch.FloatTensor, column: str) -> pd.DataFrame:
+        """Create a dataframe with the ID, label, and score of each entity.
+
+        :param scores: shape: (num_entities,)
+            The scores of all entities.
+        :param column: The prefix for the ID and label columns, i.e., ``'head'`` or ``'tail'``.
+        """
+        entity_ids = np.fromiter(self.triples_factory.entity_to_id.values(), dtype=np.int64)
+        return pd.DataFrame({
+            f'{column}_id': entity_ids,
+            f'{column}_label': list(self.triples_factory.entity_to_id.keys()),
+            'score': scores.detach().cpu().numpy()[entity_ids],
+        })
+
     def _novel(self, h, r, t) -> bool:
         """Return if the triple is novel with respect to the training triples."""
-        triple = torch.tensor(data=[[h, r, t]], dtype=torch.long, device=self.triples_factory.mapped_triples.device)
-        return (triple == self.triples_factory.mapped_triples).all(dim=1).any().item()
+        return t not in self.triples_factory.get_known_tails(h, r)
 
     def predict_scores_all_relations(
         self,
@@ -421,10 +517,7 @@ class Model(nn.Module):
         """
         # Enforce evaluation mode
         self.eval()
-        if slice_size is None:
-            scores = self.score_r(ht_batch)
-        else:
-            scores = self.score_r(ht_batch, slice_size=slice_size)
+        scores = self.score_r_sliced(ht_batch, slice_size=slice_size)
         if self.predict_with_sigmoid:
             scores = torch.sigmoid(scores)
         return scores
@@ -457,10 +550,7 @@ class Model(nn.Module):
         for a (tail, inverse_relation) pair.
         '''
         if not self.triples_factory.create_inverse_triples:
-            if slice_size is None:
-                scores = self.score_h(rt_batch)
-            else:
-                scores = self.score_h(rt_batch, slice_size=slice_size)
+            scores = self.score_h_sliced(rt_batch, slice_size=slice_size)
             if self.predict_with_sigmoid:
                 scores = torch.sigmoid(scores)
             return scores
@@ -482,17 +572,66 @@ class Model(nn.Module):
 
         # The score_t function requires (entity, relation) pairs instead of (relation, entity) pairs
         rt_batch_cloned = rt_batch_cloned.flip(1)
-        if slice_size is None:
-            scores = self.score_t(rt_batch_cloned)
-        else:
-            scores = self.score_t(rt_batch_cloned, slice_size=slice_size)
+        scores = self.score_t_sliced(rt_batch_cloned, slice_size=slice_size)
         if self.predict_with_sigmoid:
             scores = torch.sigmoid(scores)
         return scores
 
-    def post_parameter_update(self) -> None:
-        """Has to be called after each parameter update."""
+    def post_parameter_update(
+        self,
+        entity_ids: Optional[torch.LongTensor] = None,
+        relation_ids: Optional[torch.LongTensor] = None,
+    ) -> None:
+        """Has to be called after each parameter update.
+
+        Subclasses enforce their constraints on the parameters here. If the IDs of the entities and relations which
+        were used by the batch are given, the constraints are only enforced on the corresponding rows, cf.
+        :meth:`_constrain_rows_`.
+
+        :param entity_ids: shape: (n,)
+            The IDs of the entities whose representations may have changed. If None, all entities may have changed.
+        :param relation_ids: shape: (m,)
+            The IDs of the relations whose representations may have changed. If None, all relations may have changed.
+        """
         self.regularizer.reset()
+        self.projection_cache.clear()
+
+    @staticmethod
+    def _constrain_rows_(
+        weight: torch.Tensor,
+        constraint: Callable[[torch.FloatTensor], torch.FloatTensor],
+        ids: Optional[torch.LongTensor] = None,
+    ) -> None:
+        """Enforce a row-wise constraint on a parameter in-place.
+
+        :param weight: shape: (num_rows, d)
+            The parameter, e.g., the weight of an embedding.
+        :param constraint:
+            A function which maps rows to constrained rows, e.g., :func:`torch.nn.functional.normalize`.
+        :param ids: shape: (n,)
+            The IDs of the rows to constrain. If None, all rows are constrained.
+        """
+        if ids is None:
+            weight.data = constraint(weight.data)
+        else:
+            weight.data[ids] = constraint(weight.data[ids])
+
+    @classmethod
+    def _clamp_rows_(
+        cls,
+        weight: torch.Tensor,
+        ids: Optional[torch.LongTensor] = None,
+        maxnorm: float = 1.,
+    ) -> None:
+        """Clamp the L2 norm of a parameter's rows in-place, cf. :meth:`_constrain_rows_`.
+
+        :param weight: shape: (num_rows, d)
+            The parameter, e.g., the weight of an embedding.
+        :param ids: shape: (n,)
+            The IDs of the rows to constrain. If None, all rows are constrained.
+        :param maxnorm: The maximum norm of a row.
+        """
+        cls._constrain_rows_(weight, lambda x: clamp_norm(x=x, maxnorm=maxnorm, p=2, dim=-1), ids=ids)
 
     def regularize_if_necessary(self, *tensors: torch.FloatTensor) -> None:
         """Update the regularizer's term given some tensors, if regularization is requested.
@@ -604,13 +743,15 @@ class Model(nn.Module):
         """
         raise NotImplementedError
 
-    def score_t(self, hr_batch: torch.LongTensor) -> torch.FloatTensor:
+    def score_t(self, hr_batch: torch.LongTensor, slice_size: Optional[int] = None) -> torch.FloatTensor:
         """Forward pass using right side (tail) prediction.
 
         This method calculates the score for all possible tails for each (head, relation) pair.
 
         :param hr_batch: shape: (batch_size, 2), dtype: long
             The indices of (head, relation) pairs.
+        :param slice_size: >0
+            The number of tails which are scored at once. If None, all tails are scored at once.
 
         :return: shape: (batch_size, num_entities), dtype: float
             For each h-r pair, the scores for all possible tails.
@@ -619,21 +760,22 @@ class Model(nn.Module):
             'Calculations will fall back to using the score_hrt method, since this model does not have a specific '
             'score_t function. This might cause the calculations to take longer than necessary.'
         )
-        # Extend the hr_batch such that each (h, r) pair is combined with all possible tails
-        hrt_batch = _extend_batch(batch=hr_batch, all_ids=list(self.triples_factory.entity_to_id.values()), dim=2)
-        # Calculate the scores for each (h, r, t) triple using the generic interaction function
-        expanded_scores = self.score_hrt(hrt_batch=hrt_batch)
-        # Reshape the scores to match the pre-defined output shape of the score_t function.
-        scores = expanded_scores.view(hr_batch.shape[0], -1)
-        return scores
+        return self._score_all_by_enumeration(
+            batch=hr_batch,
+            num_choices=self.num_entities,
+            dim=2,
+            slice_size=slice_size,
+        )
 
-    def score_h(self, rt_batch: torch.LongTensor) -> torch.FloatTensor:
+    def score_h(self, rt_batch: torch.LongTensor, slice_size: Optional[int] = None) -> torch.FloatTensor:
         """Forward pass using left side (head) prediction.
 
         This method calculates the score for all possible heads for each (relation, tail) pair.
 
         :param rt_batch: shape: (batch_size, 2), dtype: long
             The indices of (relation, tail) pairs.
+        :param slice_size: >0
+            The number of heads which are scored at once. If None, all heads are scored at once.
 
         :return: shape: (batch_size, num_entities), dtype: float
             For each r-t pair, the scores for all possible heads.
@@ -642,21 +784,22 @@ class Model(nn.Module):
             'Calculations will fall back to using the score_hrt method, since this model does not have a specific '
             'score_h function. This might cause the calculations to take longer than necessary.'
         )
-        # Extend the rt_batch such that each (r, t) pair is combined with all possible heads
-        hrt_batch = _extend_batch(batch=rt_batch, all_ids=list(self.triples_factory.entity_to_id.values()), dim=0)
-        # Calculate the scores for each (h, r, t) triple using the generic interaction function
-        expanded_scores = self.score_hrt(hrt_batch=hrt_batch)
-        # Reshape the scores to match the pre-defined output shape of the score_h function.
-        scores = expanded_scores.view(rt_batch.shape[0], -1)
-        return scores
+        return self._score_all_by_enumeration(
+            batch=rt_batch,
+            num_choices=self.num_entities,
+            dim=0,
+            slice_size=slice_size,
+        )
 
-    def score_r(self, ht_batch: torch.LongTensor) -> torch.FloatTensor:
+    def score_r(self, ht_batch: torch.LongTensor, slice_size: Optional[int] = None) -> torch.FloatTensor:
         """Forward pass using middle (relation) prediction.
 
         This method calculates the score for all possible relations for each (head, tail) pair.
 
         :param ht_batch: shape: (batch_size, 2), dtype: long
             The indices of (head, tail) pairs.
+        :param slice_size: >0
+            The number of relations which are scored at once. If None, all relations are scored at once.
 
         :return: shape: (batch_size, num_relations), dtype: float
             For each h-t pair, the scores for all possible relations.
@@ -665,12 +808,246 @@ class Model(nn.Module):
             'Calculations will fall back to using the score_hrt method, since this model does not have a specific '
             'score_r function. This might cause the calculations to take longer than necessary.'
         )
-        # Extend the ht_batch such that each (h, t) pair is combined with all possible relations
-        hrt_batch = _extend_batch(batch=ht_batch, all_ids=list(self.triples_factory.relation_to_id.values()), dim=1)
-        # Calculate the scores for each (h, r, t) triple using the generic interaction function
-        expanded_scores = self.score_hrt(hrt_batch=hrt_batch)
-        # Reshape the scores to match the pre-defined output shape of the score_r function.
-        scores = expanded_scores.view(ht_batch.shape[0], -1)
+        return self._score_all_by_enumeration(
+            batch=ht_batch,
+            num_choices=self.num_relations,
+            dim=1,
+            slice_size=slice_size,
+        )
+
+    def score_t_candidates(self, hr_batch: torch.LongTensor, tail_ids: torch.LongTensor) -> torch.FloatTensor:
+        """Score each (head, relation) pair against a set of candidate tails.
+
+        :param hr_batch: shape: (batch_size, 2), dtype: long
+            The indices of (head, relation) pairs.
+        :param tail_ids: shape: (num_candidates,) or (batch_size, num_candidates), dtype: long
+            The candidate tails, either shared by all pairs, or for each pair.
+
+        :return: shape: (batch_size, num_candidates), dtype: float
+            For each h-r pair, the scores for its candidate tails.
+        """
+        return self._score_candidates_by_enumeration(batch=hr_batch, candidates=tail_ids, dim=2)
+
+    def score_h_candidates(self, rt_batch: torch.LongTensor, head_ids: torch.LongTensor) -> torch.FloatTensor:
+        """Score each (relation, tail) pair against a set of candidate heads.
+
+        :param rt_batch: shape: (batch_size, 2), dtype: long
+            The indices of (relation, tail) pairs.
+        :param head_ids: shape: (num_candidates,) or (batch_size, num_candidates), dtype: long
+            The candidate heads, either shared by all pairs, or for each pair.
+
+        :return: shape: (batch_size, num_candidates), dtype: float
+            For each r-t pair, the scores for its candidate heads.
+        """
+        return self._score_candidates_by_enumeration(batch=rt_batch, candidates=head_ids, dim=0)
+
+    def score_t_sliced(self, hr_batch: torch.LongTensor, slice_size: Optional[int] = None) -> torch.FloatTensor:
+        """Score all tails for each (head, relation) pair, processing at most ``slice_size`` tails at once.
+
+        Models whose score_t does not support slicing natively fall back to the generic chunked enumeration.
+
+        :param hr_batch: shape: (batch_size, 2), dtype: long
+            The indices of (head, relation) pairs.
+        :param slice_size: >0
+            The number of tails which are scored at once. If None, all tails are scored at once.
+
+        :return: shape: (batch_size, num_entities), dtype: float
+            For each h-r pair, the scores for all possible tails.
+        """
+        return self._score_sliced(name='score_t', batch=hr_batch, slice_size=slice_size)
+
+    def score_h_sliced(self, rt_batch: torch.LongTensor, slice_size: Optional[int] = None) -> torch.FloatTensor:
+        """Score all heads for each (relation, tail) pair, processing at most ``slice_size`` heads at once.
+
+        Models whose score_h does not support slicing natively fall back to the generic chunked enumeration.
+
+        :param rt_batch: shape: (batch_size, 2), dtype: long
+            The indices of (relation, tail) pairs.
+        :param slice_size: >0
+            The number of heads which are scored at once. If None, all heads are scored at once.
+
+        :return: shape: (batch_size, num_entities), dtype: float
+            For each r-t pair, the scores for all possible heads.
+        """
+        return self._score_sliced(name='score_h', batch=rt_batch, slice_size=slice_size)
+
+    def score_r_sliced(self, ht_batch: torch.LongTensor, slice_size: Optional[int] = None) -> torch.FloatTensor:
+        """Score all relations for each (head, tail) pair, processing at most ``slice_size`` relations at once.
+
+        Models whose score_r does not support slicing natively fall back to the generic chunked enumeration.
+
+        :param ht_batch: shape: (batch_size, 2), dtype: long
+            The indices of (head, tail) pairs.
+        :param slice_size: >0
+            The number of relations which are scored at once. If None, all relations are scored at once.
+
+        :return: shape: (batch_size, num_relations), dtype: float
+            For each h-t pair, the scores for all possible relations.
+        """
+        return self._score_sliced(name='score_r', batch=ht_batch, slice_size=slice_size)
+
+    def _score_sliced(self, name: str, batch: torch.LongTensor, slice_size: Optional[int]) -> torch.FloatTensor:
+        """Dispatch to the model's own 1-to-all scoring function, or to the generic one if it cannot slice.
+
+        :param name: in {'score_h', 'score_r', 'score_t'}
+            The name of the 1-to-all scoring function.
+        :param batch: shape: (batch_size, 2), dtype: long
+            The pairs.
+        :param slice_size: >0
+            The number of choices which are scored at once. If None, all choices are scored at once.
+
+        :return: shape: (batch_size, num_choices), dtype: float
+        """
+        fn = getattr(self, name)
+        if slice_size is None:
+            return fn(batch)
+        if _can_slice(fn):
+            return fn(batch, slice_size=slice_size)
+        # The model's specialized implementation scores all choices at once. Enumerate the choices chunk-wise
+        # using the generic implementation instead, since slicing is only requested under memory pressure.
+        return getattr(Model, name)(self, batch, slice_size=slice_size)
+
+    def _score_all_by_enumeration(
+        self,
+        batch: torch.LongTensor,
+        num_choices: int,
+        dim: int,
+        slice_size: Optional[int] = None,
+    ) -> torch.FloatTensor:
+        """Score each pair of the batch with all choices by explicitly enumerating the triples for score_hrt.
+
+        The choices are processed in chunks of ``slice_size``, such that at most ``batch_size * slice_size`` triples
+        are scored at once. The regularization terms of the chunks are averaged, weighted by the chunks' sizes, such
+        that one term is collected per call independently of the slice size. For regularizers which average over
+        their inputs, this is the term of scoring all choices at once.
+
+        :param batch: shape: (batch_size, 2), dtype: long
+            The pairs.
+        :param num_choices:
+            The number of choices, i.e., the number of entities or relations.
+        :param dim: in {0,1,2}
+            The column along which to insert the enumerated IDs.
+        :param slice_size: >0
+            The number of choices which are scored at once. If None, all choices are scored at once.
+
+        :return: shape: (batch_size, num_choices), dtype: float
+        """
+        all_ids = self._get_id_range(num=num_choices, device=batch.device)
+        chunks = torch.split(all_ids, slice_size or num_choices)
+        if len(chunks) == 1:
+            return self.score_hrt(hrt_batch=_extend_batch(batch=batch, all_ids=all_ids, dim=dim)).view(
+                batch.shape[0], -1,
+            )
+
+        regularizer = self.regularizer
+        term, updated = regularizer.regularization_term, regularizer.updated
+        chunk_terms = []
+        scores = []
+        for ids in chunks:
+            # Let each chunk update the regularizer as if it were the only one
+            regularizer.regularization_term, regularizer.updated = torch.zeros_like(term), updated
+            # Calculate the scores for each (h, r, t) triple using the generic interaction function, and reshape
+            # them to (batch_size, slice_size)
+            scores.append(
+                self.score_hrt(hrt_batch=_extend_batch(batch=batch, all_ids=ids, dim=dim)).view(batch.shape[0], -1),
+            )
+            chunk_terms.append(regularizer.regularization_term * (ids.shape[0] / num_choices))
+        regularizer.regularization_term = term + sum(chunk_terms)
+        regularizer.updated = updated or regularizer.updated
+        return torch.cat(scores, dim=1)
+
+    def _score_candidates_by_enumeration(
+        self,
+        batch: torch.LongTensor,
+        candidates: torch.LongTensor,
+        dim: int,
+    ) -> torch.FloatTensor:
+        """Score each pair of the batch with its candidates by explicitly enumerating the triples for score_hrt.
+
+        :param batch: shape: (batch_size, 2), dtype: long
+            The pairs.
+        :param candidates: shape: (num_candidates,) or (batch_size, num_candidates), dtype: long
+            The candidate IDs, either shared by all pairs, or for each pair.
+        :param dim: in {0,1,2}
+            The column along which to insert the candidate IDs.
+
+        :return: shape: (batch_size, num_candidates), dtype: float
+        """
+        if candidates.ndimension() == 1:
+            return self.score_hrt(hrt_batch=_extend_batch(batch=batch, all_ids=candidates, dim=dim)).view(
+                batch.shape[0], -1,
+            )
+        num_candidates = candidates.shape[1]
+        columns = [batch[:, i].repeat_interleave(num_candidates) for i in (0, 1)]
+        columns.insert(dim, candidates.reshape(-1))
+        return self.score_hrt(hrt_batch=torch.stack(columns, dim=-1)).view(batch.shape[0], num_candidates)
+
+    def _get_id_range(self, num: int, device: torch.device) -> torch.LongTensor:
+        """Get the IDs ``0, ..., num - 1``, re-using a cached tensor.
+
+        :param num: The number of IDs.
+        :param device: The device of the IDs.
+
+        :return: shape: (num,), dtype: long
+        """
+        if self._id_range is None or self._id_range.shape[0] < num or self._id_range.device != device:
+            self._id_range = torch.arange(max(self.num_entities, self.num_relations, num), device=device)
+        return self._id_range[:num]
+
+    @property
+    def _caches_projections(self) -> bool:
+        """Whether relation-specific projections are cached, i.e., in evaluation mode with disabled gradients."""
+        return not self.training and not torch.is_grad_enabled()
+
+    def _get_projection(
+        self,
+        key: Hashable,
+        compute: Callable[[], Sequence[torch.FloatTensor]],
+    ) -> Sequence[torch.FloatTensor]:
+        """Compute relation-specific projections of all entities, re-using cached ones in evaluation mode.
+
+        The results are only cached if the model is in evaluation mode and gradients are disabled, as it is the case in
+        :func:`pykeen.evaluation.evaluate`. The cache is cleared in :meth:`post_parameter_update`. If the parameters
+        are modified by other means, ``model.projection_cache.clear()`` has to be called.
+
+        :param key: The key, e.g., a pair of a name and a relation ID.
+        :param compute: A function which computes the projections.
+
+        :return: The projections.
+        """
+        if not self._caches_projections:
+            return tuple(compute())
+        return self.projection_cache.get(key=key, compute=compute)
+
+    @staticmethod
+    def _score_grouped_by_relation(
+        relations: torch.LongTensor,
+        score: Callable[[int, torch.LongTensor], torch.FloatTensor],
+    ) -> torch.FloatTensor:
+        """Score a batch in groups of rows which share the same relation.
+
+        Thereby, relation-specific computations over all entities, e.g., projecting all entities into the relation
+        space, are done once per unique relation in the batch instead of once per row.
+
+        :param relations: shape: (batch_size,)
+            The relation IDs of the batch.
+        :param score:
+            A function which is called with a relation ID and the indices of the rows with this relation, and returns
+            the scores of these rows, shape: (num_rows, num_choices).
+
+        :return: shape: (batch_size, num_choices)
+        """
+        unique_relations, inverse = torch.unique(relations, return_inverse=True)
+        if unique_relations.shape[0] == 1:
+            return score(int(unique_relations[0]), torch.arange(relations.shape[0], device=relations.device))
+
+        groups = inverse.argsort().split(torch.bincount(inverse).tolist())
+        scores = None
+        for relation_id, rows in zip(unique_relations.tolist(), groups):
+            group_scores = score(relation_id, rows)
+            if scores is None:
+                scores = group_scores.new_empty(relations.shape[0], group_scores.shape[1])
+            scores[rows] = group_scores
         return scores
 
     def get_grad_params(self) -> Iterable[nn.Parameter]:
@@ -736,6 +1113,7 @@ class Model(nn.Module):
             Path of the file where to load the state from.
         """
         self.load_state_dict(torch.load(path, map_location=self.device))
+        self.projection_cache.clear()
 
 
 class EntityEmbeddingModel(Model):
@@ -165,3 +165,66 @@ class ComplEx(EntityRelationEmbeddingModel):
         self.regularize_if_necessary(h, r, t)
 
         return scores
+
+    @staticmethod
+    def _combine(
+        x: torch.FloatTensor,
+        r: torch.FloatTensor,
+    ) -> torch.FloatTensor:
+        """Combine an entity and a relation embedding into a query vector.
+
+        Since :meth:`ComplEx.interaction_function` is symmetric in head and tail, the score of the query with any
+        other entity $e$ is the real inner product of the query vector and $e$.
+
+        :param x: shape: (batch_size, 2 * d)
+            The (head or tail) entity embeddings.
+        :param r: shape: (batch_size, 2 * d)
+            The relation embeddings.
+
+        :return: shape: (batch_size, 2 * d)
+            The query vectors.
+        """
+        (x_re, x_im), (r_re, r_im) = split_complex(x=x), split_complex(x=r)
+        return torch.cat([x_re * r_re + x_im * r_im, x_re * r_im + x_im * r_re], dim=-1)
+
+    def _score_all(
+        self,
+        x_ind: torch.LongTensor,
+        r_ind: torch.LongTensor,
+        slice_size: Optional[int] = None,
+    ) -> torch.FloatTensor:
+        """Score a batch of (entity, relation) pairs against all entities.
+
+        The scores for the real and imaginary parts are computed by a single matrix multiplication, since the
+        embeddings store the real and imaginary parts consecutively.
+
+        :param x_ind: shape: (batch_size,)
+            The indices of the (head or tail) entities.
+        :param r_ind: shape: (batch_size,)
+            The indices of the relations.
+        :param slice_size: >0
+            The divisor for the scoring function when using slicing.
+
+        :return: shape: (batch_size, num_entities)
+        """
+        x = self.entity_embeddings(x_ind)
+        r = self.relation_embeddings(r_ind)
+        e = self.entity_embeddings.weight
+
+        # shape: (batch_size, 2 * d)
+        q = self._combine(x=x, r=r)
+        if slice_size is None:
+            scores = q @ e.t()
+        else:
+            scores = torch.cat([q @ e_slice.t() for e_slice in torch.split(e, slice_size, dim=0)], dim=1)
+
+        # Regularization, equivalent to regularizing all (batch_size * num_entities) triples
+        self.regularize_if_necessary(x, r, e)
+
+        return scores
+
+    def score_t(self, hr_batch: torch.LongTensor, slice_size: int = None) -> torch.FloatTensor:  # noqa: D102
+        return self._score_all(x_ind=hr_batch[:, 0], r_ind=hr_batch[:, 1], slice_size=slice_size)
+
+    def score_h(self, rt_batch: torch.LongTensor, slice_size: int = None) -> torch.FloatTensor:  # noqa: D102
+        return self._score_all(x_ind=rt_batch[:, 1], r_ind=rt_batch[:, 0], slice_size=slice_size)
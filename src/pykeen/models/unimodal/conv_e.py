@@ -16,7 +16,7 @@ from ..init import embedding_xavier_normal_
 from ...losses import BCEAfterSigmoidLoss, Loss
 from ...regularizers import Regularizer
 from ...triples import TriplesFactory
-from ...utils import get_embedding, is_cudnn_error
+from ...utils import get_embedding, is_cudnn_error, tensor_product_sum
 
 __all__ = [
     'ConvE',
@@ -155,6 +155,8 @@ class ConvE(EntityRelationEmbeddingModel):
     loss_default: Type[Loss] = BCEAfterSigmoidLoss
     #: The default parameters for the default loss function class
     loss_default_kwargs = {}
+    #: The convolution only depends on the (head, relation) pair
+    factorizes_hr = True
 
     #: If batch normalization is enabled, this is: num_features – C from an expected input of size (N,C,L)
     bn0: Optional[torch.nn.BatchNorm2d]
@@ -381,6 +383,39 @@ class ConvE(EntityRelationEmbeddingModel):
 
         return x
 
+    def score_t_candidates(  # noqa: D102
+        self,
+        hr_batch: torch.LongTensor,
+        tail_ids: torch.LongTensor,
+    ) -> torch.FloatTensor:
+        h = self.entity_embeddings(hr_batch[:, 0]).view(
+            -1,
+            self.input_channels,
+            self.embedding_height,
+            self.embedding_width,
+        )
+        r = self.relation_embeddings(hr_batch[:, 1]).view(
+            -1,
+            self.input_channels,
+            self.embedding_height,
+            self.embedding_width,
+        )
+        # shape: (1 or batch_size, num_candidates, embedding_dim)
+        t = self.entity_embeddings(tail_ids).view(-1, tail_ids.shape[-1], self.embedding_dim)
+
+        # Embedding Regularization
+        self.regularize_if_necessary(h, r, t)
+
+        # Each (h, r) pair is convolved only once, and multiplied with the embeddings of all its candidates
+        x = self._convolve_entity_relation(h, r).view(-1, 1, self.embedding_dim)
+        x = tensor_product_sum(x, t)
+
+        # The bias term is looked up for each candidate tail
+        x = x + self.bias_term(tail_ids).view(-1, tail_ids.shape[-1])
+        # The application of the sigmoid during training is automatically handled by the default loss.
+
+        return x
+
     def score_h(self, rt_batch: torch.LongTensor) -> torch.FloatTensor:  # noqa: D102
         rt_batch_size = rt_batch.shape[0]
         h = self.entity_embeddings.weight
@@ -147,3 +147,60 @@ class ConvKB(EntityRelationEmbeddingModel):
         scores = self.linear(hidden)
 
         return scores
+
+    def _score_all(
+        self,
+        x: torch.FloatTensor,
+        r: torch.FloatTensor,
+        x_column: int,
+        slice_size: Optional[int] = None,
+    ) -> torch.FloatTensor:
+        """Score a batch of (entity, relation) pairs against all entities.
+
+        The 1x3 convolution is linear, so the contributions of the fixed entity and relation are computed once per
+        pair, and the contributions of the candidate entities once per entity. Only the activation and the output
+        layer are evaluated for each combination, chunk-wise over the entities.
+
+        :param x: shape: (batch_size, embedding_dim)
+            The fixed (head or tail) entity embeddings.
+        :param r: shape: (batch_size, embedding_dim)
+            The relation embeddings.
+        :param x_column: The column of the fixed entity in the convolution input, i.e., 0 for heads and 2 for tails.
+        :param slice_size: >0
+            The number of entities to score at once.
+
+        :return: shape: (batch_size, num_entities)
+        """
+        # Output layer regularization
+        self.regularize_if_necessary(self.linear.weight, self.linear.bias)
+
+        # shape: (num_filters, 3)
+        conv_weight = self.conv.weight.view(self.num_filters, 3)
+        candidate_column = 2 - x_column
+
+        # contribution of the fixed entity, the relation, and the bias, shape: (batch_size, 1, num_filters, d)
+        query = (
+            x.unsqueeze(dim=1) * conv_weight[:, x_column, None]
+            + r.unsqueeze(dim=1) * conv_weight[:, 1, None]
+            + self.conv.bias[:, None]
+        ).unsqueeze(dim=1)
+
+        e_all = self.entity_embeddings.weight
+        scores = []
+        for e in torch.split(e_all, slice_size or e_all.shape[0], dim=0):
+            # contribution of the candidate entities, shape: (1, slice_size, num_filters, d)
+            candidates = (e.unsqueeze(dim=1) * conv_weight[:, candidate_column, None]).unsqueeze(dim=0)
+            hidden = self.hidden_dropout(self.relu(query + candidates))
+            # Linear layer for final scores, shape: (batch_size, slice_size)
+            scores.append(hidden.view(*hidden.shape[:2], -1) @ self.linear.weight.view(-1))
+        return torch.cat(scores, dim=1) + self.linear.bias
+
+    def score_t(self, hr_batch: torch.LongTensor, slice_size: int = None) -> torch.FloatTensor:  # noqa: D102
+        h = self.entity_embeddings(hr_batch[:, 0])
+        r = self.relation_embeddings(hr_batch[:, 1])
+        return self._score_all(x=h, r=r, x_column=0, slice_size=slice_size)
+
+    def score_h(self, rt_batch: torch.LongTensor, slice_size: int = None) -> torch.FloatTensor:  # noqa: D102
+        r = self.relation_embeddings(rt_batch[:, 0])
+        t = self.entity_embeddings(rt_batch[:, 1])
+        return self._score_all(x=t, r=r, x_column=2, slice_size=slice_size)
@@ -13,6 +13,7 @@ from ..base import EntityRelationEmbeddingModel
 from ...losses import Loss
 from ...regularizers import LpRegularizer, Regularizer
 from ...triples import TriplesFactory
+from ...utils import tensor_product_sum
 
 __all__ = [
     'DistMult',
@@ -99,12 +100,16 @@ class DistMult(EntityRelationEmbeddingModel):
         # Initialise relation embeddings to unit length
         functional.normalize(self.relation_embeddings.weight.data, out=self.relation_embeddings.weight.data)
 
-    def post_parameter_update(self) -> None:  # noqa: D102
+    def post_parameter_update(  # noqa: D102
+        self,
+        entity_ids: Optional[torch.LongTensor] = None,
+        relation_ids: Optional[torch.LongTensor] = None,
+    ) -> None:
         # Make sure to call super first
-        super().post_parameter_update()
+        super().post_parameter_update(entity_ids=entity_ids, relation_ids=relation_ids)
 
         # Normalize embeddings of entities
-        functional.normalize(self.entity_embeddings.weight.data, out=self.entity_embeddings.weight.data)
+        self._constrain_rows_(self.entity_embeddings.weight, functional.normalize, ids=entity_ids)
 
     @staticmethod
     def interaction_function(
@@ -152,8 +157,27 @@ class DistMult(EntityRelationEmbeddingModel):
         r = self.relation_embeddings(hr_batch[:, 1]).view(-1, 1, self.embedding_dim)
         t = self.entity_embeddings.weight.view(1, -1, self.embedding_dim)
 
-        # Rank against all entities
-        scores = self.interaction_function(h=h, r=r, t=t)
+        # Rank against all entities, with one matrix multiplication of (h * r) and all entity embeddings
+        scores = tensor_product_sum(h, r, t)
+
+        # Only regularize relation embeddings
+        self.regularize_if_necessary(r)
+
+        return scores
+
+    def score_t_candidates(  # noqa: D102
+        self,
+        hr_batch: torch.LongTensor,
+        tail_ids: torch.LongTensor,
+    ) -> torch.FloatTensor:
+        # Get embeddings
+        h = self.entity_embeddings(hr_batch[:, 0]).view(-1, 1, self.embedding_dim)
+        r = self.relation_embeddings(hr_batch[:, 1]).view(-1, 1, self.embedding_dim)
+        # shape: (1 or batch_size, num_candidates, embedding_dim)
+        t = self.entity_embeddings(tail_ids).view(-1, tail_ids.shape[-1], self.embedding_dim)
+
+        # Compute score
+        scores = tensor_product_sum(h, r, t)
 
         # Only regularize relation embeddings
         self.regularize_if_necessary(r)
@@ -166,8 +190,27 @@ class DistMult(EntityRelationEmbeddingModel):
         r = self.relation_embeddings(rt_batch[:, 0]).view(-1, 1, self.embedding_dim)
         t = self.entity_embeddings(rt_batch[:, 1]).view(-1, 1, self.embedding_dim)
 
-        # Rank against all entities
-        scores = self.interaction_function(h=h, r=r, t=t)
+        # Rank against all entities, with one matrix multiplication of (r * t) and all entity embeddings
+        scores = tensor_product_sum(h, r, t)
+
+        # Only regularize relation embeddings
+        self.regularize_if_necessary(r)
+
+        return scores
+
+    def score_h_candidates(  # noqa: D102
+        self,
+        rt_batch: torch.LongTensor,
+        head_ids: torch.LongTensor,
+    ) -> torch.FloatTensor:
+        # Get embeddings
+        # shape: (1 or batch_size, num_candidates, embedding_dim)
+        h = self.entity_embeddings(head_ids).view(-1, head_ids.shape[-1], self.embedding_dim)
+        r = self.relation_embeddings(rt_batch[:, 0]).view(-1, 1, self.embedding_dim)
+        t = self.entity_embeddings(rt_batch[:, 1]).view(-1, 1, self.embedding_dim)
+
+        # Compute score
+        scores = tensor_product_sum(h, r, t)
 
         # Only regularize relation embeddings
         self.regularize_if_necessary(r)
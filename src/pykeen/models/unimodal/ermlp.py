@@ -39,6 +39,8 @@ class ERMLP(EntityRelationEmbeddingModel):
     hpo_default = dict(
         embedding_dim=dict(type=int, low=50, high=350, q=25),
     )
+    #: The first layer can be split into a (head, relation) part and a tail part
+    factorizes_hr = True
 
     def __init__(
         self,
@@ -132,6 +134,37 @@ class ERMLP(EntityRelationEmbeddingModel):
         scores = scores.view(-1, self.num_entities)
         return scores
 
+    def score_t_candidates(  # noqa: D102
+        self,
+        hr_batch: torch.LongTensor,
+        tail_ids: torch.LongTensor,
+    ) -> torch.FloatTensor:
+        # Get embeddings
+        h = self.entity_embeddings(hr_batch[:, 0])
+        r = self.relation_embeddings(hr_batch[:, 1])
+        t = self.entity_embeddings(tail_ids)
+
+        # Embedding Regularization
+        self.regularize_if_necessary(h, r, t)
+
+        # First layer can be unrolled, such that the (h, r) part is computed once per pair
+        layers = self.mlp.children()
+        first_layer = next(layers)
+        w = first_layer.weight
+        i = 2 * self.embedding_dim
+        # shape: (batch_size, 1, hidden_dim)
+        w_hr = (torch.cat([h, r], dim=-1) @ w[:, :i].t() + first_layer.bias).unsqueeze(1)
+        # shape: (1 or batch_size, num_candidates, hidden_dim)
+        w_t = (t @ w[:, i:].t()).view(-1, tail_ids.shape[-1], self.hidden_dim)
+        scores = w_hr + w_t
+
+        # Send scores through rest of the network
+        scores = scores.view(-1, self.hidden_dim)
+        for remaining_layer in layers:
+            scores = remaining_layer(scores)
+        scores = scores.view(hr_batch.shape[0], -1)
+        return scores
+
     def score_h(self, rt_batch: torch.LongTensor) -> torch.FloatTensor:  # noqa: D102
         # Get embeddings
         h = self.entity_embeddings.weight
@@ -12,7 +12,6 @@ from ..init import embedding_xavier_uniform_
 from ...losses import Loss
 from ...regularizers import Regularizer
 from ...triples import TriplesFactory
-from ...utils import clamp_norm
 
 __all__ = [
     'HolE',
@@ -75,12 +74,16 @@ class HolE(EntityRelationEmbeddingModel):
         # Finalize initialization
         self.reset_parameters_()
 
-    def post_parameter_update(self) -> None:  # noqa: D102
+    def post_parameter_update(  # noqa: D102
+        self,
+        entity_ids: Optional[torch.LongTensor] = None,
+        relation_ids: Optional[torch.LongTensor] = None,
+    ) -> None:
         # Make sure to call super first
-        super().post_parameter_update()
+        super().post_parameter_update(entity_ids=entity_ids, relation_ids=relation_ids)
 
         # Normalize entity embeddings
-        self.entity_embeddings.weight.data = clamp_norm(x=self.entity_embeddings.weight.data, maxnorm=1., p=2, dim=-1)
+        self._clamp_rows_(self.entity_embeddings.weight, ids=entity_ids)
 
     def _reset_parameters_(self):  # noqa: D102
         # Initialisation, cf. https://github.com/mnick/scikit-kge/blob/master/skge/param.py#L18-L27
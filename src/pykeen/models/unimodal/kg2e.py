@@ -12,7 +12,7 @@ from ..base import EntityRelationEmbeddingModel
 from ...losses import Loss
 from ...regularizers import Regularizer
 from ...triples import TriplesFactory
-from ...utils import clamp_norm, get_embedding, get_embedding_in_canonical_shape
+from ...utils import get_embedding, get_embedding_in_canonical_shape
 
 __all__ = [
     'KG2E',
@@ -122,26 +122,24 @@ class KG2E(EntityRelationEmbeddingModel):
         ]:
             emb.reset_parameters()
 
-    def post_parameter_update(self) -> None:  # noqa: D102
+    def post_parameter_update(  # noqa: D102
+        self,
+        entity_ids: Optional[torch.LongTensor] = None,
+        relation_ids: Optional[torch.LongTensor] = None,
+    ) -> None:
         # Make sure to call super first
-        super().post_parameter_update()
+        super().post_parameter_update(entity_ids=entity_ids, relation_ids=relation_ids)
 
         # Normalize entity embeddings
-        self.entity_embeddings.weight.data = clamp_norm(x=self.entity_embeddings.weight.data, maxnorm=1., p=2, dim=-1)
-        self.relation_embeddings.weight.data = clamp_norm(
-            x=self.relation_embeddings.weight.data,
-            maxnorm=1.,
-            p=2,
-            dim=-1,
-        )
+        self._clamp_rows_(self.entity_embeddings.weight, ids=entity_ids)
+        self._clamp_rows_(self.relation_embeddings.weight, ids=relation_ids)
 
         # Ensure positive definite covariances matrices and appropriate size by clamping
-        for cov in (
-            self.entity_covariances,
-            self.relation_covariances,
+        for cov, ids in (
+            (self.entity_covariances, entity_ids),
+            (self.relation_covariances, relation_ids),
         ):
-            cov_data = cov.weight.data
-            torch.clamp(cov_data, min=self.c_min, max=self.c_max, out=cov_data)
+            self._constrain_rows_(cov.weight, lambda x: torch.clamp(x, min=self.c_min, max=self.c_max), ids=ids)
 
     def _score(
         self,
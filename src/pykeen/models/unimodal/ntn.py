@@ -127,10 +127,9 @@ class NTN(EntityEmbeddingModel):
 
     def _score(
         self,
-        h_ind: Optional[torch.LongTensor] = None,
-        r_ind: Optional[torch.LongTensor] = None,
-        t_ind: Optional[torch.LongTensor] = None,
-        slice_size: int = None,
+        h_ind: torch.LongTensor,
+        r_ind: torch.LongTensor,
+        t_ind: torch.LongTensor,
     ) -> torch.FloatTensor:
         """
         Compute scores for NTN.
@@ -139,36 +138,81 @@ class NTN(EntityEmbeddingModel):
         :param r_ind: shape: (batch_size,)
         :param t_ind: shape: (batch_size,)
 
-        :return: shape: (batch_size, num_entities)
+        :return: shape: (batch_size, 1)
+        """
+        #: shape: (batch_size, 1, d)
+        h = get_embedding_in_canonical_shape(embedding=self.entity_embeddings, ind=h_ind)
+        t = get_embedding_in_canonical_shape(embedding=self.entity_embeddings, ind=t_ind)
+        return self._interaction_function(h=h, t=t, r_ind=r_ind)
+
+    def _project_all_entities(self, relation_id: int, side: str) -> torch.FloatTensor:
+        """Compute the linear part for all entities, re-using cached results in evaluation mode.
+
+        :param relation_id: The relation ID.
+        :param side: in {'h', 't'}
+            Whether the entities are heads or tails.
+
+        :return: shape: (k, num_entities)
+            The results of $V_r e + b_r$ for all entities.
         """
-        assert r_ind is not None
+        v = self.vh if side == 'h' else self.vt
+        return self._get_projection(
+            key=(side, relation_id),
+            compute=lambda: [
+                v[relation_id] @ self.entity_embeddings.weight.t() + self.b[relation_id].unsqueeze(dim=-1),
+            ],
+        )[0]
+
+    def _score_all(
+        self,
+        ind: torch.LongTensor,
+        relation_id: int,
+        side: str,
+        slice_size: Optional[int] = None,
+    ) -> torch.FloatTensor:
+        """Score all entities on one side for a single relation.
 
-        #: shape: (batch_size, num_entities, d)
-        h_all = get_embedding_in_canonical_shape(embedding=self.entity_embeddings, ind=h_ind)
-        t_all = get_embedding_in_canonical_shape(embedding=self.entity_embeddings, ind=t_ind)
+        The bilinear term $e^T W_r$ of the fixed entities is computed first, such that the candidates are scored by
+        one matrix multiplication per slice.
 
-        if slice_size is None:
-            return self._interaction_function(h=h_all, t=t_all, r_ind=r_ind)
+        :param ind: shape: (n,)
+            The indices of the fixed entities.
+        :param relation_id: The relation ID.
+        :param side: in {'h', 't'}
+            The side of the candidate entities.
+        :param slice_size: >0
+            The number of candidates which are scored at once. If None, all candidates are scored at once.
 
-        if h_all.shape[1] > t_all.shape[1]:
-            h_was_split = True
-            split_tensor = torch.split(h_all, slice_size, dim=1)
-            constant_tensor = t_all
+        :return: shape: (n, num_entities)
+        """
+        e = self.entity_embeddings(ind)
+        w = self.w[relation_id]
+        if side == 't':
+            # h.T @ W, shape: (n, k, d)
+            ew = torch.einsum('ni,kij->nkj', e, w)
+            # V_h @ h, shape: (n, k, 1)
+            ve = (e @ self.vh[relation_id].t()).unsqueeze(dim=-1)
         else:
-            h_was_split = False
-            split_tensor = torch.split(t_all, slice_size, dim=1)
-            constant_tensor = h_all
+            # W @ t, shape: (n, k, d)
+            ew = torch.einsum('kij,nj->nki', w, e)
+            # V_t @ t, shape: (n, k, 1)
+            ve = (e @ self.vt[relation_id].t()).unsqueeze(dim=-1)
+
+        # V @ e + b for all candidates, shape: (k, num_entities)
+        ve_all = self._project_all_entities(relation_id=relation_id, side=side)
 
+        # prepare u: (k,) -> (1, k, 1)
+        u = self.u[relation_id].view(1, -1, 1)
+
+        slice_size = slice_size or self.num_entities
         scores_arr = []
-        for split in split_tensor:
-            if h_was_split:
-                h = split
-                t = constant_tensor
-            else:
-                h = constant_tensor
-                t = split
-            score = self._interaction_function(h=h, t=t, r_ind=r_ind)
-            scores_arr.append(score)
+        for candidates, ve_candidates in zip(
+            torch.split(self.entity_embeddings.weight, slice_size, dim=0),
+            torch.split(ve_all, slice_size, dim=1),
+        ):
+            # a = f(h.T @ W @ t + Vh @ h + Vt @ t + b), shape: (n, k, slice_size)
+            act = self.non_linearity(ew @ candidates.t() + ve + ve_candidates.unsqueeze(dim=0))
+            scores_arr.append((act * u).sum(dim=1))
 
         return torch.cat(scores_arr, dim=1)
 
@@ -242,7 +286,23 @@ class NTN(EntityEmbeddingModel):
         return self._score(h_ind=hrt_batch[:, 0], r_ind=hrt_batch[:, 1], t_ind=hrt_batch[:, 2])
 
     def score_t(self, hr_batch: torch.LongTensor, slice_size: int = None) -> torch.FloatTensor:  # noqa: D102
-        return self._score(h_ind=hr_batch[:, 0], r_ind=hr_batch[:, 1], slice_size=slice_size)
+        return self._score_grouped_by_relation(
+            relations=hr_batch[:, 1],
+            score=lambda relation_id, rows: self._score_all(
+                ind=hr_batch[rows, 0],
+                relation_id=relation_id,
+                side='t',
+                slice_size=slice_size,
+            ),
+        )
 
     def score_h(self, rt_batch: torch.LongTensor, slice_size: int = None) -> torch.FloatTensor:  # noqa: D102
-        return self._score(r_ind=rt_batch[:, 0], t_ind=rt_batch[:, 1], slice_size=slice_size)
+        return self._score_grouped_by_relation(
+            relations=rt_batch[:, 0],
+            score=lambda relation_id, rows: self._score_all(
+                ind=rt_batch[rows, 1],
+                relation_id=relation_id,
+                side='h',
+                slice_size=slice_size,
+            ),
+        )
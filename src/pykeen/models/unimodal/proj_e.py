@@ -14,6 +14,7 @@ from ..init import embedding_xavier_uniform_
 from ...losses import Loss
 from ...regularizers import Regularizer
 from ...triples import TriplesFactory
+from ...utils import tensor_product_sum
 
 __all__ = [
     'ProjE',
@@ -53,6 +54,8 @@ class ProjE(EntityRelationEmbeddingModel):
     loss_default = nn.BCEWithLogitsLoss
     #: The default parameters for the default loss function class
     loss_default_kwargs = dict(reduction='mean')
+    #: The combination operator only depends on the (head, relation) pair
+    factorizes_hr = True
 
     def __init__(
         self,
@@ -127,6 +130,23 @@ class ProjE(EntityRelationEmbeddingModel):
 
         return scores
 
+    def score_t_candidates(  # noqa: D102
+        self,
+        hr_batch: torch.LongTensor,
+        tail_ids: torch.LongTensor,
+    ) -> torch.FloatTensor:
+        # Get embeddings
+        h = self.entity_embeddings(hr_batch[:, 0])
+        r = self.relation_embeddings(hr_batch[:, 1])
+        # shape: (1 or batch_size, num_candidates, embedding_dim)
+        t = self.entity_embeddings(tail_ids).view(-1, tail_ids.shape[-1], self.embedding_dim)
+
+        # Rank against the candidates
+        hidden = self.inner_non_linearity(self.d_e[None, :] * h + self.d_r[None, :] * r + self.b_c[None, :])
+        scores = tensor_product_sum(hidden.unsqueeze(1), t) + self.b_p
+
+        return scores
+
     def score_h(self, rt_batch: torch.LongTensor) -> torch.FloatTensor:  # noqa: D102
         # Get embeddings
         h = self.entity_embeddings.weight
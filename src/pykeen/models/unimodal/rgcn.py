@@ -4,7 +4,7 @@
 
 import logging
 from os import path
-from typing import Any, Callable, Mapping, Optional, Type
+from typing import Any, Callable, List, Mapping, Optional, Tuple, Type
 
 import torch
 from torch import nn
@@ -54,6 +54,24 @@ def _get_neighborhood(
     return edge_mask
 
 
+def _chunk_bounds(start: int, stop: int, chunk_size: Optional[int]) -> List[Tuple[int, int]]:
+    """Split the range [start, stop) into consecutive chunks of at most chunk_size elements."""
+    if chunk_size is None:
+        chunk_size = max(stop - start, 1)
+    return [(i, min(i + chunk_size, stop)) for i in range(start, stop, chunk_size)]
+
+
+class _TensorEmbedding(nn.Module):
+    """An embedding which looks up the rows of a given tensor, and passes the gradients on to it."""
+
+    def __init__(self, weight: torch.FloatTensor):
+        super().__init__()
+        self.weight = weight
+
+    def forward(self, indices: torch.LongTensor) -> torch.FloatTensor:  # noqa: D102
+        return self.weight[indices]
+
+
 # pylint: disable=unused-argument
 def inverse_indegree_edge_weights(source: torch.LongTensor, target: torch.LongTensor) -> torch.FloatTensor:
     """Normalize messages by inverse in-degree.
@@ -188,7 +206,19 @@ class RGCN(Model):
         ] = inverse_indegree_edge_weights,
         decomposition: str = 'basis',
         buffer_messages: bool = True,
+        num_neighbors: Optional[int] = None,
+        inference_chunk_size: Optional[int] = None,
     ):
+        """Initialize the model.
+
+        :param num_neighbors: >0
+            If given, train on sampled neighbourhoods in the style of GraphSAGE: for each batch, every node samples
+            this many incident edges per hop, and the messages are passed on the compact subgraph spanned by the
+            sampled edges instead of the full graph.
+        :param inference_chunk_size: >0
+            The number of edges for which messages are computed at once when autograd is disabled, e.g. during
+            evaluation. If None, all messages of a layer are computed at once.
+        """
         super().__init__(
             triples_factory=triples_factory,
             automatic_memory_optimization=automatic_memory_optimization,
@@ -249,7 +279,17 @@ class RGCN(Model):
         self.buffer_messages = buffer_messages
         self.enriched_embeddings = None
 
+        # neighbour sampling
+        if num_neighbors is not None and num_neighbors <= 0:
+            raise ValueError(f'num_neighbors must be positive, but is {num_neighbors}.')
+        self.num_neighbors = num_neighbors
+        # The undirected node-to-edge adjacency in CSR format, cf. _get_adjacency
+        self._adjacency = None
+        self.inference_chunk_size = inference_chunk_size
+
         self.edge_weighting = edge_weighting
+        # The prepared edges of the full graph, cf. _get_edges
+        self._edge_cache = None
         self.edge_dropout = edge_dropout
         if self_loop_dropout is None:
             self_loop_dropout = edge_dropout
@@ -334,8 +374,12 @@ class RGCN(Model):
         # Finalize initialization
         self.reset_parameters_()
 
-    def post_parameter_update(self) -> None:  # noqa: D102
-        super().post_parameter_update()
+    def post_parameter_update(  # noqa: D102
+        self,
+        entity_ids: Optional[torch.LongTensor] = None,
+        relation_ids: Optional[torch.LongTensor] = None,
+    ) -> None:
+        super().post_parameter_update(entity_ids=entity_ids, relation_ids=relation_ids)
 
         # invalidate enriched embeddings
         self.enriched_embeddings = None
@@ -389,82 +433,174 @@ class RGCN(Model):
         if batch is None and self.enriched_embeddings is not None:
             return self.enriched_embeddings
 
-        # Bind fields
-        # shape: (num_entities, embedding_dim)
-        x = self.base_embeddings
-        sources = self.sources
-        targets = self.targets
-        edge_types = self.edge_types
-
         # Edge dropout: drop the same edges on all layers (only in training mode)
-        if self.training and self.edge_dropout is not None:
-            # Get random dropout mask
-            edge_keep_mask = torch.rand(self.sources.shape[0], device=x.device) > self.edge_dropout
-
-            # Apply to edges
-            sources = sources[edge_keep_mask]
-            targets = targets[edge_keep_mask]
-            edge_types = edge_types[edge_keep_mask]
-
-        # Different dropout for self-loops (only in training mode)
-        if self.training and self.self_loop_dropout is not None:
-            node_keep_mask = torch.rand(self.num_entities, device=x.device) > self.self_loop_dropout
-        else:
-            node_keep_mask = None
+        edge_index = self._drop_edges(num_edges=self.sources.shape[0])
 
         # If batch is given, compute (num_layers)-hop neighbourhood
         if batch is not None:
+            if edge_index is None:
+                edge_index = torch.arange(self.sources.shape[0], device=self.device)
             start_nodes = torch.cat([batch[:, 0], batch[:, 2]], dim=0)
             edge_mask = _get_neighborhood(
                 start_nodes=start_nodes,
-                sources=sources,
-                targets=targets,
+                sources=self.sources[edge_index],
+                targets=self.targets[edge_index],
                 k=self.num_layers,
                 num_nodes=self.num_entities,
                 undirected=True,
             )
-        else:
-            edge_mask = None
+            edge_index = edge_index[edge_mask]
 
-        for i in range(self.num_layers):
-            # Initialize embeddings in the next layer for all nodes
-            new_x = torch.zeros_like(x)
+        # shape: (num_entities, embedding_dim)
+        x = self._propagate_layers(
+            x=self.base_embeddings,
+            # The (filtered) edges in both directions, with their weights
+            edges=self._get_edges(edge_index=edge_index),
+        )
 
-            # TODO: Can we vectorize this loop?
-            for r in range(self.num_relations):
-                # Choose the edges which are of the specific relation
-                mask = (edge_types == r)
+        if batch is None and self.buffer_messages:
+            self.enriched_embeddings = x
 
-                # Only propagate messages on subset of edges
-                if edge_mask is not None:
-                    mask &= edge_mask
+        return x
 
-                # No edges available? Skip rest of inner loop
-                if not mask.any():
-                    continue
+    def _enrich_subgraph(self, batch: torch.LongTensor) -> Tuple[torch.FloatTensor, torch.LongTensor]:
+        """Enrich the embeddings of the batch's entities on a sampled neighbourhood subgraph.
 
-                # Get source and target node indices
-                sources_r = sources[mask]
-                targets_r = targets[mask]
+        In the style of GraphSAGE, each node samples a fixed number of its incident edges per hop. The message passing
+        then runs on the compact subgraph spanned by the sampled edges, with node indices relabelled to
+        0, ..., num_nodes - 1, such that memory and compute scale with the size of the batch neighbourhood.
 
-                # send messages in both directions
-                sources_r, targets_r = torch.cat([sources_r, targets_r]), torch.cat([targets_r, sources_r])
+        :param batch: shape: (batch_size, 3)
+            The (head, relation, tail) triples.
 
-                # Select source node embeddings
-                x_s = x[sources_r]
+        :return:
+            A pair (x, local_batch), where x of shape (num_nodes, embedding_dim) are the enriched embeddings of the
+            subgraph nodes, and local_batch of shape (batch_size, 3) is the batch with relabelled entity indices.
+        """
+        start_nodes = torch.cat([batch[:, 0], batch[:, 2]], dim=0)
+        edge_index = self._sample_neighborhood(start_nodes=start_nodes)
+
+        # Edge dropout on the sampled edges
+        keep_index = self._drop_edges(num_edges=edge_index.shape[0])
+        if keep_index is not None:
+            edge_index = edge_index[keep_index]
+
+        # Relabel the nodes of the subgraph
+        sources, targets, edge_types = self.sources[edge_index], self.targets[edge_index], self.edge_types[edge_index]
+        nodes, local = torch.unique(torch.cat([start_nodes, sources, targets], dim=0), return_inverse=True)
+        local_start_nodes, local_sources, local_targets = local.split([start_nodes.shape[0], *(2 * [sources.shape[0]])])
+
+        x = self._propagate_layers(
+            x=self.base_embeddings[nodes],
+            edges=self._prepare_edges(
+                sources=local_sources,
+                targets=local_targets,
+                edge_types=edge_types,
+                num_nodes=nodes.shape[0],
+            ),
+        )
 
-                # get relation weights
-                w = self._get_relation_weights(i_layer=i, r=r)
+        local_batch = batch.clone()
+        local_batch[:, 0], local_batch[:, 2] = local_start_nodes.view(2, -1)
+        return x, local_batch
 
-                # Compute message (b x d) * (d x d) = (b x d)
-                m_r = x_s @ w
+    def _sample_neighborhood(self, start_nodes: torch.LongTensor) -> torch.LongTensor:
+        """Sample the edges of the (num_layers)-hop neighbourhood of the given nodes.
 
-                # Normalize messages by relation-specific in-degree
-                if self.edge_weighting is not None:
-                    m_r *= self.edge_weighting(source=sources_r, target=targets_r).unsqueeze(dim=-1)
+        :param start_nodes: shape: (num_start_nodes,)
+            The start nodes.
 
-                # Aggregate messages in target
-                new_x.index_add_(dim=0, index=targets_r, source=m_r)
+        :return: shape: (num_sampled_edges,)
+            The increasing indices of the sampled edges.
+        """
+        edge_ids, node_offsets = self._get_adjacency()
+        visited = torch.zeros(self.num_entities, dtype=torch.bool, device=start_nodes.device)
+        frontier = start_nodes.unique()
+        sampled = []
+        for _ in range(self.num_layers):
+            visited[frontier] = True
+
+            # Only nodes with incident edges can sample neighbours
+            start = node_offsets[frontier]
+            degree = node_offsets[frontier + 1] - start
+            has_neighbors = degree > 0
+            start, degree = start[has_neighbors], degree[has_neighbors]
+            if start.shape[0] == 0:
+                break
+
+            # Sample a fixed number of incident edges for each node, with replacement
+            # shape: (num_frontier_nodes, num_neighbors)
+            offsets = (torch.rand(start.shape[0], self.num_neighbors, device=start.device) * degree.unsqueeze(dim=-1))
+            edge_index = edge_ids[start.unsqueeze(dim=-1) + offsets.long()].view(-1).unique()
+            sampled.append(edge_index)
+
+            # Continue from the newly reached nodes
+            frontier = torch.cat([self.sources[edge_index], self.targets[edge_index]], dim=0).unique()
+            frontier = frontier[~visited[frontier]]
+
+        if not sampled:
+            return start_nodes.new_empty(0)
+        return torch.cat(sampled, dim=0).unique()
+
+    def _get_adjacency(self) -> Tuple[torch.LongTensor, torch.LongTensor]:
+        """Get the undirected node-to-edge adjacency in CSR format.
+
+        :return:
+            A pair (edge_ids, node_offsets), where edge_ids[node_offsets[i]:node_offsets[i + 1]] are the indices of
+            the edges incident to node i.
+        """
+        if self._adjacency is None or self._adjacency[0].device != self.sources.device:
+            nodes = torch.cat([self.sources, self.targets], dim=0)
+            edge_ids = torch.arange(self.sources.shape[0], device=nodes.device).repeat(2)
+            node_offsets = torch.zeros(self.num_entities + 1, dtype=torch.long, device=nodes.device)
+            node_offsets[1:] = torch.bincount(nodes, minlength=self.num_entities).cumsum(dim=0)
+            self._adjacency = edge_ids[nodes.argsort()], node_offsets
+        return self._adjacency
+
+    def _drop_edges(self, num_edges: int) -> Optional[torch.LongTensor]:
+        """Sample the indices of the edges which are kept by edge dropout.
+
+        :param num_edges:
+            The number of edges.
+
+        :return: shape: (num_kept_edges,)
+            The increasing indices of the kept edges, or None if no edge dropout is applied.
+        """
+        if not self.training or self.edge_dropout is None:
+            return None
+
+        # Get random dropout mask
+        edge_keep_mask = torch.rand(num_edges, device=self.device) > self.edge_dropout
+
+        return edge_keep_mask.nonzero().view(-1)
+
+    def _propagate_layers(
+        self,
+        x: torch.FloatTensor,
+        edges: Tuple[torch.LongTensor, torch.LongTensor, torch.LongTensor, Optional[torch.FloatTensor]],
+    ) -> torch.FloatTensor:
+        """Apply all R-GCN layers.
+
+        :param x: shape: (num_nodes, embedding_dim)
+            The initial node representations.
+        :param edges:
+            The prepared edges, cf. _prepare_edges.
+
+        :return: shape: (num_nodes, embedding_dim)
+            The enriched node representations.
+        """
+        # Different dropout for self-loops (only in training mode)
+        if self.training and self.self_loop_dropout is not None:
+            node_keep_mask = torch.rand(x.shape[0], device=x.device) > self.self_loop_dropout
+        else:
+            node_keep_mask = None
+
+        # Without autograd, there are no intermediate results to keep, and the messages can be computed chunk-wise
+        chunk_size = None if torch.is_grad_enabled() else self.inference_chunk_size
+
+        for i in range(self.num_layers):
+            # Compute the messages for all relations at once
+            new_x = self._propagate(x, i, *edges, chunk_size=chunk_size)
 
             # Self-loop
             self_w = self._get_relation_weights(i_layer=i, r=self.num_relations)
@@ -490,11 +626,150 @@ class RGCN(Model):
 
             x = new_x
 
-        if batch is None and self.buffer_messages:
-            self.enriched_embeddings = x
-
         return x
 
+    def _get_edges(
+        self,
+        edge_index: Optional[torch.LongTensor] = None,
+    ) -> Tuple[torch.LongTensor, torch.LongTensor, torch.LongTensor, Optional[torch.FloatTensor]]:
+        """Prepare a subset of the edges for message passing.
+
+        For the full graph, the result is computed only once and cached.
+
+        :param edge_index: shape: (num_kept_edges,)
+            The increasing indices of the edges to keep. If None, all edges are kept.
+
+        :return:
+            The prepared edges, cf. _prepare_edges.
+        """
+        if edge_index is None and self._edge_cache is not None and self._edge_cache[0].device == self.sources.device:
+            return self._edge_cache
+
+        sources, targets, edge_types = self.sources, self.targets, self.edge_types
+        if edge_index is not None:
+            sources, targets, edge_types = sources[edge_index], targets[edge_index], edge_types[edge_index]
+
+        result = self._prepare_edges(
+            sources=sources,
+            targets=targets,
+            edge_types=edge_types,
+            num_nodes=self.num_entities,
+        )
+        if edge_index is None:
+            self._edge_cache = result
+        return result
+
+    def _prepare_edges(
+        self,
+        sources: torch.LongTensor,
+        targets: torch.LongTensor,
+        edge_types: torch.LongTensor,
+        num_nodes: int,
+    ) -> Tuple[torch.LongTensor, torch.LongTensor, torch.LongTensor, Optional[torch.FloatTensor]]:
+        """Prepare edges for message passing.
+
+        :param sources: shape: (num_edges,)
+            The source indices.
+        :param targets: shape: (num_edges,)
+            The target indices.
+        :param edge_types: shape: (num_edges,)
+            The relation indices.
+        :param num_nodes:
+            The number of nodes.
+
+        :return:
+            A 4-tuple (sources, targets, edge_types, edge_weights) of shape (2 * num_edges,).
+        """
+        # send messages in both directions
+        sources, targets = (
+            torch.stack([sources, targets], dim=-1).view(-1),
+            torch.stack([targets, sources], dim=-1).view(-1),
+        )
+        edge_types = edge_types.repeat_interleave(2)
+
+        # Normalize messages by relation-specific degree: offsetting the node indices by the relation makes the
+        # degrees computed by the weighting function relation-specific, while calling it only once
+        if self.edge_weighting is None:
+            edge_weights = None
+        else:
+            edge_weights = self.edge_weighting(
+                source=edge_types * num_nodes + sources,
+                target=edge_types * num_nodes + targets,
+            )
+
+        return sources, targets, edge_types, edge_weights
+
+    def _propagate(
+        self,
+        x: torch.FloatTensor,
+        i_layer: int,
+        sources: torch.LongTensor,
+        targets: torch.LongTensor,
+        edge_types: torch.LongTensor,
+        edge_weights: Optional[torch.FloatTensor],
+        chunk_size: Optional[int] = None,
+    ) -> torch.FloatTensor:
+        """Compute the aggregated messages of one layer for all relations.
+
+        :param x: shape: (num_nodes, embedding_dim)
+            The node representations.
+        :param i_layer:
+            The layer index.
+        :param sources: shape: (num_edges,)
+            The source indices.
+        :param targets: shape: (num_edges,)
+            The target indices.
+        :param edge_types: shape: (num_edges,)
+            The relation indices.
+        :param edge_weights: shape: (num_edges,)
+            The edge weights, if any.
+        :param chunk_size: >0
+            The number of edges for which messages are computed at once. If None, all messages are computed at once.
+
+        :return: shape: (num_nodes, embedding_dim)
+            The aggregated messages.
+        """
+        if self.decomposition == 'basis':
+            # With W_r = sum_b att[r, b] B_b, the messages can be aggregated per base before multiplying with the
+            # bases, i.e. sum_e w_e x_s W_r = sum_b (sum_e w_e att[r, b] x_s) B_b
+            aggregated = [torch.zeros_like(x) for _ in range(self.num_bases)]
+            for start, stop in _chunk_bounds(0, sources.shape[0], chunk_size):
+                # shape: (chunk_size, num_bases)
+                coefficients = self.att[i_layer][edge_types[start:stop]]
+                if edge_weights is not None:
+                    coefficients = coefficients * edge_weights[start:stop].unsqueeze(dim=-1)
+                # shape: (chunk_size, embedding_dim)
+                x_s = x[sources[start:stop]]
+                for b, aggregated_b in enumerate(aggregated):
+                    aggregated_b.index_add_(
+                        dim=0,
+                        index=targets[start:stop],
+                        source=x_s * coefficients[:, b].unsqueeze(dim=-1),
+                    )
+            # shape: (num_nodes, num_bases, embedding_dim)
+            aggregated = torch.stack(aggregated, dim=1)
+            return torch.einsum('nbi,bij->nj', aggregated, self.bases[i_layer])
+
+        if self.decomposition == 'block':
+            # shape: (num_relations + 1, num_blocks, block_size, block_size)
+            blocks = self.bases[i_layer]
+            block_size = self.embedding_dim // self.num_bases
+            new_x = torch.zeros_like(x)
+            # Each edge is multiplied with the blocks of its relation, for all relations at once. The gathered blocks
+            # occupy chunk_size * embedding_dim * block_size elements.
+            for start, stop in _chunk_bounds(0, sources.shape[0], chunk_size):
+                # shape: (chunk_size, num_blocks, block_size)
+                x_s = x[sources[start:stop]].view(-1, self.num_bases, block_size)
+                # Compute message (b x nb x bs) * (b x nb x bs x bs) = (b x nb x bs)
+                m = torch.einsum('nbi,nbij->nbj', x_s, blocks[edge_types[start:stop]]).reshape(-1, self.embedding_dim)
+                if edge_weights is not None:
+                    m = m * edge_weights[start:stop].unsqueeze(dim=-1)
+                # Aggregate messages in target
+                new_x.index_add_(dim=0, index=targets[start:stop], source=m)
+            return new_x
+
+        raise AssertionError(f'Unknown decomposition: {self.decomposition}')
+
     def _get_relation_weights(self, i_layer: int, r: int) -> torch.FloatTensor:
         if self.decomposition == 'block':
             # allocate weight
@@ -525,5 +800,26 @@ class RGCN(Model):
 
     def score_hrt(self, hrt_batch: torch.LongTensor) -> torch.FloatTensor:  # noqa: D102
         # Enrich embeddings
+        if self.training and self.num_neighbors is not None:
+            # only of the batch's entities, on a sampled subgraph with relabelled entities
+            x, local_batch = self._enrich_subgraph(batch=hrt_batch)
+            # Score against the subgraph's embeddings; the decoder's entity embeddings keep their shape
+            entity_embeddings = self.base_model.entity_embeddings
+            self.base_model.entity_embeddings = _TensorEmbedding(weight=x)
+            try:
+                return self.base_model.score_hrt(hrt_batch=local_batch)
+            finally:
+                self.base_model.entity_embeddings = entity_embeddings
+
         self.base_model.entity_embeddings.weight.data = self._enrich_embeddings(batch=None)
         return self.base_model.score_hrt(hrt_batch=hrt_batch)
+
+    def score_t(self, hr_batch: torch.LongTensor, slice_size: Optional[int] = None) -> torch.FloatTensor:  # noqa: D102
+        # Enrich embeddings; the enriched embeddings are buffered, and shared between batches
+        self.base_model.entity_embeddings.weight.data = self._enrich_embeddings(batch=None)
+        return self.base_model.score_t_sliced(hr_batch=hr_batch, slice_size=slice_size)
+
+    def score_h(self, rt_batch: torch.LongTensor, slice_size: Optional[int] = None) -> torch.FloatTensor:  # noqa: D102
+        # Enrich embeddings; the enriched embeddings are buffered, and shared between batches
+        self.base_model.entity_embeddings.weight.data = self._enrich_embeddings(batch=None)
+        return self.base_model.score_h_sliced(rt_batch=rt_batch, slice_size=slice_size)
@@ -82,7 +82,11 @@ class RotatE(EntityRelationEmbeddingModel):
         assert torch.allclose(torch.norm(relations, p=2, dim=-1), phases.new_ones(size=(1, 1)))
         self.relation_embeddings.weight.data = relations.view(self.num_relations, self.embedding_dim)
 
-    def post_parameter_update(self):  # noqa: D102
+    def post_parameter_update(
+        self,
+        entity_ids: Optional[torch.LongTensor] = None,
+        relation_ids: Optional[torch.LongTensor] = None,
+    ) -> None:
         r"""Normalize the length of relation vectors, if the forward constraint has not been applied yet.
 
         The `modulus of complex number <https://en.wikipedia.org/wiki/Absolute_value#Complex_numbers>`_ is given as:
@@ -99,14 +103,21 @@ class RotatE(EntityRelationEmbeddingModel):
                      = \left(\sum_{i=1}^d \operatorname{Re}(x_i)^2) + (\sum_{i=1}^d \operatorname{Im}(x_i)^2\right)
                      = \|\operatorname{Re}(x)\|^2 + \|\operatorname{Im}(x)\|^2
                      = \| [\operatorname{Re}(x); \operatorname{Im}(x)] \|^2
+
+        :param entity_ids: shape: (n,)
+            The IDs of the entities which may have changed, cf. :meth:`pykeen.models.Model.post_parameter_update`.
+        :param relation_ids: shape: (m,)
+            The IDs of the relations which may have changed. If None, all relation embeddings are normalized.
         """
         # Make sure to call super first
-        super().post_parameter_update()
+        super().post_parameter_update(entity_ids=entity_ids, relation_ids=relation_ids)
 
         # Normalize relation embeddings
-        rel = self.relation_embeddings.weight.data.view(self.num_relations, self.real_embedding_dim, 2)
-        rel = functional.normalize(rel, p=2, dim=-1)
-        self.relation_embeddings.weight.data = rel.view(self.num_relations, self.embedding_dim)
+        self._constrain_rows_(
+            self.relation_embeddings.weight,
+            lambda rel: functional.normalize(rel.view(-1, self.real_embedding_dim, 2), p=2, dim=-1).view(rel.shape),
+            ids=relation_ids,
+        )
 
     @staticmethod
     def interaction_function(
@@ -10,7 +10,7 @@ from ..base import EntityRelationEmbeddingModel
 from ...losses import Loss, SoftplusLoss
 from ...regularizers import PowerSumRegularizer, Regularizer
 from ...triples import TriplesFactory
-from ...utils import get_embedding, get_embedding_in_canonical_shape
+from ...utils import get_embedding, get_embedding_in_canonical_shape, tensor_product_sum
 
 __all__ = [
     'SimplE',
@@ -115,7 +115,7 @@ class SimplE(EntityRelationEmbeddingModel):
         h = get_embedding_in_canonical_shape(embedding=self.entity_embeddings, ind=h_ind)
         r = get_embedding_in_canonical_shape(embedding=self.relation_embeddings, ind=r_ind)
         t = get_embedding_in_canonical_shape(embedding=self.tail_entity_embeddings, ind=t_ind)
-        scores = (h * r * t).sum(dim=-1)
+        scores = tensor_product_sum(h, r, t)
 
         # Regularization
         self.regularize_if_necessary(h, r, t)
@@ -124,7 +124,7 @@ class SimplE(EntityRelationEmbeddingModel):
         h = get_embedding_in_canonical_shape(embedding=self.entity_embeddings, ind=t_ind)
         r = get_embedding_in_canonical_shape(embedding=self.inverse_relation_embeddings, ind=r_ind)
         t = get_embedding_in_canonical_shape(embedding=self.tail_entity_embeddings, ind=h_ind)
-        scores = 0.5 * (scores + (h * r * t).sum(dim=-1))
+        scores = 0.5 * (scores + tensor_product_sum(h, r, t))
 
         # Regularization
         self.regularize_if_necessary(h, r, t)
@@ -15,7 +15,7 @@ from ..init import embedding_xavier_uniform_
 from ...losses import Loss
 from ...regularizers import Regularizer
 from ...triples import TriplesFactory
-from ...utils import get_embedding
+from ...utils import get_embedding, pairwise_distances
 
 __all__ = [
     'StructuredEmbedding',
@@ -99,12 +99,16 @@ class StructuredEmbedding(EntityEmbeddingModel):
             nn.init.uniform_(emb.weight, a=-init_bound, b=+init_bound)
             functional.normalize(emb.weight.data, p=2, dim=-1, out=emb.weight.data, )
 
-    def post_parameter_update(self) -> None:  # noqa: D102
+    def post_parameter_update(  # noqa: D102
+        self,
+        entity_ids: Optional[torch.LongTensor] = None,
+        relation_ids: Optional[torch.LongTensor] = None,
+    ) -> None:
         # Make sure to call super first
-        super().post_parameter_update()
+        super().post_parameter_update(entity_ids=entity_ids, relation_ids=relation_ids)
 
         # Normalise embeddings of entities
-        functional.normalize(self.entity_embeddings.weight.data, out=self.entity_embeddings.weight.data)
+        self._constrain_rows_(self.entity_embeddings.weight, functional.normalize, ids=entity_ids)
 
     def score_hrt(self, hrt_batch: torch.LongTensor) -> torch.FloatTensor:  # noqa: D102
         # Get embeddings
@@ -120,58 +124,60 @@ class StructuredEmbedding(EntityEmbeddingModel):
         scores = -torch.norm(proj_h - proj_t, dim=1, p=self.scoring_fct_norm)
         return scores
 
-    def score_t(self, hr_batch: torch.LongTensor, slice_size: int = None) -> torch.FloatTensor:  # noqa: D102
-        # Get embeddings
-        h = self.entity_embeddings(hr_batch[:, 0]).view(-1, self.embedding_dim, 1)
-        rel_h = self.left_relation_embeddings(hr_batch[:, 1]).view(-1, self.embedding_dim, self.embedding_dim)
-        rel_t = self.right_relation_embeddings(hr_batch[:, 1]).view(-1, 1, self.embedding_dim, self.embedding_dim)
-        t_all = self.entity_embeddings.weight.view(1, -1, self.embedding_dim, 1)
-
-        if slice_size is not None:
-            proj_t_arr = []
-            # Project entities
-            proj_h = rel_h @ h
-
-            for t in torch.split(t_all, slice_size, dim=1):
-                # Project entities
-                proj_t = rel_t @ t
-                proj_t_arr.append(proj_t)
+    def _project_all_entities(self, relation_id: int, side: str) -> torch.FloatTensor:
+        """Project all entities with the relation's head or tail projection, re-using cached ones in evaluation mode.
 
-            proj_t = torch.cat(proj_t_arr, dim=1)
+        :param relation_id: The relation ID.
+        :param side: in {'h', 't'}
+            Whether to use the projection of head or tail entities.
 
-        else:
-            # Project entities
-            proj_h = rel_h @ h
-            proj_t = rel_t @ t_all
+        :return: shape: (num_entities, d)
+        """
+        return self._get_projection(
+            key=(side, relation_id),
+            compute=lambda: [self._project(entity_ids=None, relation_id=relation_id, side=side)],
+        )[0]
 
-        scores = -torch.norm(proj_h[:, None, :, 0] - proj_t[:, :, :, 0], dim=-1, p=self.scoring_fct_norm)
+    def _project(self, entity_ids: Optional[torch.LongTensor], relation_id: int, side: str) -> torch.FloatTensor:
+        """Project entities with the relation's head or tail projection.
 
-        return scores
+        :param entity_ids: shape: (n,)
+            The entity IDs. If None, project all entities.
+        :param relation_id: The relation ID.
+        :param side: in {'h', 't'}
+            Whether to use the projection of head or tail entities.
 
-    def score_h(self, rt_batch: torch.LongTensor, slice_size: int = None) -> torch.FloatTensor:  # noqa: D102
-        # Get embeddings
-        h_all = self.entity_embeddings.weight.view(1, -1, self.embedding_dim, 1)
-        rel_h = self.left_relation_embeddings(rt_batch[:, 0]).view(-1, 1, self.embedding_dim, self.embedding_dim)
-        rel_t = self.right_relation_embeddings(rt_batch[:, 0]).view(-1, self.embedding_dim, self.embedding_dim)
-        t = self.entity_embeddings(rt_batch[:, 1]).view(-1, self.embedding_dim, 1)
-
-        if slice_size is not None:
-            proj_h_arr = []
+        :return: shape: (n, d)
+        """
+        embeddings = self.left_relation_embeddings if side == 'h' else self.right_relation_embeddings
+        rel = embeddings.weight[relation_id].view(self.embedding_dim, self.embedding_dim)
+        e = self.entity_embeddings.weight
+        if entity_ids is not None:
+            e = e[entity_ids]
+        return e @ rel.t()
 
+    def score_t(self, hr_batch: torch.LongTensor, slice_size: int = None) -> torch.FloatTensor:  # noqa: D102
+        def _score(relation_id: int, rows: torch.LongTensor) -> torch.FloatTensor:
             # Project entities
-            proj_t = rel_t @ t
+            proj_h = self._project(entity_ids=hr_batch[rows, 0], relation_id=relation_id, side='h')
+            proj_t_all = self._project_all_entities(relation_id=relation_id, side='t')
+            return torch.cat([
+                -pairwise_distances(proj_h, proj_t, p=self.scoring_fct_norm)
+                for proj_t in torch.split(proj_t_all, slice_size or self.num_entities)
+            ], dim=1)
 
-            for h in torch.split(h_all, slice_size, dim=1):
-                # Project entities
-                proj_h = rel_h @ h
-                proj_h_arr.append(proj_h)
+        # All tails are projected once per relation in the batch
+        return self._score_grouped_by_relation(relations=hr_batch[:, 1], score=_score)
 
-            proj_h = torch.cat(proj_h_arr, dim=1)
-        else:
+    def score_h(self, rt_batch: torch.LongTensor, slice_size: int = None) -> torch.FloatTensor:  # noqa: D102
+        def _score(relation_id: int, rows: torch.LongTensor) -> torch.FloatTensor:
             # Project entities
-            proj_h = rel_h @ h_all
-            proj_t = rel_t @ t
-
-        scores = -torch.norm(proj_h[:, :, :, 0] - proj_t[:, None, :, 0], dim=-1, p=self.scoring_fct_norm)
-
-        return scores
+            proj_h_all = self._project_all_entities(relation_id=relation_id, side='h')
+            proj_t = self._project(entity_ids=rt_batch[rows, 1], relation_id=relation_id, side='t')
+            return torch.cat([
+                -pairwise_distances(proj_t, proj_h, p=self.scoring_fct_norm)
+                for proj_h in torch.split(proj_h_all, slice_size or self.num_entities)
+            ], dim=1)
+
+        # All heads are projected once per relation in the batch
+        return self._score_grouped_by_relation(relations=rt_batch[:, 0], score=_score)
@@ -6,13 +6,14 @@ from typing import Optional
 
 import torch
 import torch.autograd
+from torch.nn import functional
 
 from ..base import EntityRelationEmbeddingModel
 from ..init import embedding_xavier_normal_
 from ...losses import Loss
 from ...regularizers import Regularizer
 from ...triples import TriplesFactory
-from ...utils import clamp_norm, get_embedding, get_embedding_in_canonical_shape
+from ...utils import clamp_norm, get_embedding, get_embedding_in_canonical_shape, pairwise_distances
 
 __all__ = [
     'TransD',
@@ -66,6 +67,67 @@ def _project_entity(
     return e_bot
 
 
+def _projected_distances(
+    x: torch.FloatTensor,
+    r_p: torch.FloatTensor,
+    e: torch.FloatTensor,
+    e_p: torch.FloatTensor,
+    eps: float = 1.0e-08,
+) -> torch.FloatTensor:
+    r"""Compute the squared distances between each query and all entities, projected as in :func:`_project_entity`.
+
+    The projection of entity $e$ for relation $r$ is $e_{\bot} = c (s r_p + e')$ with the relation-independent
+    scalar $s = e_p^T e$, the truncated or zero-padded entity embedding $e'$, and the factor $c \leq 1$ which
+    enforces $\|e_{\bot}\|_2 \leq 1$. Hence,
+
+    .. math::
+
+        \|s r_p + e'\|^2 = s^2 \|r_p\|^2 + 2 s r_p^T e' + \|e'\|^2
+
+        \|x - e_{\bot}\|^2 = \|x\|^2 + c^2 \|s r_p + e'\|^2 - 2 c (s x^T r_p + x^T e')
+
+    can be computed with matrix multiplications, such that only tensors of shape (batch_size, num_entities) are
+    created.
+
+    :param x: shape: (batch_size, d_r)
+        The queries.
+    :param r_p: shape: (batch_size, d_r)
+        The relation projections.
+    :param e: shape: (num_entities, d_e)
+        The entity embeddings.
+    :param e_p: shape: (num_entities, d_e)
+        The entity projections.
+    :param eps:
+        A small value to avoid division by zero, cf. :func:`pykeen.utils.clamp_norm`.
+
+    :return: shape: (batch_size, num_entities)
+        The squared distances.
+    """
+    d_r = r_p.shape[-1]
+    # shape: (1, num_entities)
+    s = torch.sum(e_p * e, dim=-1).unsqueeze(dim=0)
+    # shape: (num_entities, d_r)
+    e = e[:, :d_r]
+    if e.shape[-1] < d_r:
+        e = functional.pad(e, [0, d_r - e.shape[-1]])
+
+    # squared norm of the projected entities before clamping, shape: (batch_size, num_entities)
+    squared_norm = (
+        s ** 2 * (r_p ** 2).sum(dim=-1, keepdim=True)
+        + 2 * s * (r_p @ e.t())
+        + (e ** 2).sum(dim=-1).unsqueeze(dim=0)
+    ).clamp_min(eps ** 2)
+    # scaling factor enforcing the norm constraint, cf. clamp_norm
+    mask = (squared_norm < 1).type_as(squared_norm)
+    c = mask + (1 - mask) / squared_norm.sqrt()
+
+    return (
+        (x ** 2).sum(dim=-1, keepdim=True)
+        + c ** 2 * squared_norm
+        - 2 * c * (s * (x * r_p).sum(dim=-1, keepdim=True) + x @ e.t())
+    ).clamp_min(0)
+
+
 class TransD(EntityRelationEmbeddingModel):
     r"""An implementation of TransD from [ji2015]_.
 
@@ -140,18 +202,17 @@ class TransD(EntityRelationEmbeddingModel):
         # Finalize initialization
         self.reset_parameters_()
 
-    def post_parameter_update(self) -> None:  # noqa: D102
+    def post_parameter_update(  # noqa: D102
+        self,
+        entity_ids: Optional[torch.LongTensor] = None,
+        relation_ids: Optional[torch.LongTensor] = None,
+    ) -> None:
         # Make sure to call super first
-        super().post_parameter_update()
+        super().post_parameter_update(entity_ids=entity_ids, relation_ids=relation_ids)
 
         # Normalize entity embeddings
-        self.entity_embeddings.weight.data = clamp_norm(x=self.entity_embeddings.weight.data, maxnorm=1., p=2, dim=-1)
-        self.relation_embeddings.weight.data = clamp_norm(
-            x=self.relation_embeddings.weight.data,
-            maxnorm=1.,
-            p=2,
-            dim=-1,
-        )
+        self._clamp_rows_(self.entity_embeddings.weight, ids=entity_ids)
+        self._clamp_rows_(self.relation_embeddings.weight, ids=relation_ids)
 
     def _reset_parameters_(self):  # noqa: D102
         embedding_xavier_normal_(self.entity_embeddings)
@@ -228,8 +289,65 @@ class TransD(EntityRelationEmbeddingModel):
     def score_hrt(self, hrt_batch: torch.LongTensor) -> torch.FloatTensor:  # noqa: D102
         return self._score(h_ind=hrt_batch[:, 0], r_ind=hrt_batch[:, 1], t_ind=hrt_batch[:, 2])
 
+    def _project_all_entities(self, relation_id: int) -> torch.FloatTensor:
+        """Project all entities into the relation space, re-using cached projections in evaluation mode.
+
+        :param relation_id: The relation ID.
+
+        :return: shape: (num_entities, d_r)
+        """
+        def _compute():
+            return [_project_entity(
+                e=self.entity_embeddings.weight.unsqueeze(dim=0),
+                e_p=self.entity_projections.weight.unsqueeze(dim=0),
+                r=self.relation_embeddings.weight[relation_id].view(1, 1, -1),
+                r_p=self.relation_projections.weight[relation_id].view(1, 1, -1),
+            )[0]]
+
+        return self._get_projection(key=relation_id, compute=_compute)[0]
+
     def score_t(self, hr_batch: torch.LongTensor) -> torch.FloatTensor:  # noqa: D102
-        return self._score(h_ind=hr_batch[:, 0], r_ind=hr_batch[:, 1], t_ind=None)
+        if self._caches_projections:
+            def _score(relation_id: int, rows: torch.LongTensor) -> torch.FloatTensor:
+                e_bot = self._project_all_entities(relation_id=relation_id)
+                r = self.relation_embeddings.weight[relation_id].unsqueeze(dim=0)
+                return -pairwise_distances(e_bot[hr_batch[rows, 0]] + r, e_bot, squared=True)
+
+            return self._score_grouped_by_relation(relations=hr_batch[:, 1], score=_score)
+
+        h = get_embedding_in_canonical_shape(embedding=self.entity_embeddings, ind=hr_batch[:, 0])
+        h_p = get_embedding_in_canonical_shape(embedding=self.entity_projections, ind=hr_batch[:, 0])
+        r = get_embedding_in_canonical_shape(embedding=self.relation_embeddings, ind=hr_batch[:, 1])
+        r_p = get_embedding_in_canonical_shape(embedding=self.relation_projections, ind=hr_batch[:, 1])
+        h_bot = _project_entity(e=h, e_p=h_p, r=r, r_p=r_p)
+
+        # The tails are projected implicitly, cf. _projected_distances
+        return -_projected_distances(
+            x=(h_bot + r)[:, 0, :],
+            r_p=r_p[:, 0, :],
+            e=self.entity_embeddings.weight,
+            e_p=self.entity_projections.weight,
+        )
 
     def score_h(self, rt_batch: torch.LongTensor) -> torch.FloatTensor:  # noqa: D102
-        return self._score(h_ind=None, r_ind=rt_batch[:, 0], t_ind=rt_batch[:, 1])
+        if self._caches_projections:
+            def _score(relation_id: int, rows: torch.LongTensor) -> torch.FloatTensor:
+                e_bot = self._project_all_entities(relation_id=relation_id)
+                r = self.relation_embeddings.weight[relation_id].unsqueeze(dim=0)
+                return -pairwise_distances(e_bot[rt_batch[rows, 1]] - r, e_bot, squared=True)
+
+            return self._score_grouped_by_relation(relations=rt_batch[:, 0], score=_score)
+
+        r = get_embedding_in_canonical_shape(embedding=self.relation_embeddings, ind=rt_batch[:, 0])
+        r_p = get_embedding_in_canonical_shape(embedding=self.relation_projections, ind=rt_batch[:, 0])
+        t = get_embedding_in_canonical_shape(embedding=self.entity_embeddings, ind=rt_batch[:, 1])
+        t_p = get_embedding_in_canonical_shape(embedding=self.entity_projections, ind=rt_batch[:, 1])
+        t_bot = _project_entity(e=t, e_p=t_p, r=r, r_p=r_p)
+
+        # ||h_bot + r - t_bot|| = ||h_bot - (t_bot - r)||, where the heads are projected implicitly
+        return -_projected_distances(
+            x=(t_bot - r)[:, 0, :],
+            r_p=r_p[:, 0, :],
+            e=self.entity_embeddings.weight,
+            e_p=self.entity_projections.weight,
+        )
@@ -13,6 +13,7 @@ from ..init import embedding_xavier_uniform_
 from ...losses import Loss
 from ...regularizers import Regularizer
 from ...triples import TriplesFactory
+from ...utils import pairwise_distances
 
 __all__ = [
     'TransE',
@@ -85,12 +86,16 @@ class TransE(EntityRelationEmbeddingModel):
         # Initialise relation embeddings to unit length
         functional.normalize(self.relation_embeddings.weight.data, out=self.relation_embeddings.weight.data)
 
-    def post_parameter_update(self) -> None:  # noqa: D102
+    def post_parameter_update(  # noqa: D102
+        self,
+        entity_ids: Optional[torch.LongTensor] = None,
+        relation_ids: Optional[torch.LongTensor] = None,
+    ) -> None:
         # Make sure to call super first
-        super().post_parameter_update()
+        super().post_parameter_update(entity_ids=entity_ids, relation_ids=relation_ids)
 
         # Normalize entity embeddings
-        functional.normalize(self.entity_embeddings.weight.data, out=self.entity_embeddings.weight.data)
+        self._constrain_rows_(self.entity_embeddings.weight, functional.normalize, ids=entity_ids)
 
     def score_hrt(self, hrt_batch: torch.LongTensor) -> torch.FloatTensor:  # noqa: D102
         # Get embeddings
@@ -106,7 +111,7 @@ class TransE(EntityRelationEmbeddingModel):
         r = self.relation_embeddings(hr_batch[:, 1])
         t = self.entity_embeddings.weight
 
-        return -torch.norm(h[:, None, :] + r[:, None, :] - t[None, :, :], dim=-1, p=self.scoring_fct_norm)
+        return -pairwise_distances(h + r, t, p=self.scoring_fct_norm)
 
     def score_h(self, rt_batch: torch.LongTensor) -> torch.FloatTensor:  # noqa: D102
         # Get embeddings
@@ -114,4 +119,34 @@ class TransE(EntityRelationEmbeddingModel):
         r = self.relation_embeddings(rt_batch[:, 0])
         t = self.entity_embeddings(rt_batch[:, 1])
 
-        return -torch.norm(h[None, :, :] + r[:, None, :] - t[:, None, :], dim=-1, p=self.scoring_fct_norm)
+        # ||h + r - t|| = ||h - (t - r)||
+        return -pairwise_distances(t - r, h, p=self.scoring_fct_norm)
+
+    def score_t_candidates(  # noqa: D102
+        self,
+        hr_batch: torch.LongTensor,
+        tail_ids: torch.LongTensor,
+    ) -> torch.FloatTensor:
+        # Get embeddings
+        h = self.entity_embeddings(hr_batch[:, 0])
+        r = self.relation_embeddings(hr_batch[:, 1])
+        t = self.entity_embeddings(tail_ids)
+
+        if tail_ids.ndimension() == 1:
+            return -pairwise_distances(h + r, t, p=self.scoring_fct_norm)
+        return -torch.norm((h + r).unsqueeze(dim=1) - t, dim=-1, p=self.scoring_fct_norm)
+
+    def score_h_candidates(  # noqa: D102
+        self,
+        rt_batch: torch.LongTensor,
+        head_ids: torch.LongTensor,
+    ) -> torch.FloatTensor:
+        # Get embeddings
+        h = self.entity_embeddings(head_ids)
+        r = self.relation_embeddings(rt_batch[:, 0])
+        t = self.entity_embeddings(rt_batch[:, 1])
+
+        # ||h + r - t|| = ||h - (t - r)||
+        if head_ids.ndimension() == 1:
+            return -pairwise_distances(t - r, h, p=self.scoring_fct_norm)
+        return -torch.norm(h - (t - r).unsqueeze(dim=1), dim=-1, p=self.scoring_fct_norm)
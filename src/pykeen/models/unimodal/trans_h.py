@@ -11,13 +11,48 @@ from ..base import EntityRelationEmbeddingModel
 from ...losses import Loss
 from ...regularizers import Regularizer, TransHRegularizer
 from ...triples import TriplesFactory
-from ...utils import get_embedding
+from ...utils import get_embedding, pairwise_distances
 
 __all__ = [
     'TransH',
 ]
 
 
+def _hyperplane_distances(
+    x: torch.FloatTensor,
+    w: torch.FloatTensor,
+    e: torch.FloatTensor,
+) -> torch.FloatTensor:
+    r"""Compute the squared distances between each query and all entities projected to the query's hyperplane.
+
+    With the projection $e_{\bot} = e - (w^T e) w$, the squared distance expands to
+
+    .. math::
+
+        \|x - e_{\bot}\|^2 = \|x\|^2 + \|e\|^2 + (w^T e)^2 (\|w\|^2 - 2) - 2 e^T (x - (w^T x) w)
+
+    such that only tensors of shape (batch_size, num_entities) are created.
+
+    :param x: shape: (batch_size, d)
+        The queries.
+    :param w: shape: (batch_size, d)
+        The normal vectors of the hyperplanes.
+    :param e: shape: (num_entities, d)
+        The (unprojected) entity embeddings.
+
+    :return: shape: (batch_size, num_entities)
+        The squared distances.
+    """
+    # shape: (batch_size, num_entities)
+    we = w @ e.t()
+    return (
+        (x ** 2).sum(dim=-1, keepdim=True)
+        + (e ** 2).sum(dim=-1).unsqueeze(dim=0)
+        + we ** 2 * ((w ** 2).sum(dim=-1, keepdim=True) - 2)
+        - 2 * (x - torch.sum(w * x, dim=-1, keepdim=True) * w) @ e.t()
+    ).clamp_min(0)
+
+
 class TransH(EntityRelationEmbeddingModel):
     r"""An implementation of TransH [wang2014]_.
 
@@ -108,11 +143,16 @@ class TransH(EntityRelationEmbeddingModel):
             emb.reset_parameters()
         # TODO: Add initialization
 
-    def post_parameter_update(self) -> None:  # noqa: D102
+    def post_parameter_update(  # noqa: D102
+        self,
+        entity_ids: Optional[torch.LongTensor] = None,
+        relation_ids: Optional[torch.LongTensor] = None,
+    ) -> None:
         # Make sure to call super first
-        super().post_parameter_update()
+        super().post_parameter_update(entity_ids=entity_ids, relation_ids=relation_ids)
 
-        # Normalise the normal vectors by their l2 norms
+        # Normalise the normal vectors by their l2 norms. The regularization term comprises all normal vectors, cf.
+        # regularize_if_necessary, such that all of them may have changed.
         functional.normalize(
             self.normal_vector_embeddings.weight.data,
             out=self.normal_vector_embeddings.weight.data,
@@ -144,7 +184,29 @@ class TransH(EntityRelationEmbeddingModel):
 
         return -torch.norm(ph + d_r - pt, p=2, dim=-1, keepdim=True)
 
+    def _project_all_entities(self, relation_id: int) -> torch.FloatTensor:
+        """Project all entities onto the relation's hyperplane, re-using cached projections in evaluation mode.
+
+        :param relation_id: The relation ID.
+
+        :return: shape: (num_entities, d)
+        """
+        def _compute():
+            w_r = self.normal_vector_embeddings.weight[relation_id].unsqueeze(dim=0)
+            e = self.entity_embeddings.weight
+            return [e - torch.sum(w_r * e, dim=-1, keepdim=True) * w_r]
+
+        return self._get_projection(key=relation_id, compute=_compute)[0]
+
     def score_t(self, hr_batch: torch.LongTensor) -> torch.FloatTensor:  # noqa: D102
+        if self._caches_projections:
+            def _score(relation_id: int, rows: torch.LongTensor) -> torch.FloatTensor:
+                e_bot = self._project_all_entities(relation_id=relation_id)
+                d_r = self.relation_embeddings.weight[relation_id].unsqueeze(dim=0)
+                return -pairwise_distances(e_bot[hr_batch[rows, 0]] + d_r, e_bot)
+
+            return self._score_grouped_by_relation(relations=hr_batch[:, 1], score=_score)
+
         # Get embeddings
         h = self.entity_embeddings(hr_batch[:, 0])
         d_r = self.relation_embeddings(hr_batch[:, 1])
@@ -153,14 +215,22 @@ class TransH(EntityRelationEmbeddingModel):
 
         # Project to hyperplane
         ph = h - torch.sum(w_r * h, dim=-1, keepdim=True) * w_r
-        pt = t[None, :, :] - torch.sum(w_r[:, None, :] * t[None, :, :], dim=-1, keepdim=True) * w_r[:, None, :]
 
         # Regularization term
         self.regularize_if_necessary()
 
-        return -torch.norm(ph[:, None, :] + d_r[:, None, :] - pt, p=2, dim=-1)
+        # The tails are projected implicitly, cf. _hyperplane_distances
+        return -_hyperplane_distances(x=ph + d_r, w=w_r, e=t).clamp_min(1.0e-30).sqrt()
 
     def score_h(self, rt_batch: torch.LongTensor) -> torch.FloatTensor:  # noqa: D102
+        if self._caches_projections:
+            def _score(relation_id: int, rows: torch.LongTensor) -> torch.FloatTensor:
+                e_bot = self._project_all_entities(relation_id=relation_id)
+                d_r = self.relation_embeddings.weight[relation_id].unsqueeze(dim=0)
+                return -pairwise_distances(e_bot[rt_batch[rows, 1]] - d_r, e_bot)
+
+            return self._score_grouped_by_relation(relations=rt_batch[:, 0], score=_score)
+
         # Get embeddings
         h = self.entity_embeddings.weight
         rel_id = rt_batch[:, 0]
@@ -169,10 +239,10 @@ class TransH(EntityRelationEmbeddingModel):
         t = self.entity_embeddings(rt_batch[:, 1])
 
         # Project to hyperplane
-        ph = h[None, :, :] - torch.sum(w_r[:, None, :] * h[None, :, :], dim=-1, keepdim=True) * w_r[:, None, :]
         pt = t - torch.sum(w_r * t, dim=-1, keepdim=True) * w_r
 
         # Regularization term
         self.regularize_if_necessary()
 
-        return -torch.norm(ph + d_r[:, None, :] - pt[:, None, :], p=2, dim=-1)
+        # ||ph + d_r - pt|| = ||ph - (pt - d_r)||, where the heads are projected implicitly, cf. _hyperplane_distances
+        return -_hyperplane_distances(x=pt - d_r, w=w_r, e=h).clamp_min(1.0e-30).sqrt()
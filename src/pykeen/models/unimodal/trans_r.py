@@ -14,7 +14,7 @@ from ..init import embedding_xavier_uniform_
 from ...losses import Loss
 from ...regularizers import Regularizer
 from ...triples import TriplesFactory
-from ...utils import clamp_norm, get_embedding
+from ...utils import clamp_norm, get_embedding, pairwise_distances
 
 __all__ = [
     'TransR',
@@ -94,18 +94,17 @@ class TransR(EntityRelationEmbeddingModel):
         # Finalize initialization
         self.reset_parameters_()
 
-    def post_parameter_update(self) -> None:  # noqa: D102
+    def post_parameter_update(  # noqa: D102
+        self,
+        entity_ids: Optional[torch.LongTensor] = None,
+        relation_ids: Optional[torch.LongTensor] = None,
+    ) -> None:
         # Make sure to call super first
-        super().post_parameter_update()
+        super().post_parameter_update(entity_ids=entity_ids, relation_ids=relation_ids)
 
         # Normalize entity embeddings
-        self.entity_embeddings.weight.data = clamp_norm(x=self.entity_embeddings.weight.data, maxnorm=1., p=2, dim=-1)
-        self.relation_embeddings.weight.data = clamp_norm(
-            x=self.relation_embeddings.weight.data,
-            maxnorm=1.,
-            p=2,
-            dim=-1,
-        )
+        self._clamp_rows_(self.entity_embeddings.weight, ids=entity_ids)
+        self._clamp_rows_(self.relation_embeddings.weight, ids=relation_ids)
 
     def _reset_parameters_(self):  # noqa: D102
         # TODO: Initialize from TransE
@@ -158,20 +157,36 @@ class TransR(EntityRelationEmbeddingModel):
 
         return self.interaction_function(h=h, r=r, t=t, m_r=m_r).view(-1, 1)
 
+    def _project_all_entities(self, relation_id: int) -> torch.FloatTensor:
+        """Project all entities into the relation-specific space, re-using cached projections in evaluation mode.
+
+        :param relation_id: The relation ID.
+
+        :return: shape: (num_entities, d_r)
+        """
+        def _compute():
+            m_r = self.relation_projections.weight[relation_id].view(self.embedding_dim, self.relation_dim)
+            return [clamp_norm(self.entity_embeddings.weight @ m_r, p=2, dim=-1, maxnorm=1.)]
+
+        return self._get_projection(key=relation_id, compute=_compute)[0]
+
     def score_t(self, hr_batch: torch.LongTensor) -> torch.FloatTensor:  # noqa: D102
-        # Get embeddings
-        h = self.entity_embeddings(hr_batch[:, 0]).unsqueeze(dim=1)
-        r = self.relation_embeddings(hr_batch[:, 1]).unsqueeze(dim=1)
-        t = self.entity_embeddings.weight.unsqueeze(dim=0)
-        m_r = self.relation_projections(hr_batch[:, 1]).view(-1, self.embedding_dim, self.relation_dim)
+        def _score(relation_id: int, rows: torch.LongTensor) -> torch.FloatTensor:
+            e_bot = self._project_all_entities(relation_id=relation_id)
+            h_bot = e_bot[hr_batch[rows, 0]]
+            r = self.relation_embeddings.weight[relation_id].unsqueeze(dim=0)
+            return -pairwise_distances(h_bot + r, e_bot, squared=True)
 
-        return self.interaction_function(h=h, r=r, t=t, m_r=m_r)
+        # All tails are projected once per relation in the batch
+        return self._score_grouped_by_relation(relations=hr_batch[:, 1], score=_score)
 
     def score_h(self, rt_batch: torch.LongTensor) -> torch.FloatTensor:  # noqa: D102
-        # Get embeddings
-        h = self.entity_embeddings.weight.unsqueeze(dim=0)
-        r = self.relation_embeddings(rt_batch[:, 0]).unsqueeze(dim=1)
-        t = self.entity_embeddings(rt_batch[:, 1]).unsqueeze(dim=1)
-        m_r = self.relation_projections(rt_batch[:, 0]).view(-1, self.embedding_dim, self.relation_dim)
-
-        return self.interaction_function(h=h, r=r, t=t, m_r=m_r)
+        def _score(relation_id: int, rows: torch.LongTensor) -> torch.FloatTensor:
+            e_bot = self._project_all_entities(relation_id=relation_id)
+            t_bot = e_bot[rt_batch[rows, 1]]
+            r = self.relation_embeddings.weight[relation_id].unsqueeze(dim=0)
+            # ||h_bot + r - t_bot|| = ||h_bot - (t_bot - r)||
+            return -pairwise_distances(t_bot - r, e_bot, squared=True)
+
+        # All heads are projected once per relation in the batch
+        return self._score_grouped_by_relation(relations=rt_batch[:, 0], score=_score)
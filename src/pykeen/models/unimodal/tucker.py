@@ -13,6 +13,7 @@ from ..init import embedding_xavier_normal_
 from ...losses import BCEAfterSigmoidLoss, Loss
 from ...regularizers import Regularizer
 from ...triples import TriplesFactory
+from ...utils import tensor_product_sum
 
 __all__ = [
     'TuckER',
@@ -74,6 +75,8 @@ class TuckER(EntityRelationEmbeddingModel):
     loss_default = BCEAfterSigmoidLoss
     #: The default parameters for the default loss function class
     loss_default_kwargs = {}
+    #: The core tensor is contracted with each (head, relation) pair before the tail
+    factorizes_hr = True
 
     def __init__(
         self,
@@ -181,11 +184,50 @@ class TuckER(EntityRelationEmbeddingModel):
             whr = _apply_bn_to_tensor(batch_norm=self.bn_1, tensor=whr)
         whr = self.hidden_dropout_2(whr)
 
-        # Compute whr x_3 t
-        scores = torch.sum(whr * t, dim=-1)
+        # Compute whr x_3 t, with a single matrix multiplication if t comprises all entities
+        scores = tensor_product_sum(whr, t)
 
         return scores
 
+    def _score_all_heads_factorized(
+        self,
+        r: torch.FloatTensor,
+        t: torch.FloatTensor,
+    ) -> torch.FloatTensor:
+        """Score all heads in evaluation mode without materializing whr for all entities.
+
+        In evaluation mode, dropout is the identity, and batch normalization is an element-wise affine transformation
+        x -> a * x + c with fixed parameters. Hence, the score factorizes as
+
+            BN(h x_1 wr) x_3 t = BN(h) @ (wr @ (a * t)) + c @ t
+
+        where BN(h) is computed once for all entities, and the scores are obtained with one matrix multiplication.
+
+        :param r: shape: (batch_size, relation_dim)
+        :param t: shape: (batch_size, embedding_dim)
+        :return: shape: (batch_size, num_entities)
+        """
+        # shape: (num_entities, embedding_dim)
+        h = self.entity_embeddings.weight
+        if self.apply_batch_normalization:
+            h = self.bn_0(h)
+
+        # shape: (batch_size, embedding_dim, embedding_dim)
+        wr = torch.einsum('ijk,bj->bik', self.core_tensor, r)
+
+        offset = 0.
+        if self.apply_batch_normalization:
+            scale = (self.bn_1.running_var + self.bn_1.eps).rsqrt()
+            shift = -self.bn_1.running_mean * scale
+            if self.bn_1.affine:
+                scale = scale * self.bn_1.weight
+                shift = shift * self.bn_1.weight + self.bn_1.bias
+            t, offset = t * scale.unsqueeze(0), (t @ shift).unsqueeze(1)
+
+        # shape: (batch_size, embedding_dim)
+        query = (wr @ t.unsqueeze(-1))[:, :, 0]
+        return query @ h.t() + offset
+
     def score_hrt(self, hrt_batch: torch.LongTensor) -> torch.FloatTensor:  # noqa: D102
         # Get embeddings
         h = self.entity_embeddings(hrt_batch[:, 0]).unsqueeze(1)
@@ -208,10 +250,32 @@ class TuckER(EntityRelationEmbeddingModel):
 
         return scores
 
+    def score_t_candidates(  # noqa: D102
+        self,
+        hr_batch: torch.LongTensor,
+        tail_ids: torch.LongTensor,
+    ) -> torch.FloatTensor:
+        # Get embeddings
+        h = self.entity_embeddings(hr_batch[:, 0]).unsqueeze(1)
+        r = self.relation_embeddings(hr_batch[:, 1])
+        # shape: (1 or batch_size, num_candidates, embedding_dim)
+        t = self.entity_embeddings(tail_ids).view(-1, tail_ids.shape[-1], self.embedding_dim)
+
+        # Compute scores
+        scores = self._scoring_function(h=h, r=r, t=t)
+
+        return scores
+
     def score_h(self, rt_batch: torch.LongTensor) -> torch.FloatTensor:  # noqa: D102
         # Get embeddings
-        h = self.entity_embeddings.weight.unsqueeze(0)
         r = self.relation_embeddings(rt_batch[:, 0])
+
+        # In evaluation mode, score_h can be computed by a single matrix multiplication, too. During training,
+        # the batch statistics of the second batch normalization depend on all (batch, entity) combinations.
+        if not self.training and (not self.apply_batch_normalization or self.bn_1.track_running_stats):
+            return self._score_all_heads_factorized(r=r, t=self.entity_embeddings(rt_batch[:, 1]))
+
+        h = self.entity_embeddings.weight.unsqueeze(0)
         t = self.entity_embeddings(rt_batch[:, 1]).unsqueeze(1)
 
         # Compute scores
@@ -12,6 +12,7 @@ from ..init import embedding_xavier_uniform_
 from ...losses import Loss
 from ...regularizers import Regularizer
 from ...triples import TriplesFactory
+from ...utils import pairwise_distances
 
 __all__ = [
     'UnstructuredModel',
@@ -82,13 +83,13 @@ class UnstructuredModel(EntityEmbeddingModel):
         return -torch.norm(h - t, dim=-1, p=self.scoring_fct_norm, keepdim=True) ** 2
 
     def score_t(self, hr_batch: torch.LongTensor) -> torch.FloatTensor:  # noqa: D102
-        h = self.entity_embeddings(hr_batch[:, 0]).view(-1, 1, self.embedding_dim)
-        t = self.entity_embeddings.weight.view(1, -1, self.embedding_dim)
+        h = self.entity_embeddings(hr_batch[:, 0])
+        t = self.entity_embeddings.weight
 
-        return -torch.norm(h - t, dim=-1, p=self.scoring_fct_norm) ** 2
+        return -pairwise_distances(h, t, p=self.scoring_fct_norm, squared=True)
 
     def score_h(self, rt_batch: torch.LongTensor) -> torch.FloatTensor:  # noqa: D102
-        h = self.entity_embeddings.weight.view(1, -1, self.embedding_dim)
-        t = self.entity_embeddings(rt_batch[:, 1]).view(-1, 1, self.embedding_dim)
+        h = self.entity_embeddings.weight
+        t = self.entity_embeddings(rt_batch[:, 1])
 
-        return -torch.norm(h - t, dim=-1, p=self.scoring_fct_norm) ** 2
+        return -pairwise_distances(t, h, p=self.scoring_fct_norm, squared=True)
@@ -614,7 +614,7 @@ def pipeline(  # noqa: C901
         The name of the training loop's training approach (``'slcwa'`` or ``'lcwa'``) or the training loop class.
         Defaults to :class:`pykeen.training.SLCWATrainingLoop`.
     :param negative_sampler:
-        The name of the negative sampler (``'basic'`` or ``'bernoulli'``) or the negative sampler class.
+        The name of the negative sampler (``'basic'``, ``'bernoulli'``, or ``'unigram'``) or the negative sampler class.
         Only allowed when training with sLCWA.
         Defaults to :class:`pykeen.sampling.BasicNegativeSampler`.
     :param negative_sampler_kwargs:
@@ -7,6 +7,7 @@ Name       Reference
 =========  =================================================
 basic      :class:`pykeen.sampling.BasicNegativeSampler`
 bernoulli  :class:`pykeen.sampling.BernoulliNegativeSampler`
+unigram    :class:`pykeen.sampling.UnigramNegativeSampler`
 =========  =================================================
 
 .. note:: This table can be re-generated with ``pykeen ls samplers -f rst``
@@ -17,12 +18,14 @@ from typing import Mapping, Set, Type, Union
 from .basic_negative_sampler import BasicNegativeSampler
 from .bernoulli_negative_sampler import BernoulliNegativeSampler
 from .negative_sampler import NegativeSampler
+from .unigram_negative_sampler import UnigramNegativeSampler
 from ..utils import get_cls, normalize_string
 
 __all__ = [
     'NegativeSampler',
     'BasicNegativeSampler',
     'BernoulliNegativeSampler',
+    'UnigramNegativeSampler',
     'negative_samplers',
     'get_negative_sampler_cls',
 ]
@@ -31,6 +34,7 @@ _NEGATIVE_SAMPLER_SUFFIX = 'NegativeSampler'
 _NEGATIVE_SAMPLERS: Set[Type[NegativeSampler]] = {
     BasicNegativeSampler,
     BernoulliNegativeSampler,
+    UnigramNegativeSampler,
 }
 
 #: A mapping of negative samplers' names to their implementations
@@ -2,7 +2,7 @@
 
 """Negative sampling algorithm based on the work of [wang2014]_."""
 
-from typing import Optional
+from typing import Optional, Tuple
 
 import torch
 
@@ -26,10 +26,16 @@ class BernoulliNegativeSampler(NegativeSampler):
         self,
         triples_factory: TriplesFactory,
         num_negs_per_pos: Optional[int] = None,
+        batch_shared: bool = False,
+        filtered: bool = False,
+        max_filter_rounds: int = 10,
     ) -> None:
         super().__init__(
             triples_factory=triples_factory,
             num_negs_per_pos=num_negs_per_pos,
+            batch_shared=batch_shared,
+            filtered=filtered,
+            max_filter_rounds=max_filter_rounds,
         )
         # Preprocessing: Compute corruption probabilities
         triples = self.triples_factory.mapped_triples
@@ -55,39 +61,15 @@ class BernoulliNegativeSampler(NegativeSampler):
 
     def sample(self, positive_batch: torch.LongTensor) -> torch.LongTensor:
         """Sample a negative batched based on the bern approach."""
-        if self.num_negs_per_pos > 1:
-            positive_batch = positive_batch.repeat(self.num_negs_per_pos, 1)
+        return self._corrupt_repeated(positive_batch=positive_batch)[0]
 
-        # Bind number of negatives to sample
-        num_negs = positive_batch.shape[0]
-
-        # Copy positive batch for corruption.
-        # Do not detach, as no gradients should flow into the indices.
-        negative_batch = positive_batch.clone()
+    def sample_with_head_mask(  # noqa: D102
+        self,
+        positive_batch: torch.LongTensor,
+    ) -> Tuple[torch.LongTensor, torch.BoolTensor]:
+        return self._corrupt_repeated(positive_batch=positive_batch)
 
+    def _corrupt_head_mask(self, positive_batch: torch.LongTensor) -> torch.BoolTensor:  # noqa: D102
         device = positive_batch.device
-        # Decide whether to corrupt head or tail
         head_corruption_probability = self.corrupt_head_probability[positive_batch[:, 1]]
-        head_mask = torch.rand(num_negs, device=device) < head_corruption_probability.to(device=device)
-
-        # Tails are corrupted if heads are not corrupted
-        tail_mask = ~head_mask
-
-        # Randomly sample corruption
-        negative_entities = torch.randint(
-            self.triples_factory.num_entities - 1,
-            size=(num_negs,),
-            device=positive_batch.device,
-        )
-
-        # Replace heads – To make sure we don't replace the head by the original value
-        # we shift all values greater or equal than the original value by one up
-        # for that reason we choose the random value from [0, num_entities -1]
-        filter_same_head = (negative_entities[head_mask] >= positive_batch[:, 0][head_mask])
-        negative_batch[:, 0][head_mask] = negative_entities[head_mask] + filter_same_head.long()
-
-        # Replace tails
-        filter_same_tail = (negative_entities[tail_mask] >= positive_batch[:, 2][tail_mask])
-        negative_batch[:, 2][tail_mask] = negative_entities[tail_mask] + filter_same_tail.long()
-
-        return negative_batch
+        return torch.rand(positive_batch.shape[0], device=device) < head_corruption_probability.to(device=device)
@@ -2,8 +2,10 @@
 
 """Basic structure for a negative sampler."""
 
+import time
 from abc import ABC, abstractmethod
-from typing import Any, ClassVar, Mapping, Optional
+from collections import Counter
+from typing import Any, ClassVar, Dict, Mapping, Optional, Tuple
 
 import torch
 
@@ -15,6 +17,46 @@ __all__ = [
 ]
 
 
+def _pack_triples(
+    triples: torch.LongTensor,
+    num_entities: int,
+    num_relations: int,
+) -> torch.LongTensor:
+    """Pack triples into single int64 keys, such that triple membership can be checked by a binary search.
+
+    :param triples: shape: (n, 3)
+        The ID-based triples.
+    :param num_entities:
+        The number of entity IDs, i.e., an upper bound of the entity IDs. Must satisfy
+        ``num_entities ** 2 * num_relations <= 2 ** 63``, cf. :func:`_check_packable`.
+    :param num_relations:
+        The number of relation IDs, i.e., an upper bound of the relation IDs.
+
+    :return: shape: (n,)
+        The keys.
+    """
+    return (triples[:, 0] * num_relations + triples[:, 1]) * num_entities + triples[:, 2]
+
+
+def _check_packable(num_entities: int, num_relations: int) -> None:
+    """Check that the packed keys of all possible triples fit into int64.
+
+    :param num_entities:
+        The number of entity IDs.
+    :param num_relations:
+        The number of relation IDs.
+
+    :raises ValueError:
+        If the keys would overflow.
+    """
+    # Python integers do not overflow
+    if num_entities ** 2 * num_relations > 2 ** 63:
+        raise ValueError(
+            f'Filtering cannot pack the triples of {num_entities} entities and {num_relations} relations into int64 '
+            f'keys.',
+        )
+
+
 class NegativeSampler(ABC):
     """A negative sampler."""
 
@@ -25,14 +67,43 @@ class NegativeSampler(ABC):
         self,
         triples_factory: TriplesFactory,
         num_negs_per_pos: Optional[int] = None,
+        batch_shared: bool = False,
+        filtered: bool = False,
+        max_filter_rounds: int = 10,
     ) -> None:
         """Initialize the negative sampler with the given entities.
 
         :param triples_factory: The factory holding the triples to sample from
         :param num_negs_per_pos: Number of negative samples to make per positive triple. Defaults to 1.
+        :param batch_shared: Whether all positive triples of a batch share one pool of ``num_negs_per_pos`` negative
+            entities, cf. :meth:`sample_shared`.
+        :param filtered: Whether to resample negative triples which are known training triples, i.e., false
+            negatives. Does not apply to the shared pool of :meth:`sample_shared`.
+        :param max_filter_rounds: The maximum number of resampling rounds when filtering. False negatives which remain
+            afterwards are kept, which bounds the overhead of filtering.
         """
         self.triples_factory = triples_factory
         self.num_negs_per_pos = num_negs_per_pos if num_negs_per_pos is not None else 1
+        self.batch_shared = batch_shared
+        self.filtered = filtered
+        self.max_filter_rounds = max_filter_rounds
+
+        if self.filtered:
+            # The number of unique IDs may be smaller than the largest ID, e.g. if the mapping contains entities
+            # which do not occur in the triples. The mappings' sizes bound all IDs.
+            self._key_bounds = (len(triples_factory.entity_to_id), len(triples_factory.relation_to_id))
+            _check_packable(*self._key_bounds)
+            # The sorted packed keys of the training triples
+            self._known_keys, _ = _pack_triples(
+                triples=triples_factory.mapped_triples,
+                num_entities=self._key_bounds[0],
+                num_relations=self._key_bounds[1],
+            ).sort()
+        else:
+            self._key_bounds = None
+            self._known_keys = None
+        #: The statistics of the filtering since the last call of :meth:`pop_filter_statistics`
+        self._filter_statistics = Counter()
 
     @classmethod
     def get_normalized_name(cls) -> str:
@@ -48,3 +119,202 @@ class NegativeSampler(ABC):
     def sample(self, positive_batch: torch.LongTensor) -> torch.LongTensor:
         """Generate negative samples from the positive batch."""
         raise NotImplementedError
+
+    def sample_with_head_mask(
+        self,
+        positive_batch: torch.LongTensor,
+    ) -> Tuple[torch.LongTensor, Optional[torch.BoolTensor]]:
+        """Generate negative samples from the positive batch, and report which side of each one is corrupted.
+
+        :param positive_batch: shape: (batch_size, 3)
+            The positive triples.
+
+        :return:
+            A pair (negative_batch, head_mask), where negative_batch of shape (num_negs_per_pos * batch_size, 3) is
+            ordered like ``positive_batch.repeat(num_negs_per_pos, 1)``, and head_mask of shape
+            (num_negs_per_pos * batch_size,) indicates whether the head or the tail of a negative triple is corrupted.
+            The head mask is None for samplers which do not report it.
+        """
+        return self.sample(positive_batch=positive_batch), None
+
+    def _corrupt_repeated(self, positive_batch: torch.LongTensor) -> Tuple[torch.LongTensor, torch.BoolTensor]:
+        """Corrupt num_negs_per_pos copies of each positive triple on the side chosen by :meth:`_corrupt_head_mask`.
+
+        :param positive_batch: shape: (batch_size, 3)
+            The positive triples.
+
+        :return:
+            A pair (negative_batch, head_mask), cf. :meth:`sample_with_head_mask`.
+        """
+        if self.num_negs_per_pos > 1:
+            positive_batch = positive_batch.repeat(self.num_negs_per_pos, 1)
+
+        head_mask = self._corrupt_head_mask(positive_batch=positive_batch)
+
+        return self._corrupt_batch(positive_batch=positive_batch, head_mask=head_mask), head_mask
+
+    def _corrupt_batch(self, positive_batch: torch.LongTensor, head_mask: torch.BoolTensor) -> torch.LongTensor:
+        """Corrupt the head or tail of each triple, and resample known triples if filtering is requested.
+
+        :param positive_batch: shape: (num_negs, 3)
+            The (repeated) positive triples.
+        :param head_mask: shape: (num_negs,)
+            Whether the head is corrupted, or the tail.
+
+        :return: shape: (num_negs, 3)
+            The negative triples.
+        """
+        # Copy positive batch for corruption.
+        # Do not detach, as no gradients should flow into the indices.
+        negative_batch = positive_batch.clone()
+        self._corrupt_(negative_batch=negative_batch, positive_batch=positive_batch, head_mask=head_mask)
+
+        if self.filtered:
+            self._filter_(negative_batch=negative_batch, positive_batch=positive_batch, head_mask=head_mask)
+
+        return negative_batch
+
+    def _corrupt_(
+        self,
+        negative_batch: torch.LongTensor,
+        positive_batch: torch.LongTensor,
+        head_mask: torch.BoolTensor,
+    ) -> None:
+        """Replace the head or tail of each triple by a sampled entity, in-place.
+
+        :param negative_batch: shape: (n, 3)
+            The triples to corrupt.
+        :param positive_batch: shape: (n, 3)
+            The positive triples.
+        :param head_mask: shape: (n,)
+            Whether the head is corrupted, or the tail.
+        """
+        negative_entities = self._sample_entities(
+            positive_entities=torch.where(head_mask, positive_batch[:, 0], positive_batch[:, 2]),
+        )
+        negative_batch[:, 0][head_mask] = negative_entities[head_mask]
+        tail_mask = ~head_mask
+        negative_batch[:, 2][tail_mask] = negative_entities[tail_mask]
+
+    def _sample_entities(self, positive_entities: torch.LongTensor) -> torch.LongTensor:
+        """Sample entities uniformly, which differ from the given ones.
+
+        :param positive_entities: shape: (n,)
+            The entities which are replaced.
+
+        :return: shape: (n,)
+            The sampled entities.
+        """
+        # To make sure we don't replace the entity by the original value we shift all values greater or equal than
+        # the original value by one up. For that reason we choose the random value from [0, num_entities - 1]
+        negative_entities = torch.randint(
+            high=self.num_entities - 1,
+            size=positive_entities.shape,
+            device=positive_entities.device,
+        )
+        return negative_entities + (negative_entities >= positive_entities).long()
+
+    def _is_known(self, triples: torch.LongTensor) -> torch.BoolTensor:
+        """Check which triples are training triples by a binary search in the sorted packed keys.
+
+        :param triples: shape: (n, 3)
+            The triples.
+
+        :return: shape: (n,)
+            Whether the triple is a known training triple.
+        """
+        if self._known_keys.device != triples.device:
+            self._known_keys = self._known_keys.to(device=triples.device)
+        keys = _pack_triples(
+            triples=triples,
+            num_entities=self._key_bounds[0],
+            num_relations=self._key_bounds[1],
+        )
+        # searchsorted returns the insertion position, which is only a hit if the key is stored there
+        position = torch.searchsorted(self._known_keys, keys).clamp_max_(self._known_keys.shape[0] - 1)
+        return self._known_keys[position] == keys
+
+    def _filter_(
+        self,
+        negative_batch: torch.LongTensor,
+        positive_batch: torch.LongTensor,
+        head_mask: torch.BoolTensor,
+    ) -> None:
+        """Resample known triples in vectorized rounds, in-place.
+
+        :param negative_batch: shape: (n, 3)
+            The negative triples.
+        :param positive_batch: shape: (n, 3)
+            The positive triples.
+        :param head_mask: shape: (n,)
+            Whether the head is corrupted, or the tail.
+        """
+        start = time.perf_counter()
+        known = self._is_known(negative_batch).nonzero().view(-1)
+        self._filter_statistics['num_negatives'] += negative_batch.shape[0]
+        self._filter_statistics['num_rejected'] += known.shape[0]
+        num_rounds = 0
+        while known.shape[0] > 0 and num_rounds < self.max_filter_rounds:
+            # Only resample the rejected triples
+            candidates = negative_batch[known]
+            self._corrupt_(negative_batch=candidates, positive_batch=positive_batch[known], head_mask=head_mask[known])
+            negative_batch[known] = candidates
+            known = known[self._is_known(candidates)]
+            num_rounds += 1
+        self._filter_statistics['num_rounds'] += num_rounds
+        self._filter_statistics['num_batches'] += 1
+        self._filter_statistics['num_false_negatives'] += known.shape[0]
+        self._filter_statistics['seconds'] += time.perf_counter() - start
+
+    def pop_filter_statistics(self) -> Dict[str, float]:
+        """Get the statistics of the filtering since the last call, and reset them.
+
+        :return:
+            A dictionary with the rejection rate of the initially sampled negatives, the average number of resampling
+            rounds per batch, the number of false negatives which remained after the last round, and the time spent
+            on filtering in seconds. Empty, if nothing was filtered.
+        """
+        statistics, self._filter_statistics = self._filter_statistics, Counter()
+        if not statistics['num_batches']:
+            return {}
+        return {
+            'filter_rejection_rate': statistics['num_rejected'] / statistics['num_negatives'],
+            'filter_rounds_per_batch': statistics['num_rounds'] / statistics['num_batches'],
+            'filter_false_negatives': statistics['num_false_negatives'],
+            'filter_seconds': statistics['seconds'],
+        }
+
+    def sample_shared(self, positive_batch: torch.LongTensor) -> Tuple[torch.LongTensor, torch.BoolTensor]:
+        """Sample one pool of negative entities, which is shared by all positive triples of the batch.
+
+        Each positive triple is corrupted on one side by every entity of the pool, such that the negative triples can
+        be scored as (batch_size, num_negs_per_pos) matrix, re-using the representation of every pool entity for the
+        whole batch, cf. PyTorch-BigGraph. In contrast to :meth:`sample`, the pool is not filtered for the entities of
+        the individual positive triples.
+
+        :param positive_batch: shape: (batch_size, 3)
+            The positive triples.
+
+        :return:
+            A pair (negative_entities, head_mask), where negative_entities of shape (num_negs_per_pos,) is the pool,
+            and head_mask of shape (batch_size,) indicates whether the head or the tail of a positive triple is
+            corrupted.
+        """
+        negative_entities = torch.randint(
+            high=self.num_entities,
+            size=(self.num_negs_per_pos,),
+            device=positive_batch.device,
+        )
+        return negative_entities, self._corrupt_head_mask(positive_batch=positive_batch)
+
+    def _corrupt_head_mask(self, positive_batch: torch.LongTensor) -> torch.BoolTensor:
+        """Decide for each positive triple whether its head is corrupted, or its tail.
+
+        :param positive_batch: shape: (batch_size, 3)
+            The positive triples.
+
+        :return: shape: (batch_size,)
+            Whether the head is corrupted. By default, the heads of the first half of the batch are corrupted.
+        """
+        batch_size = positive_batch.shape[0]
+        return torch.arange(batch_size, device=positive_batch.device) < batch_size // 2
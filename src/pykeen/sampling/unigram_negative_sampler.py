@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+
+"""Negative sampling from the entities' frequency distribution raised to a power."""
+
+from typing import Optional, Tuple
+
+import torch
+
+from .negative_sampler import NegativeSampler
+from ..triples import TriplesFactory
+
+__all__ = [
+    'UnigramNegativeSampler',
+]
+
+
+def _build_alias_table(probabilities: torch.FloatTensor) -> Tuple[torch.FloatTensor, torch.LongTensor]:
+    """Build the alias table of a discrete distribution with Vose's method.
+
+    Every bucket i holds the probability of keeping i, and the alias which is taken otherwise, such that a draw is
+    one uniformly chosen bucket and one coin flip.
+
+    :param probabilities: shape: (n,)
+        The probabilities, summing up to one.
+
+    :return:
+        A pair (keep_probability, alias) of shape (n,).
+    """
+    n = probabilities.shape[0]
+    scaled = (probabilities.double() * n).tolist()
+    keep_probability = [1.] * n
+    alias = list(range(n))
+    small = [i for i, p in enumerate(scaled) if p < 1.]
+    large = [i for i, p in enumerate(scaled) if p >= 1.]
+    while small and large:
+        s, l_ = small.pop(), large.pop()
+        keep_probability[s] = scaled[s]
+        alias[s] = l_
+        # the large bucket donates the remaining mass of the small bucket
+        scaled[l_] -= 1. - scaled[s]
+        if scaled[l_] < 1.:
+            small.append(l_)
+        else:
+            large.append(l_)
+    # the remaining buckets are full up to numerical errors, i.e. keep probability 1
+    return torch.as_tensor(keep_probability, dtype=torch.float), torch.as_tensor(alias, dtype=torch.long)
+
+
+class UnigramNegativeSampler(NegativeSampler):
+    r"""A negative sampler which samples the corrupting entities from their frequency distribution.
+
+    The probability of sampling an entity $e$ is proportional to $\operatorname{deg}(e)^\alpha$, where
+    $\operatorname{deg}(e)$ is the number of training triples in which $e$ occurs. For $\alpha = 0$, this is the
+    uniform distribution, and for $\alpha = 1$, frequent entities are sampled as often as they occur. Heads and tails
+    are corrupted equally often.
+
+    The draws use a precomputed alias table, such that each draw takes constant time.
+    """
+
+    #: The default strategy for optimizing the negative sampler's hyper-parameters
+    hpo_default = dict(
+        num_negs_per_pos=dict(type=int, low=1, high=100, q=10),
+        alpha=dict(type=float, low=0.0, high=1.0),
+    )
+
+    def __init__(
+        self,
+        triples_factory: TriplesFactory,
+        num_negs_per_pos: Optional[int] = None,
+        batch_shared: bool = False,
+        filtered: bool = False,
+        max_filter_rounds: int = 10,
+        alpha: float = 0.75,
+        max_rejection_rounds: int = 10,
+    ) -> None:
+        """Initialize the negative sampler.
+
+        :param alpha: >= 0
+            The exponent of the entity frequencies. Defaults to 0.75, as in word2vec.
+        :param max_rejection_rounds: The maximum number of rounds in which draws of the original entity are
+            redrawn from the frequency distribution. Remaining ones are replaced uniformly.
+        """
+        super().__init__(
+            triples_factory=triples_factory,
+            num_negs_per_pos=num_negs_per_pos,
+            batch_shared=batch_shared,
+            filtered=filtered,
+            max_filter_rounds=max_filter_rounds,
+        )
+        if alpha < 0:
+            raise ValueError(f'alpha must be non-negative, but is {alpha}.')
+        self.alpha = alpha
+        self.max_rejection_rounds = max_rejection_rounds
+
+        # Preprocessing: Compute the entity frequencies
+        triples = self.triples_factory.mapped_triples
+        frequencies = torch.bincount(
+            torch.cat([triples[:, 0], triples[:, 2]], dim=0),
+            minlength=self.num_entities,
+        ).double()
+        weights = frequencies.pow(self.alpha)
+        self.probabilities = (weights / weights.sum()).float()
+        self._keep_probability, self._alias = _build_alias_table(probabilities=self.probabilities)
+
+    def sample(self, positive_batch: torch.LongTensor) -> torch.LongTensor:
+        """Generate negative samples from the positive batch."""
+        return self._corrupt_repeated(positive_batch=positive_batch)[0]
+
+    def sample_with_head_mask(  # noqa: D102
+        self,
+        positive_batch: torch.LongTensor,
+    ) -> Tuple[torch.LongTensor, torch.BoolTensor]:
+        return self._corrupt_repeated(positive_batch=positive_batch)
+
+    def sample_shared(  # noqa: D102
+        self,
+        positive_batch: torch.LongTensor,
+    ) -> Tuple[torch.LongTensor, torch.BoolTensor]:
+        negative_entities = self._draw(num=self.num_negs_per_pos, device=positive_batch.device)
+        return negative_entities, self._corrupt_head_mask(positive_batch=positive_batch)
+
+    def _draw(self, num: int, device: torch.device) -> torch.LongTensor:
+        """Draw entities from the frequency distribution using the alias table.
+
+        :param num: The number of entities to draw.
+        :param device: The device of the result.
+
+        :return: shape: (num,)
+            The entities.
+        """
+        if self._alias.device != device:
+            self._keep_probability = self._keep_probability.to(device=device)
+            self._alias = self._alias.to(device=device)
+        buckets = torch.randint(high=self.num_entities, size=(num,), device=device)
+        keep = torch.rand(num, device=device) < self._keep_probability[buckets]
+        return torch.where(keep, buckets, self._alias[buckets])
+
+    def _sample_entities(self, positive_entities: torch.LongTensor) -> torch.LongTensor:  # noqa: D102
+        negative_entities = self._draw(num=positive_entities.shape[0], device=positive_entities.device)
+
+        # Redraw the original entities in vectorized rounds
+        collisions = (negative_entities == positive_entities).nonzero().view(-1)
+        for _ in range(self.max_rejection_rounds):
+            if collisions.shape[0] == 0:
+                return negative_entities
+            negative_entities[collisions] = self._draw(num=collisions.shape[0], device=collisions.device)
+            collisions = collisions[negative_entities[collisions] == positive_entities[collisions]]
+
+        # Replace the remaining ones uniformly, e.g. if an entity dominates the distribution
+        if collisions.shape[0] > 0:
+            negative_entities[collisions] = super()._sample_entities(positive_entities=positive_entities[collisions])
+        return negative_entities
@@ -3,7 +3,7 @@
 """Training KGE models based on the sLCWA."""
 
 import logging
-from typing import Any, Mapping, Optional, Type
+from typing import Any, Mapping, Optional, Tuple, Type
 
 import torch
 from torch.optim.optimizer import Optimizer
@@ -35,6 +35,7 @@ class SLCWATrainingLoop(TrainingLoop):
         optimizer: Optional[Optimizer] = None,
         negative_sampler_cls: Optional[Type[NegativeSampler]] = None,
         negative_sampler_kwargs: Optional[Mapping[str, Any]] = None,
+        use_inverse_for_head_corruption: bool = False,
     ):
         """Initialize the training loop.
 
@@ -43,6 +44,10 @@ class SLCWATrainingLoop(TrainingLoop):
         :param negative_sampler_cls: The class of the negative sampler
         :param negative_sampler_kwargs: Keyword arguments to pass to the negative sampler class on instantiation
          for every positive one
+        :param use_inverse_for_head_corruption: Whether to score a head-corrupted negative (h', r, t) as the inverse
+         triple (t, r^-1, h') for models which factorize the (head, relation) encoding, cf. :meth:`_score_factorized`.
+         This requires inverse triples, and changes the training objective, since the inverse relation has its own
+         representation.
         """
         super().__init__(
             model=model,
@@ -57,6 +62,10 @@ class SLCWATrainingLoop(TrainingLoop):
             **(negative_sampler_kwargs or {}),
         )
 
+        self.use_inverse_for_head_corruption = use_inverse_for_head_corruption
+        # The IDs of the inverse relations, cf. _get_inverse_relation_ids
+        self._inverse_relation_ids = None
+
     @property
     def num_negs_per_pos(self) -> int:
         """Return number of negatives per positive from the sampler.
@@ -65,6 +74,13 @@ class SLCWATrainingLoop(TrainingLoop):
         """
         return self.negative_sampler.num_negs_per_pos
 
+    def _pop_epoch_metrics(self) -> Mapping[str, Any]:  # noqa: D102
+        # e.g., the overhead of filtering negative samples
+        statistics = self.negative_sampler.pop_filter_statistics()
+        if not statistics:
+            return {}
+        return dict(negative_sampler=statistics)
+
     def _create_instances(self, use_tqdm: Optional[bool] = None) -> SLCWAInstances:  # noqa: D102
         return self.triples_factory.create_slcwa_instances()
 
@@ -87,8 +103,16 @@ class SLCWATrainingLoop(TrainingLoop):
         # Send positive batch to device
         positive_batch = batch[start:stop].to(device=self.device)
 
+        if self.negative_sampler.batch_shared:
+            positive_scores, negative_scores = self._score_batch_shared(positive_batch=positive_batch)
+            return self._loss_helper(
+                positive_scores,
+                negative_scores,
+                label_smoothing,
+            )
+
         # Create negative samples
-        neg_samples = self.negative_sampler.sample(positive_batch=positive_batch)
+        neg_samples, head_mask = self.negative_sampler.sample_with_head_mask(positive_batch=positive_batch)
 
         # Ensure they reside on the device (should hold already for most simple negative samplers, e.g.
         # BasicNegativeSampler, BernoulliNegativeSampler
@@ -97,9 +121,22 @@ class SLCWATrainingLoop(TrainingLoop):
         # Make it negative batch broadcastable (required for num_negs_per_pos > 1).
         negative_batch = negative_batch.view(-1, 3)
 
+        # Only the representations of the entities and relations in the positive and negative triples are updated
+        self._mark_touched(
+            entity_ids=torch.cat([positive_batch[:, [0, 2]], negative_batch[:, [0, 2]]], dim=0),
+            relation_ids=torch.cat([positive_batch[:, 1], negative_batch[:, 1]], dim=0),
+        )
+
         # Compute negative and positive scores
-        positive_scores = self.model.score_hrt(positive_batch)
-        negative_scores = self.model.score_hrt(negative_batch)
+        if self.model.factorizes_hr and head_mask is not None:
+            positive_scores, negative_scores = self._score_factorized(
+                positive_batch=positive_batch,
+                negative_batch=negative_batch,
+                head_mask=head_mask.to(self.device),
+            )
+        else:
+            positive_scores = self.model.score_hrt(positive_batch)
+            negative_scores = self.model.score_hrt(negative_batch)
 
         loss = self._loss_helper(
             positive_scores,
@@ -108,6 +145,123 @@ class SLCWATrainingLoop(TrainingLoop):
         )
         return loss
 
+    def _score_batch_shared(
+        self,
+        positive_batch: MappedTriples,
+    ) -> Tuple[torch.FloatTensor, torch.FloatTensor]:
+        """Score the positive triples, and their negatives from one pool of entities shared by the whole batch.
+
+        :param positive_batch: shape: (batch_size, 3)
+            The positive triples.
+
+        :return:
+            A pair (positive_scores, negative_scores) of shape (batch_size, 1) and (num_negs_per_pos * batch_size, 1),
+            where the negative scores are ordered like the negative triples of the non-shared negative samplers.
+        """
+        negative_entities, head_mask = self.negative_sampler.sample_shared(positive_batch=positive_batch)
+
+        # Only the representations of the entities and relations in the positive triples, and of the pool are updated
+        self._mark_touched(
+            entity_ids=torch.cat([positive_batch[:, [0, 2]].view(-1), negative_entities], dim=0),
+            relation_ids=positive_batch[:, 1],
+        )
+
+        positive_scores = self.model.score_hrt(positive_batch)
+
+        # Score all negatives of a corruption side at once through the 1-to-N scoring
+        # shape: (batch_size, num_negs_per_pos)
+        negative_scores = positive_scores.new_empty(positive_batch.shape[0], negative_entities.shape[0])
+        tail_mask = ~head_mask
+        if head_mask.any():
+            negative_scores[head_mask] = self.model.score_h_candidates(
+                rt_batch=positive_batch[head_mask, 1:],
+                head_ids=negative_entities,
+            )
+        if tail_mask.any():
+            negative_scores[tail_mask] = self.model.score_t_candidates(
+                hr_batch=positive_batch[tail_mask, :2],
+                tail_ids=negative_entities,
+            )
+
+        return positive_scores, negative_scores.t().reshape(-1, 1)
+
+    def _score_factorized(
+        self,
+        positive_batch: MappedTriples,
+        negative_batch: MappedTriples,
+        head_mask: torch.BoolTensor,
+    ) -> Tuple[torch.FloatTensor, torch.FloatTensor]:
+        """Score the positive triples and their negatives, encoding each (head, relation) pair only once.
+
+        The tails of each positive triple and its tail-corrupted negatives are scored against the encoding of its
+        (head, relation) pair. Head-corrupted negatives are scored triple-wise, unless
+        ``use_inverse_for_head_corruption`` was requested and inverse triples were created. Then, a head-corrupted
+        negative (h', r, t) is scored as (t, r^-1, h'), such that the (tail, inverse relation) pair is encoded once,
+        too.
+
+        :param positive_batch: shape: (batch_size, 3)
+            The positive triples.
+        :param negative_batch: shape: (num_negs_per_pos * batch_size, 3)
+            The negative triples, ordered like ``positive_batch.repeat(num_negs_per_pos, 1)``.
+        :param head_mask: shape: (num_negs_per_pos * batch_size,)
+            Whether the head or the tail of a negative triple is corrupted, as reported by the negative sampler.
+
+        :return:
+            A pair (positive_scores, negative_scores) of shape (batch_size, 1) and (num_negs_per_pos * batch_size, 1).
+        """
+        batch_size = positive_batch.shape[0]
+        # shape: (batch_size, num_negs_per_pos, 3)
+        negatives = negative_batch.view(-1, batch_size, 3).transpose(0, 1)
+        # shape: (batch_size, num_negs_per_pos)
+        head_mask = head_mask.view(-1, batch_size).t()
+        tail_mask = ~head_mask
+
+        # Score the true tail, and the tails of all negatives with the encoding of each (h, r) pair
+        # shape: (batch_size, 1 + num_negs_per_pos)
+        scores = self.model.score_t_candidates(
+            hr_batch=positive_batch[:, :2],
+            tail_ids=torch.cat([positive_batch[:, 2:], negatives[:, :, 2]], dim=1),
+        )
+        positive_scores, negative_scores = scores[:, :1], scores[:, 1:]
+
+        if head_mask.any():
+            inverse_relations = self._get_inverse_relation_ids() if self.use_inverse_for_head_corruption else None
+            if inverse_relations is not None:
+                inverse_relations = inverse_relations.to(device=positive_batch.device)[positive_batch[:, 1]]
+            if inverse_relations is not None and (inverse_relations >= 0).all():
+                # Score all head corruptions as tail corruptions of the inverse triple (t, r^-1, h)
+                head_scores = self.model.score_t_candidates(
+                    hr_batch=torch.stack([positive_batch[:, 2], inverse_relations], dim=-1),
+                    tail_ids=negatives[:, :, 0],
+                )
+                negative_scores = torch.where(tail_mask, negative_scores, head_scores)
+            else:
+                negative_scores = negative_scores.index_put(
+                    (head_mask,),
+                    self.model.score_hrt(negatives[head_mask]).view(-1),
+                )
+
+        # Restore the order of the negative batch
+        return positive_scores, negative_scores.t().reshape(-1, 1)
+
+    def _get_inverse_relation_ids(self) -> Optional[torch.LongTensor]:
+        """Get the ID of the inverse relation for each relation, or -1 if it has none.
+
+        :return: shape: (num_relations,)
+            The inverse relation IDs, or None if no inverse triples were created.
+        """
+        if not self.triples_factory.create_inverse_triples:
+            return None
+        if self._inverse_relation_ids is None:
+            relation_to_id = self.triples_factory.relation_to_id
+            inverse_relation_ids = torch.full((self.triples_factory.num_relations,), fill_value=-1, dtype=torch.long)
+            for relation, inverse_relation in self.triples_factory.relation_to_inverse.items():
+                if relation in relation_to_id and inverse_relation in relation_to_id:
+                    inverse_relation_ids[relation_to_id[relation]] = relation_to_id[inverse_relation]
+                    inverse_relation_ids[relation_to_id[inverse_relation]] = relation_to_id[relation]
+            self._inverse_relation_ids = inverse_relation_ids
+        return self._inverse_relation_ids
+
     def _mr_loss_helper(
         self,
         positive_scores: torch.FloatTensor,
@@ -8,8 +8,9 @@ from abc import ABC, abstractmethod
 from typing import Any, List, Mapping, Optional, Tuple, Type, Union
 
 import torch
+from torch.optim import SGD
 from torch.optim.optimizer import Optimizer
-from torch.utils.data import DataLoader
+from torch.utils.data import DataLoader, Sampler
 
 from ..losses import Loss
 from ..models.base import Model
@@ -17,6 +18,7 @@ from ..stoppers import Stopper
 from ..tqdmw import tqdm, trange
 from ..trackers import ResultTracker
 from ..training.schlichtkrull_sampler import GraphSampler
+from ..training.utils import PermutationBatchSampler
 from ..triples import Instances, TriplesFactory
 from ..typing import MappedTriples
 from ..utils import is_cuda_oom_error, is_cudnn_error, normalize_string
@@ -61,6 +63,14 @@ def _get_optimizer_kwargs(optimizer: Optimizer) -> Mapping[str, Any]:
     return optimizer_kwargs
 
 
+def _updates_only_used_rows(optimizer: Optimizer) -> bool:
+    """Check whether an optimizer step leaves the parameter rows without gradient unchanged, i.e., for plain SGD."""
+    return isinstance(optimizer, SGD) and all(
+        not group.get('momentum') and not group.get('weight_decay')
+        for group in optimizer.param_groups
+    )
+
+
 class TrainingLoop(ABC):
     """A training loop."""
 
@@ -88,6 +98,10 @@ class TrainingLoop(ABC):
         self.training_instances = None
         self.losses_per_epochs = []
 
+        # The IDs of the entities and relations used by the forward passes of the current batch, cf. _mark_touched
+        self._touched_entity_ids: Optional[List[torch.LongTensor]] = []
+        self._touched_relation_ids: Optional[List[torch.LongTensor]] = []
+
         if self.loss_blacklist and isinstance(self.model.loss, tuple(self.loss_blacklist)):
             raise TrainingApproachLossMismatchError(
                 f'Can not use loss {self.model.loss.__class__.__name__}'
@@ -131,6 +145,7 @@ class TrainingLoop(ABC):
         sub_batch_size: Optional[int] = None,
         num_workers: Optional[int] = None,
         clear_optimizer: bool = False,
+        constrain_all_rows: Optional[bool] = None,
     ) -> List[float]:
         """Train the KGE model.
 
@@ -164,6 +179,13 @@ class TrainingLoop(ABC):
         :param clear_optimizer:
             Whether to delete the optimizer instance after training (as the optimizer might have additional memory
             consumption due to e.g. moments in Adam).
+        :param constrain_all_rows:
+            Whether to enforce the model's constraints on all entities and relations after each parameter update.
+            Otherwise, they are only enforced on the entities and relations used by the batch. If the optimizer may
+            also change the other rows, the constraints are additionally enforced on all of them at the end of each
+            epoch. If None, only the used rows are constrained if the optimizer leaves all other rows unchanged, i.e.,
+            for plain SGD without momentum and weight decay. For all other optimizers, e.g., the default Adam or
+            Adagrad, all rows are constrained after each update, as before.
 
         :return:
             A pair of the KGE model and the losses per epoch.
@@ -188,6 +210,7 @@ class TrainingLoop(ABC):
             result_tracker=result_tracker,
             sub_batch_size=sub_batch_size,
             num_workers=num_workers,
+            constrain_all_rows=constrain_all_rows,
         )
 
         # Ensure the release of memory
@@ -213,6 +236,7 @@ class TrainingLoop(ABC):
         result_tracker: Optional[ResultTracker] = None,
         sub_batch_size: Optional[int] = None,
         num_workers: Optional[int] = None,
+        constrain_all_rows: Optional[bool] = None,
     ) -> List[float]:
         """Train the KGE model.
 
@@ -243,6 +267,13 @@ class TrainingLoop(ABC):
             If provided split each batch into sub-batches to avoid memory issues for large models / small GPUs.
         :param num_workers:
             The number of child CPU workers used for loading data. If None, data are loaded in the main process.
+        :param constrain_all_rows:
+            Whether to enforce the model's constraints on all entities and relations after each parameter update.
+            Otherwise, they are only enforced on the entities and relations used by the batch. If the optimizer may
+            also change the other rows, the constraints are additionally enforced on all of them at the end of each
+            epoch. If None, only the used rows are constrained if the optimizer leaves all other rows unchanged, i.e.,
+            for plain SGD without momentum and weight decay. For all other optimizers, e.g., the default Adam or
+            Adagrad, all rows are constrained after each update, as before.
 
         :return:
             A pair of the KGE model and the losses per epoch.
@@ -287,6 +318,11 @@ class TrainingLoop(ABC):
         elif not self.optimizer.state:
             raise ValueError('Cannot continue_training without being trained once.')
 
+        # Stateful optimizers, e.g. Adam, also change the representations which were not used by a batch
+        updates_only_used_rows = _updates_only_used_rows(self.optimizer)
+        if constrain_all_rows is None:
+            constrain_all_rows = not updates_only_used_rows
+
         # Ensure the model is on the correct device
         self.model: Model = self.model.to(self.device)
 
@@ -316,14 +352,16 @@ class TrainingLoop(ABC):
             epochs = range(1, 1 + num_epochs)
             logger.debug(f'using stopper: {stopper}')
 
-        train_data_loader = DataLoader(
-            sampler=sampler,
-            dataset=self.training_instances,
+        train_data_loader = self._create_data_loader(
             batch_size=batch_size,
+            sampler=sampler,
             shuffle=shuffle,
             num_workers=num_workers,
         )
 
+        # Discard metrics accumulated outside of this training, e.g., during the batch size search
+        self._pop_epoch_metrics()
+
         # Training Loop
         for epoch in epochs:
             # Enforce training mode
@@ -346,6 +384,7 @@ class TrainingLoop(ABC):
                 # Recall that torch *accumulates* gradients. Before passing in a
                 # new instance, you need to zero out the gradients from the old instance
                 self.optimizer.zero_grad()
+                self._touched_entity_ids, self._touched_relation_ids = [], []
 
                 # Get batch size of current batch (last batch may be incomplete)
                 current_batch_size = self._get_batch_size(batch)
@@ -371,7 +410,10 @@ class TrainingLoop(ABC):
 
                 # After changing applying the gradients to the embeddings, the model is notified that the forward
                 # constraints are no longer applied
-                self.model.post_parameter_update()
+                if constrain_all_rows:
+                    self.model.post_parameter_update()
+                else:
+                    self.model.post_parameter_update(**self._get_touched_ids())
 
                 # For testing purposes we're only interested in processing one batch
                 if only_size_probing and evaluated_once:
@@ -379,6 +421,11 @@ class TrainingLoop(ABC):
 
                 evaluated_once = True
 
+            # Ensure the constraints on all rows, in case the optimizer changed rows which were not used by a batch.
+            # Otherwise, constraining the used rows after each update is exact.
+            if not constrain_all_rows and not updates_only_used_rows:
+                self.model.post_parameter_update()
+
             del batch
             del batches
             gc.collect()
@@ -392,7 +439,7 @@ class TrainingLoop(ABC):
             # Track epoch loss
             epoch_loss = current_epoch_loss / num_training_instances
             self.losses_per_epochs.append(epoch_loss)
-            result_tracker.log_metrics({'loss': epoch_loss}, step=epoch)
+            result_tracker.log_metrics({'loss': epoch_loss, **self._pop_epoch_metrics()}, step=epoch)
 
             # Print loss information to console
             epochs.set_postfix({
@@ -405,6 +452,78 @@ class TrainingLoop(ABC):
 
         return self.losses_per_epochs
 
+    def _create_data_loader(
+        self,
+        batch_size: int,
+        sampler: Optional[Sampler],
+        shuffle: bool,
+        num_workers: int,
+    ) -> DataLoader:
+        """Create the data loader which iterates over batches of the training instances."""
+        if sampler is not None:
+            return DataLoader(
+                sampler=sampler,
+                dataset=self.training_instances,
+                batch_size=batch_size,
+                shuffle=shuffle,
+                num_workers=num_workers,
+            )
+        # Let the instances gather a whole batch at once, instead of fetching and collating single instances
+        return DataLoader(
+            dataset=self.training_instances,
+            sampler=PermutationBatchSampler(
+                num_instances=self.training_instances.num_instances,
+                batch_size=batch_size,
+                shuffle=shuffle,
+            ),
+            batch_size=None,
+            num_workers=num_workers,
+        )
+
+    def _pop_epoch_metrics(self) -> Mapping[str, Any]:
+        """Get additional metrics accumulated during the epoch, and reset them.
+
+        :return: A (nested) dictionary of metrics, which is logged together with the epoch's loss.
+        """
+        return {}
+
+    def _mark_touched(
+        self,
+        entity_ids: Optional[torch.LongTensor],
+        relation_ids: Optional[torch.LongTensor],
+    ) -> None:
+        """Remember the IDs of the entities and relations used by a forward pass of the current batch.
+
+        After the parameter update, the model's constraints are only enforced on these entities and relations.
+        Training loops which do not mark anything let the model enforce its constraints on all rows.
+
+        :param entity_ids:
+            The entity IDs, in any shape and possibly with duplicates. None marks all entities, e.g., if the scores
+            for all entities are computed.
+        :param relation_ids:
+            The relation IDs, in any shape and possibly with duplicates. None marks all relations.
+        """
+        if entity_ids is None:
+            self._touched_entity_ids = None
+        elif self._touched_entity_ids is not None:
+            self._touched_entity_ids.append(entity_ids.view(-1))
+        if relation_ids is None:
+            self._touched_relation_ids = None
+        elif self._touched_relation_ids is not None:
+            self._touched_relation_ids.append(relation_ids.view(-1))
+
+    def _get_touched_ids(self) -> Mapping[str, Optional[torch.LongTensor]]:
+        """Get the unique IDs of the entities and relations marked for the current batch, cf. :meth:`_mark_touched`.
+
+        :return:
+            The keyword arguments for :meth:`pykeen.models.Model.post_parameter_update`. An ID tensor is None, i.e.,
+            all rows are marked, if all rows, or nothing at all, was marked.
+        """
+        return dict(
+            entity_ids=torch.unique(torch.cat(self._touched_entity_ids)) if self._touched_entity_ids else None,
+            relation_ids=torch.unique(torch.cat(self._touched_relation_ids)) if self._touched_relation_ids else None,
+        )
+
     def _forward_pass(self, batch, start, stop, current_batch_size, label_smoothing, slice_size):
         # forward pass
         loss = self._process_batch(
@@ -2,16 +2,18 @@
 
 """Utilities for training KGE models."""
 
-from typing import Callable, Iterable, TypeVar
+from typing import Callable, Iterable, Iterator, TypeVar
 
 import numpy
 import torch
+from torch.utils.data import Sampler
 
 from ..utils import split_list_in_batches_iter
 
 __all__ = [
     'apply_label_smoothing',
     'lazy_compile_random_batches',
+    'PermutationBatchSampler',
 ]
 
 X = TypeVar('X')
@@ -66,3 +68,51 @@ def lazy_compile_random_batches(
     index_batches = split_list_in_batches_iter(indices, batch_size=batch_size)
 
     return map(batch_compiler, index_batches)
+
+
+class PermutationBatchSampler(Sampler):
+    """Samples batches of indices as consecutive slices of one random permutation per epoch.
+
+    In contrast to combining a per-index sampler with batching, each batch is a single index tensor, such that a
+    dataset supporting tensor indices can gather the whole batch at once, instead of fetching and collating single
+    instances.
+    """
+
+    def __init__(
+        self,
+        num_instances: int,
+        batch_size: int,
+        shuffle: bool = True,
+        drop_last: bool = False,
+    ):
+        """Initialize the sampler.
+
+        :param num_instances: >0
+            The number of instances.
+        :param batch_size: >0
+            The batch size.
+        :param shuffle:
+            Whether to draw a new random permutation for each epoch. Otherwise, the instances are iterated in order.
+        :param drop_last:
+            Whether to drop the last batch if it is smaller than the batch size.
+        """
+        super().__init__(data_source=None)
+        if batch_size <= 0:
+            raise ValueError(f'batch_size must be positive, but is {batch_size}.')
+        self.num_instances = num_instances
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.drop_last = drop_last
+
+    def __iter__(self) -> Iterator[torch.LongTensor]:  # noqa: D105
+        if self.shuffle:
+            indices = torch.randperm(self.num_instances)
+        else:
+            indices = torch.arange(self.num_instances)
+        for start in range(0, len(self) * self.batch_size, self.batch_size):
+            yield indices[start:start + self.batch_size]
+
+    def __len__(self) -> int:  # noqa: D105
+        if self.drop_last:
+            return self.num_instances // self.batch_size
+        return -(-self.num_instances // self.batch_size)
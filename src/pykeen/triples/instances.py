@@ -3,7 +3,7 @@
 """Implementation of basic instance factory which creates just instances based on standard KG triples."""
 
 from dataclasses import dataclass
-from typing import Mapping
+from typing import Mapping, Sequence, Tuple, Union
 
 import numpy as np
 import torch
@@ -62,16 +62,76 @@ class SLCWAInstances(Instances):
 @fix_dataclass_init_docs
 @dataclass
 class LCWAInstances(Instances):
-    """Triples and mappings to their indices for LCWA."""
+    """Triples and mappings to their indices for LCWA.
 
-    labels: np.ndarray
+    The labels are stored in compressed sparse row (CSR) format: the labels of the i-th instance are
+    ``label_indices[label_offsets[i]:label_offsets[i + 1]]``.
+    """
+
+    #: The offsets of each instance's labels in :data:`label_indices`, shape: (num_instances + 1,)
+    label_offsets: torch.LongTensor
+
+    #: The concatenated labels of all instances, shape: (num_labels,)
+    label_indices: torch.LongTensor
+
+    @property
+    def labels(self) -> np.ndarray:  # noqa: D401
+        """An array with the array of labels for each instance."""
+        labels = np.empty(self.num_instances, dtype=object)
+        offsets = self.label_offsets.tolist()
+        indices = self.label_indices.numpy()
+        for i, (start, stop) in enumerate(zip(offsets[:-1], offsets[1:])):
+            labels[i] = indices[start:stop]
+        return labels
 
     def __getitem__(self, item):  # noqa: D105
+        if not isinstance(item, (int, np.integer)):
+            return self.get_batch(item)
         # Create dense target
         batch_labels_full = torch.zeros(self.num_entities)
-        batch_labels_full[self.labels[item]] = 1
+        batch_labels_full[self.label_indices[self.label_offsets[item]:self.label_offsets[item + 1]]] = 1
         return self.mapped_triples[item], batch_labels_full
 
+    def get_batch(
+        self,
+        indices: Union[Sequence[int], torch.LongTensor],
+        sparse: bool = False,
+    ) -> Tuple[MappedTriples, torch.FloatTensor]:
+        """Get the pairs and targets for a batch of instances.
+
+        In contrast to stacking single instances, the targets of the whole batch are allocated once and filled with
+        a single scatter operation.
+
+        :param indices: shape: (batch_size,)
+            The indices of the instances.
+        :param sparse:
+            Whether to return the targets as a sparse COO tensor instead of a dense one.
+
+        :return: A pair (pairs, targets), where pairs has shape (batch_size, 2), and targets is a binary tensor
+            of shape (batch_size, num_entities).
+        """
+        indices = torch.as_tensor(indices, dtype=torch.long)
+        starts = self.label_offsets[indices]
+        lengths = self.label_offsets[indices + 1] - starts
+        batch_size = indices.shape[0]
+
+        # The position of each label in label_indices: the offset of its instance plus its rank within the instance
+        row_index = torch.repeat_interleave(torch.arange(batch_size), lengths)
+        first_position_in_batch = torch.cumsum(lengths, dim=0) - lengths
+        rank = torch.arange(row_index.shape[0]) - first_position_in_batch[row_index]
+        column_index = self.label_indices[starts[row_index] + rank]
+
+        if sparse:
+            targets = torch.sparse_coo_tensor(
+                indices=torch.stack([row_index, column_index], dim=0),
+                values=torch.ones(row_index.shape[0]),
+                size=(batch_size, self.num_entities),
+            )
+        else:
+            targets = torch.zeros(batch_size, self.num_entities)
+            targets[row_index, column_index] = 1.
+        return self.mapped_triples[indices], targets
+
 
 @fix_dataclass_init_docs
 @dataclass
@@ -251,12 +251,14 @@ def get_candidate_inverse_relations(
     :return: A counter whose keys are pairs of relations and values are similarity scores
     """
     # A dictionary of all of the head/tail pairs for a given relation
-    relations: Dict[str, Set[Tuple[str, str]]] = defaultdict(set)
+    relations: Dict[str, Set[Tuple[int, int]]] = defaultdict(set)
     # A dictionary for all of the tail/head pairs for a given relation
-    candidate_inverse_relations: Dict[str, Set[Tuple[str, str]]] = defaultdict(set)
-    for h, r, t in triples_factory.triples:
-        relations[r].add((h, t))
-        candidate_inverse_relations[r].add((t, h))
+    candidate_inverse_relations: Dict[str, Set[Tuple[int, int]]] = defaultdict(set)
+    # The pairs are compared by entity ID, so the labeled triples never have to be materialized
+    relation_labels = triples_factory.relation_labels.tolist()
+    for h, r, t in triples_factory.mapped_triples.tolist():
+        relations[relation_labels[r]].add((h, t))
+        candidate_inverse_relations[relation_labels[r]].add((t, h))
 
     # Calculate the similarity between each relationship (entries in ``forward``)
     # with all other candidate inverse relationships (entries in ``inverse``)
@@ -307,9 +309,10 @@ def get_candidate_duplicate_relations(
     :return: A counter whose keys are pairs of relations and values are similarity scores
     """
     # A dictionary of all of the head/tail pairs for a given relation
-    relations: Dict[str, Set[Tuple[str, str]]] = defaultdict(set)
-    for h, r, t in triples_factory.triples:
-        relations[r].add((h, t))
+    relations: Dict[str, Set[Tuple[int, int]]] = defaultdict(set)
+    relation_labels = triples_factory.relation_labels.tolist()
+    for h, r, t in triples_factory.mapped_triples.tolist():
+        relations[relation_labels[r]].add((h, t))
 
     it = itt.combinations(relations.items(), 2)
     if use_tqdm:
@@ -2,10 +2,11 @@
 
 """Implementation of basic instance factory which creates just instances based on standard KG triples."""
 
+import json
 import logging
 import os
 import re
-from collections import Counter, defaultdict
+import timeit
 from typing import Collection, Dict, Iterable, List, Mapping, Optional, Sequence, Set, TextIO, Tuple, Union
 
 import numpy as np
@@ -13,7 +14,6 @@ import torch
 
 from .instances import LCWAInstances, SLCWAInstances
 from .utils import load_triples
-from ..tqdmw import tqdm
 from ..typing import EntityMapping, LabeledTriples, MappedTriples, RelationMapping
 from ..utils import compact_mapping, slice_triples
 
@@ -28,60 +28,88 @@ logger = logging.getLogger(__name__)
 
 INVERSE_SUFFIX = '_inverse'
 
+BINARY_MAPPED_TRIPLES = 'mapped_triples.npy'
+BINARY_METADATA = 'metadata.json'
+
 
 def _create_multi_label_tails_instance(
     mapped_triples: MappedTriples,
-    use_tqdm: Optional[bool] = None
-) -> Dict[Tuple[int, int], List[int]]:
-    """Create for each (h,r) pair the multi tail label."""
-    logger.debug('Creating multi label tails instance')
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Create for each (h,r) pair the multi tail label.
 
-    '''
-    The mapped triples matrix has to be a numpy array to ensure correct pair hashing, as explained in
-    https://github.com/pykeen/pykeen/commit/1bc71fe4eb2f24190425b0a4d0b9d6c7b9c4653a
-    '''
-    mapped_triples = mapped_triples.cpu().detach().numpy()
-
-    s_p_to_multi_tails_new = _create_multi_label_instances(
-        mapped_triples,
+    :return: The unique (h, r) pairs, and the tails in CSR format, cf. :func:`_create_multi_label_instances`.
+    """
+    logger.debug('Creating multi label tails instance')
+    rv = _create_multi_label_instances(
+        mapped_triples.cpu().detach().numpy(),
         element_1_index=0,
         element_2_index=1,
         label_index=2,
-        use_tqdm=use_tqdm
     )
-
     logger.debug('Created multi label tails instance')
-
-    return s_p_to_multi_tails_new
+    return rv
 
 
 def _create_multi_label_instances(
-    mapped_triples: MappedTriples,
+    mapped_triples: np.ndarray,
     element_1_index: int,
     element_2_index: int,
     label_index: int,
-    use_tqdm: Optional[bool] = None,
-) -> Dict[Tuple[int, int], List[int]]:
-    """Create for each (element_1, element_2) pair the multi-label."""
-    instance_to_multi_label = defaultdict(set)
-
-    if use_tqdm is None:
-        use_tqdm = True
-
-    it = mapped_triples
-    if use_tqdm:
-        it = tqdm(mapped_triples, unit='triple', unit_scale=True, desc='Grouping triples')
-    for row in it:
-        instance_to_multi_label[row[element_1_index], row[element_2_index]].add(row[label_index])
-
-    # Create lists out of sets for proper numpy indexing when loading the labels
-    # TODO is there a need to have a canonical sort order here?
-    instance_to_multi_label_new = {
-        key: list(value)
-        for key, value in instance_to_multi_label.items()
-    }
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Create for each (element_1, element_2) pair the multi-label.
+
+    The triples are grouped by sorting them, such that no Python-level loop over the triples is necessary, and the
+    memory requirement stays linear in the number of triples.
+
+    :param mapped_triples: shape: (n, 3)
+        The mapped triples.
+    :return: A triple (pairs, offsets, indices), where
 
-    return instance_to_multi_label_new
+        1. pairs, shape: (m, 2), are the unique pairs in lexicographic order,
+        2. offsets, shape: (m + 1,), are the CSR offsets, and
+        3. indices, shape: (nnz,), are the labels.
+
+        The labels of the i-th pair are ``indices[offsets[i]:offsets[i + 1]]``, in ascending order.
+    """
+    first = mapped_triples[:, element_1_index]
+    second = mapped_triples[:, element_2_index]
+    labels = mapped_triples[:, label_index]
+
+    # sort by pair, and within each pair by label
+    order = np.lexsort((labels, second, first))
+    first, second, labels = first[order], second[order], labels[order]
+
+    # mark the first occurrence of each pair, and drop duplicate labels within a pair
+    new_pair = np.ones(labels.shape, dtype=np.bool_)
+    new_pair[1:] = (first[1:] != first[:-1]) | (second[1:] != second[:-1])
+    keep = new_pair.copy()
+    keep[1:] |= labels[1:] != labels[:-1]
+    if not keep.all():
+        first, second, labels, new_pair = first[keep], second[keep], labels[keep], new_pair[keep]
+
+    starts = np.flatnonzero(new_pair)
+    pairs = np.stack([first[starts], second[starts]], axis=-1)
+    offsets = np.append(starts, labels.shape[0])
+    return pairs, offsets, labels
+
+
+def _lookup_multi_label(
+    pairs: np.ndarray,
+    offsets: np.ndarray,
+    indices: np.ndarray,
+    first: int,
+    second: int,
+) -> np.ndarray:
+    """Look up the labels of a pair in the CSR format created by :func:`_create_multi_label_instances`.
+
+    :return: The labels of the pair in ascending order, or an empty array if the pair does not occur.
+    """
+    # the pairs are in lexicographic order, so two binary searches suffice
+    low, high = np.searchsorted(pairs[:, 0], [first, first + 1])
+    position = low + np.searchsorted(pairs[low:high, 1], second)
+    if position == high or pairs[position, 1] != second:
+        return indices[:0]
+    return indices[offsets[position]:offsets[position + 1]]
 
 
 def create_entity_mapping(triples: LabeledTriples) -> EntityMapping:
@@ -117,20 +145,46 @@ def create_relation_mapping(relations: set) -> RelationMapping:
     }
 
 
+def _map_labels_to_ids(labels: np.ndarray, label_to_id: Mapping[str, int]) -> np.ndarray:
+    """Map an array of labels to their IDs in bulk.
+
+    Instead of looking up every single label in the dictionary, the labels of the mapping are sorted once and all
+    labels are located at once with a binary search (:func:`numpy.searchsorted`).
+
+    :param labels: An array of labels of arbitrary shape, dtype: str or object
+    :param label_to_id: The mapping from labels to IDs.
+    :return: An array of the same shape as ``labels`` with the IDs. Labels which are not contained in the mapping
+        get the ID -1.
+    """
+    ids = np.full(labels.shape, fill_value=-1, dtype=np.int64)
+    if len(label_to_id) == 0 or labels.size == 0:
+        return ids
+
+    keys = np.asarray(list(label_to_id.keys()), dtype=object if labels.dtype == object else str)
+    values = np.fromiter(label_to_id.values(), dtype=np.int64, count=len(label_to_id))
+    order = np.argsort(keys)
+    keys, values = keys[order], values[order]
+
+    # searchsorted returns the insertion position, which is only a hit if the label is stored there
+    position = np.minimum(np.searchsorted(keys, labels), len(keys) - 1)
+    found = keys[position] == labels
+    ids[found] = values[position[found]]
+    return ids
+
+
 def _map_triples_elements_to_ids(
     triples: LabeledTriples,
     entity_to_id: EntityMapping,
     relation_to_id: RelationMapping,
 ) -> MappedTriples:
     """Map entities and relations to pre-defined ids."""
+    start = timeit.default_timer()
     heads, relations, tails = slice_triples(triples)
 
     # When triples that don't exist are trying to be mapped, they get the id "-1"
-    entity_getter = np.vectorize(entity_to_id.get)
-    head_column = entity_getter(heads, [-1])
-    tail_column = entity_getter(tails, [-1])
-    relation_getter = np.vectorize(relation_to_id.get)
-    relation_column = relation_getter(relations, [-1])
+    head_column = _map_labels_to_ids(heads, entity_to_id)
+    tail_column = _map_labels_to_ids(tails, entity_to_id)
+    relation_column = _map_labels_to_ids(relations, relation_to_id)
 
     # Filter all non-existent triples
     head_filter = head_column < 0
@@ -145,23 +199,127 @@ def _map_triples_elements_to_ids(
             f"You're trying to map triples with {num_no_head + num_no_tail} entities and {num_no_relation} relations"
             f" that are not in the training set. These triples will be excluded from the mapping.",
         )
-        non_mappable_triples = (head_filter | relation_filter | tail_filter)
-        head_column = head_column[~non_mappable_triples, None]
-        relation_column = relation_column[~non_mappable_triples, None]
-        tail_column = tail_column[~non_mappable_triples, None]
+        non_mappable_triples = (head_filter | relation_filter | tail_filter)[:, 0]
+        head_column = head_column[~non_mappable_triples]
+        relation_column = relation_column[~non_mappable_triples]
+        tail_column = tail_column[~non_mappable_triples]
         logger.warning(
             f"In total {non_mappable_triples.sum():.0f} from {triples.shape[0]:.0f} triples were filtered out",
         )
 
     triples_of_ids = np.concatenate([head_column, relation_column, tail_column], axis=1)
 
-    triples_of_ids = np.array(triples_of_ids, dtype=np.long)
     # Note: Unique changes the order of the triples
     # Note: Using unique means implicit balancing of training samples
     unique_mapped_triples = np.unique(ar=triples_of_ids, axis=0)
+    logger.debug("Mapping %d triples to IDs took %.2f seconds", triples.shape[0], timeit.default_timer() - start)
     return torch.tensor(unique_mapped_triples, dtype=torch.long)
 
 
+def _count_unique_ids(*columns: torch.LongTensor) -> int:
+    """Count the number of unique IDs in the given columns in linear time."""
+    columns = [np.asarray(column) for column in columns if len(column) > 0]
+    if not columns:
+        return 0
+    occurs = np.zeros(max(column.max() for column in columns) + 1, dtype=np.bool_)
+    for column in columns:
+        occurs[column] = True
+    return int(occurs.sum())
+
+
+def _take_rows(array: np.ndarray, idx: np.ndarray, sequential: bool = False) -> np.ndarray:
+    """Gather the rows of an array in the given order.
+
+    :param array: shape: (n, d)
+        The array.
+    :param idx: shape: (k,)
+        The indices of the rows.
+    :param sequential: Whether to read the rows in increasing order, e.g., such that a memory-mapped file is read
+        sequentially, and only the requested rows are paged in.
+
+    :return: shape: (k, d)
+        The rows, in the order of idx.
+    """
+    if not sequential:
+        return array[idx]
+    order = np.argsort(idx, kind='stable')
+    rv = np.empty((len(idx),) + array.shape[1:], dtype=array.dtype)
+    rv[order] = array[idx[order]]
+    return rv
+
+
+def _invert_mapping(label_to_id: Mapping[str, int]) -> np.ndarray:
+    """Create an array with the label of each ID at its position, using an empty label for unused IDs."""
+    labels = np.asarray(list(label_to_id.keys()), dtype=str)
+    ids = np.fromiter(label_to_id.values(), dtype=np.int64, count=len(label_to_id))
+    rv = np.zeros(ids.max() + 1 if len(ids) > 0 else 0, dtype=labels.dtype)
+    rv[ids] = labels
+    return rv
+
+
+def _load_binary_mapping(path: str, name: str) -> Dict[str, int]:
+    """Load a label to ID mapping stored by :meth:`TriplesFactory.to_binary`."""
+    labels = np.load(os.path.join(path, f'{name}_labels.npy'))
+    ids = np.load(os.path.join(path, f'{name}_ids.npy'))
+    return dict(zip(labels.tolist(), ids.tolist()))
+
+
+def _create_inverse_mapped_triples(
+    mapped_triples: MappedTriples,
+    relation_to_id: RelationMapping,
+    relation_to_inverse: Mapping[str, str],
+) -> np.ndarray:
+    """Create the inverse triples directly in ID space.
+
+    Head and tail are swapped, and each relation is replaced by the ID of its inverse relation. Triples whose
+    relation has no inverse relation in the mapping are dropped.
+
+    :param mapped_triples: shape: (n, 3)
+        The mapped triples.
+    :param relation_to_id: The mapping from relation labels to IDs, containing the inverse relations.
+    :param relation_to_inverse: The mapping from relation labels to the labels of their inverse relations.
+    :return: shape: (n, 3)
+        The inverse triples.
+    """
+    inverse_relation_ids = np.full(max(relation_to_id.values()) + 1, fill_value=-1, dtype=np.int64)
+    for relation, inverse_relation in relation_to_inverse.items():
+        if relation in relation_to_id and inverse_relation in relation_to_id:
+            inverse_relation_ids[relation_to_id[relation]] = relation_to_id[inverse_relation]
+
+    mapped_triples = mapped_triples.numpy()
+    inverse_triples = np.stack(
+        [
+            mapped_triples[:, 2],
+            inverse_relation_ids[mapped_triples[:, 1]],
+            mapped_triples[:, 0],
+        ],
+        axis=-1,
+    )
+    missing = inverse_triples[:, 1] < 0
+    if missing.any():
+        logger.warning(f'{missing.sum()} triples have a relation without inverse relation in the mapping.')
+        inverse_triples = inverse_triples[~missing]
+    return inverse_triples
+
+
+def _restrict_mapping(label_to_id: Mapping[str, int], ids: np.ndarray) -> Tuple[Dict[str, int], np.ndarray]:
+    """Restrict a mapping to the given IDs, and assign new consecutive IDs in the order of the old ones.
+
+    :param label_to_id: The mapping from labels to IDs.
+    :param ids: The IDs to keep, possibly with duplicates.
+    :return: The restricted mapping, and an array translating old IDs to new ones (-1 for removed IDs).
+    """
+    ids = np.unique(ids)
+    translation = np.full(max(label_to_id.values(), default=-1) + 1, fill_value=-1, dtype=np.int64)
+    translation[ids] = np.arange(ids.shape[0])
+    restricted = {
+        label: int(translation[i])
+        for label, i in label_to_id.items()
+        if translation[i] >= 0
+    }
+    return restricted, translation
+
+
 class TriplesFactory:
     """Create instances given the path to triples."""
 
@@ -171,10 +329,6 @@ class TriplesFactory:
     #: The mapping from relations' labels to their indexes
     relation_to_id: RelationMapping
 
-    #: A three-column matrix where each row are the head label,
-    #: relation label, then tail label
-    triples: LabeledTriples
-
     #: A three-column matrix where each row are the head identifier,
     #: relation identifier, then tail identifier
     mapped_triples: MappedTriples
@@ -182,6 +336,9 @@ class TriplesFactory:
     #: A dictionary mapping each relation to its inverse, if inverse triples were created
     relation_to_inverse: Optional[Mapping[str, str]]
 
+    #: Whether the mapped triples are a view of a memory-mapped file, cf. :meth:`TriplesFactory.from_binary`
+    _memory_mapped: bool = False
+
     def __init__(
         self,
         *,
@@ -191,6 +348,8 @@ class TriplesFactory:
         entity_to_id: Optional[EntityMapping] = None,
         relation_to_id: Optional[RelationMapping] = None,
         compact_id: bool = True,
+        mapped_triples: Optional[MappedTriples] = None,
+        keep_labeled_triples: bool = True,
     ) -> None:
         """Initialize the triples factory.
 
@@ -201,7 +360,34 @@ class TriplesFactory:
         :param create_inverse_triples: Should inverse triples be created? Defaults to False.
         :param compact_id:
             Whether to compact the IDs such that they range from 0 to (num_entities or num_relations)-1
+        :param mapped_triples: A 3-column tensor with already mapped triples. If specified, neither ``path`` nor
+         ``triples`` may be given, but both ``entity_to_id`` and ``relation_to_id`` have to be. The triples are used
+         as they are, i.e., if ``create_inverse_triples`` is true, they have to contain the inverse triples already.
+        :param keep_labeled_triples: Should the labeled triples be kept after mapping them? If false, only the mapped
+         triples and the mappings are kept, and the labeled triples are reconstructed from them whenever they are
+         requested. Since numpy pads each label to the length of the longest one, this saves a lot of memory for
+         large graphs with long labels, e.g., IRIs.
         """
+        self.keep_labeled_triples = keep_labeled_triples
+        self._entity_labels = None
+        self._relation_labels = None
+        self._known_tails = None
+        self._known_heads = None
+
+        if mapped_triples is not None:
+            if path is not None or triples is not None:
+                raise ValueError('Must not specify mapped_triples together with triples or path')
+            if entity_to_id is None or relation_to_id is None:
+                raise ValueError('Must specify entity_to_id and relation_to_id together with mapped_triples')
+            self.path = '<None>'
+            self._init_from_mapped_triples(
+                mapped_triples=mapped_triples,
+                create_inverse_triples=create_inverse_triples,
+                entity_to_id=entity_to_id,
+                relation_to_id=relation_to_id,
+            )
+            return
+
         if path is None and triples is None:
             raise ValueError('Must specify either triples or path')
         elif path is not None and triples is not None:
@@ -215,14 +401,15 @@ class TriplesFactory:
                 raise TypeError(f'path is invalid type: {type(path)}')
 
             # TODO: Check if lazy evaluation would make sense
-            self.triples = load_triples(path)
+            self._triples = load_triples(path)
         else:  # triples is not None
             self.path = '<None>'
-            self.triples = triples
+            self._triples = triples
+        self._inverse_labels_pending = False
 
-        self._num_entities = len(set(self.triples[:, 0]).union(self.triples[:, 2]))
+        self._num_entities = len(set(self._triples[:, 0]).union(self._triples[:, 2]))
 
-        relations = self.triples[:, 1]
+        relations = self._triples[:, 1]
         unique_relations = set(relations)
 
         # Check if the triples are inverted already
@@ -244,16 +431,9 @@ class TriplesFactory:
                     relation: f"{relation}{INVERSE_SUFFIX}"
                     for relation in unique_relations
                 }
-                inverse_triples = np.stack(
-                    [
-                        self.triples[:, 2],
-                        np.array([self.relation_to_inverse[relation] for relation in relations], dtype=np.str),
-                        self.triples[:, 0],
-                    ],
-                    axis=-1,
-                )
-                # extend original triples with inverse ones
-                self.triples = np.concatenate([self.triples, inverse_triples], axis=0)
+                # The inverse triples are created after mapping in ID space. Their labels are only created once
+                # the labeled triples are requested.
+                self._inverse_labels_pending = True
                 self._num_relations = 2 * len(unique_relations)
 
         else:
@@ -263,7 +443,7 @@ class TriplesFactory:
 
         # Generate entity mapping if necessary
         if entity_to_id is None:
-            entity_to_id = create_entity_mapping(triples=self.triples)
+            entity_to_id = create_entity_mapping(triples=self._triples)
         if compact_id:
             entity_to_id = compact_mapping(mapping=entity_to_id)[0]
         self.entity_to_id = entity_to_id
@@ -282,19 +462,116 @@ class TriplesFactory:
 
         # Map triples of labels to triples of IDs.
         self.mapped_triples = _map_triples_elements_to_ids(
-            triples=self.triples,
+            triples=self._triples,
             entity_to_id=self.entity_to_id,
             relation_to_id=self.relation_to_id,
         )
+        if self._inverse_labels_pending:
+            inverse_triples = _create_inverse_mapped_triples(
+                mapped_triples=self.mapped_triples,
+                relation_to_id=self.relation_to_id,
+                relation_to_inverse=self.relation_to_inverse,
+            )
+            self.mapped_triples = torch.from_numpy(
+                np.unique(np.concatenate([self.mapped_triples.numpy(), inverse_triples]), axis=0),
+            )
+
+        if not keep_labeled_triples:
+            self._triples = None
+            self._inverse_labels_pending = False
+
+    def _init_from_mapped_triples(
+        self,
+        *,
+        mapped_triples: MappedTriples,
+        create_inverse_triples: bool,
+        entity_to_id: EntityMapping,
+        relation_to_id: RelationMapping,
+    ) -> None:
+        """Initialize the factory from already mapped triples, without ever touching the labels of the triples."""
+        self.entity_to_id = entity_to_id
+        self.relation_to_id = relation_to_id
+        self.mapped_triples = mapped_triples
+        # the labeled triples are only reconstructed if they are requested
+        self._triples = None
+        self._inverse_labels_pending = False
+
+        self.create_inverse_triples = create_inverse_triples
+        if create_inverse_triples:
+            self.relation_to_inverse = {
+                relation: f'{relation}{INVERSE_SUFFIX}'
+                for relation in relation_to_id.keys()
+                if not relation.endswith(INVERSE_SUFFIX)
+            }
+        else:
+            self.relation_to_inverse = None
+
+        # counted lazily, such that loading from the binary format, which stores the counts, never scans the triples
+        self._num_entities = None
+        self._num_relations = None
+
+    @property
+    def triples(self) -> LabeledTriples:  # noqa: D401
+        """A three-column matrix where each row are the head label, relation label, then tail label."""
+        if self._triples is None:
+            triples = self._label_triples(self.mapped_triples)
+            if self.keep_labeled_triples:
+                self._triples = triples
+            return triples
+        elif self._inverse_labels_pending:
+            relations = self._triples[:, 1].astype(str)
+            inverse_triples = np.stack(
+                [
+                    self._triples[:, 2],
+                    np.char.add(relations, INVERSE_SUFFIX),
+                    self._triples[:, 0],
+                ],
+                axis=-1,
+            )
+            # extend original triples with inverse ones
+            self._triples = np.concatenate([self._triples, inverse_triples], axis=0)
+            self._inverse_labels_pending = False
+        return self._triples
+
+    @property
+    def entity_labels(self) -> np.ndarray:  # noqa: D401
+        """An array with the label of each entity at the position of its ID."""
+        if self._entity_labels is None:
+            self._entity_labels = _invert_mapping(self.entity_to_id)
+        return self._entity_labels
+
+    @property
+    def relation_labels(self) -> np.ndarray:  # noqa: D401
+        """An array with the label of each relation at the position of its ID."""
+        if self._relation_labels is None:
+            self._relation_labels = _invert_mapping(self.relation_to_id)
+        return self._relation_labels
+
+    def _label_triples(self, mapped_triples: MappedTriples) -> LabeledTriples:
+        """Convert mapped triples back to labeled triples."""
+        mapped_triples = np.asarray(mapped_triples)
+        entity_labels = self.entity_labels
+        return np.stack(
+            [
+                entity_labels[mapped_triples[:, 0]],
+                self.relation_labels[mapped_triples[:, 1]],
+                entity_labels[mapped_triples[:, 2]],
+            ],
+            axis=-1,
+        )
 
     @property
     def num_entities(self) -> int:  # noqa: D401
         """The number of unique entities."""
+        if self._num_entities is None:
+            self._num_entities = _count_unique_ids(self.mapped_triples[:, 0], self.mapped_triples[:, 2])
         return self._num_entities
 
     @property
     def num_relations(self) -> int:  # noqa: D401
         """The number of unique relations."""
+        if self._num_relations is None:
+            self._num_relations = _count_unique_ids(self.mapped_triples[:, 1])
         return self._num_relations
 
     @property
@@ -302,6 +579,110 @@ class TriplesFactory:
         """The number of triples."""
         return self.mapped_triples.shape[0]
 
+    def get_known_tails(self, head_id: int, relation_id: int) -> np.ndarray:
+        """Get the IDs of all tails which occur together with the given head and relation, in ascending order.
+
+        The index of known triples is built once, on first use, and stores the tails of each (head, relation) pair
+        in CSR format.
+        """
+        if self._known_tails is None:
+            self._known_tails = _create_multi_label_instances(
+                self.mapped_triples.numpy(),
+                element_1_index=0,
+                element_2_index=1,
+                label_index=2,
+            )
+        return _lookup_multi_label(*self._known_tails, head_id, relation_id)
+
+    def get_known_heads(self, relation_id: int, tail_id: int) -> np.ndarray:
+        """Get the IDs of all heads which occur together with the given relation and tail, in ascending order.
+
+        .. seealso:: :meth:`TriplesFactory.get_known_tails`
+        """
+        if self._known_heads is None:
+            self._known_heads = _create_multi_label_instances(
+                self.mapped_triples.numpy(),
+                element_1_index=1,
+                element_2_index=2,
+                label_index=0,
+            )
+        return _lookup_multi_label(*self._known_heads, relation_id, tail_id)
+
+    def to_binary(self, path: str) -> None:
+        """Store the factory in a binary format, which can be loaded without parsing and mapping the triples again.
+
+        The directory contains the mapped triples as a raw integer array, the entity and relation labels in the
+        order of their IDs, and a small JSON file with the remaining metadata.
+
+        :param path: The directory in which the files are stored. It is created if it does not exist.
+
+        .. seealso:: :meth:`TriplesFactory.from_binary`
+        """
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, BINARY_MAPPED_TRIPLES), self.mapped_triples.cpu().numpy())
+        for name, mapping in (('entity', self.entity_to_id), ('relation', self.relation_to_id)):
+            np.save(os.path.join(path, f'{name}_labels.npy'), np.asarray(list(mapping.keys()), dtype=str))
+            np.save(os.path.join(path, f'{name}_ids.npy'), np.fromiter(mapping.values(), dtype=np.int64))
+        with open(os.path.join(path, BINARY_METADATA), 'w') as file:
+            json.dump(
+                dict(
+                    path=self.path,
+                    create_inverse_triples=self.create_inverse_triples,
+                    num_entities=self.num_entities,
+                    num_relations=self.num_relations,
+                ),
+                file,
+                indent=2,
+            )
+
+    @classmethod
+    def from_binary(
+        cls,
+        path: str,
+        *,
+        entity_to_id: Optional[EntityMapping] = None,
+        relation_to_id: Optional[RelationMapping] = None,
+        memory_map: bool = False,
+        keep_labeled_triples: bool = True,
+    ) -> 'TriplesFactory':
+        """Load a factory which has been stored with :meth:`TriplesFactory.to_binary`.
+
+        The arrays are memory-mapped, so neither the triples have to be parsed, nor the labels have to be mapped.
+
+        :param path: The directory in which the factory was stored.
+        :param entity_to_id: If given, use this entity mapping instead of the stored one, e.g., to share the same
+         mapping object with the training factory.
+        :param relation_to_id: If given, use this relation mapping instead of the stored one.
+        :param memory_map: If true, the mapped triples are not loaded into memory. Instead, the tensor is a
+         zero-copy view of the memory-mapped file, such that the operating system only pages in the triples which
+         are accessed, e.g., by the instances created with :meth:`TriplesFactory.create_slcwa_instances`. This
+         allows working with graphs whose triples do not fit into the main memory. The file is mapped
+         copy-on-write, i.e., modifications of the tensor are never written back.
+        :param keep_labeled_triples: Should the labeled triples be cached once they are requested?
+        """
+        with open(os.path.join(path, BINARY_METADATA)) as file:
+            metadata = json.load(file)
+        if entity_to_id is None:
+            entity_to_id = _load_binary_mapping(path, 'entity')
+        if relation_to_id is None:
+            relation_to_id = _load_binary_mapping(path, 'relation')
+        mapped_triples = np.load(os.path.join(path, BINARY_MAPPED_TRIPLES), mmap_mode='c' if memory_map else 'r')
+        if not memory_map:
+            mapped_triples = np.array(mapped_triples)
+        rv = cls(
+            mapped_triples=torch.from_numpy(mapped_triples),
+            create_inverse_triples=metadata['create_inverse_triples'],
+            entity_to_id=entity_to_id,
+            relation_to_id=relation_to_id,
+            keep_labeled_triples=keep_labeled_triples,
+        )
+        rv.path = metadata['path']
+        rv._memory_mapped = memory_map
+        # the counts of the original factory may include labels which could not be mapped
+        rv._num_entities = metadata['num_entities']
+        rv._num_relations = metadata['num_relations']
+        return rv
+
     def get_inverse_relation_id(self, relation: str) -> int:
         """Get the inverse relation identifier for the given relation."""
         if not self.create_inverse_triples:
@@ -330,20 +711,17 @@ class TriplesFactory:
         )
 
     def create_lcwa_instances(self, use_tqdm: Optional[bool] = None) -> LCWAInstances:
-        """Create LCWA instances for this factory's triples."""
-        s_p_to_multi_tails = _create_multi_label_tails_instance(
-            mapped_triples=self.mapped_triples,
-            use_tqdm=use_tqdm,
-        )
-        sp, multi_o = zip(*s_p_to_multi_tails.items())
-        mapped_triples: torch.LongTensor = torch.tensor(sp, dtype=torch.long)
-        labels = np.array([np.array(item) for item in multi_o])
+        """Create LCWA instances for this factory's triples.
 
+        :param use_tqdm: Unused, since the triples are grouped in a vectorized manner. Kept for compatibility.
+        """
+        pairs, offsets, indices = _create_multi_label_tails_instance(mapped_triples=self.mapped_triples)
         return LCWAInstances(
-            mapped_triples=mapped_triples,
+            mapped_triples=torch.as_tensor(pairs, dtype=torch.long),
             entity_to_id=self.entity_to_id,
             relation_to_id=self.relation_to_id,
-            labels=labels,
+            label_offsets=torch.as_tensor(offsets, dtype=torch.long),
+            label_indices=torch.as_tensor(indices, dtype=torch.long),
         )
 
     def map_triples_to_id(self, triples: Union[str, LabeledTriples]) -> MappedTriples:
@@ -378,7 +756,7 @@ class TriplesFactory:
          order such as in ``[0.8, 0.1, 0.1]`` where the sum of all ratios is 1.0.
         :param random_state: The random state used to shuffle and split the triples in this factory.
         :param randomize_cleanup: If true, uses the non-deterministic method for moving triples to the training set.
-         This has the advantage that it doesn't necessarily have to move all of them, but it might be slower.
+         This has the advantage that it doesn't necessarily have to move all of them.
 
         .. code-block:: python
 
@@ -391,7 +769,7 @@ class TriplesFactory:
             ratios = [0.8, 0.1, 0.1]  # also makes a [0.8, 0.1, 0.1] split
             training_factory, testing_factory, validation_factory = factory.split(ratios)
         """
-        n_triples = self.triples.shape[0]
+        n_triples = self.num_triples
 
         # Prepare shuffle index
         idx = np.arange(n_triples)
@@ -419,8 +797,11 @@ class TriplesFactory:
         # Take cumulative sum so the get separated properly
         split_idxs = np.cumsum(sizes)
 
-        # Split triples
-        triples_groups = np.vsplit(self.triples[idx], split_idxs)
+        # Split the mapped triples, such that the labels never have to be materialized
+        triples_groups = [
+            _take_rows(self.mapped_triples.numpy(), group_idx, sequential=self._memory_mapped)
+            for group_idx in np.split(idx, split_idxs)
+        ]
         logger.info(f'split triples to groups of sizes {[triples.shape[0] for triples in triples_groups]}')
 
         # Make sure that the first element has all the right stuff in it
@@ -438,10 +819,11 @@ class TriplesFactory:
         # Make new triples factories for each group
         return [
             TriplesFactory(
-                triples=triples,
+                mapped_triples=torch.from_numpy(triples),
+                create_inverse_triples=self.create_inverse_triples,
                 entity_to_id=self.entity_to_id,
                 relation_to_id=self.relation_to_id,
-                compact_id=False,
+                keep_labeled_triples=self.keep_labeled_triples,
             )
             for triples in triples_groups
         ]
@@ -459,33 +841,79 @@ class TriplesFactory:
         elif not isinstance(n, int):
             raise TypeError('n must be either an integer or a float')
 
-        counter = Counter(self.triples[:, 1])
+        counts = np.bincount(self.mapped_triples[:, 1].numpy(), minlength=len(self.relation_to_id))
+        relation_labels = self.relation_labels
         return {
-            relation
-            for relation, _ in counter.most_common(n)
+            relation_labels[relation_id]
+            for relation_id in np.argsort(-counts, kind='stable')[:n]
+            if counts[relation_id] > 0
         }
 
-    def get_idx_for_relations(self, relations: Collection[str], invert: bool = False):
-        """Get an np.array index for triples with the given relations."""
-        return np.isin(self.triples[:, 1], list(relations), invert=invert)
+    def get_idx_for_relations(self, relations: Collection[str], invert: bool = False) -> np.ndarray:
+        """Get an np.array index for the mapped triples with the given relations."""
+        relation_ids = [
+            self.relation_to_id[relation]
+            for relation in relations
+            if relation in self.relation_to_id
+        ]
+        return np.isin(self.mapped_triples[:, 1].numpy(), relation_ids, invert=invert)
 
     def get_triples_for_relations(self, relations: Collection[str], invert: bool = False) -> LabeledTriples:
         """Get the labeled triples containing the given relations."""
-        return self.triples[self.get_idx_for_relations(relations, invert=invert)]
+        idx = self.get_idx_for_relations(relations, invert=invert)
+        return self._label_triples(self.mapped_triples.numpy()[idx])
 
     def new_with_relations(self, relations: Collection[str]) -> 'TriplesFactory':
         """Make a new triples factory only keeping the given relations."""
         idx = self.get_idx_for_relations(relations)
         logger.info(f'keeping {len(relations)}/{self.num_relations} relations'
                     f' and {idx.sum()}/{self.num_triples} triples in {self}')
-        return TriplesFactory(triples=self.triples[idx])
+        return self._new_with_idx(idx)
 
     def new_without_relations(self, relations: Collection[str]) -> 'TriplesFactory':
         """Make a new triples factory without the given relations."""
         idx = self.get_idx_for_relations(relations, invert=True)
         logger.info(f'removing {len(relations)}/{self.num_relations} relations'
                     f' and {idx.sum()}/{self.num_triples} triples')
-        return TriplesFactory(triples=self.triples[idx])
+        return self._new_with_idx(idx)
+
+    def _new_with_idx(self, idx: np.ndarray) -> 'TriplesFactory':
+        """Make a new triples factory from a subset of the mapped triples, with compacted IDs.
+
+        The new IDs are assigned in the order of the old ones, such that the labels never have to be materialized.
+        """
+        if self.create_inverse_triples:
+            # keep the partners of all remaining relations together with their triples, such that the remaining
+            # triples are closed under inversion, like when creating the inverse triples anew
+            relation_ids = self.mapped_triples[:, 1].numpy()
+            present = set(np.unique(relation_ids[idx]).tolist())
+            partner_ids = [
+                self.relation_to_id[label]
+                for relation, inverse_relation in self.relation_to_inverse.items()
+                if present.intersection((self.relation_to_id.get(relation), self.relation_to_id.get(inverse_relation)))
+                for label in (relation, inverse_relation)
+                if label in self.relation_to_id
+            ]
+            idx = np.isin(relation_ids, partner_ids)
+
+        mapped_triples = self.mapped_triples.numpy()[idx]
+        entity_to_id, entity_translation = _restrict_mapping(self.entity_to_id, mapped_triples[:, [0, 2]])
+        relation_to_id, relation_translation = _restrict_mapping(self.relation_to_id, mapped_triples[:, 1])
+
+        return TriplesFactory(
+            mapped_triples=torch.from_numpy(np.stack(
+                [
+                    entity_translation[mapped_triples[:, 0]],
+                    relation_translation[mapped_triples[:, 1]],
+                    entity_translation[mapped_triples[:, 2]],
+                ],
+                axis=-1,
+            )),
+            create_inverse_triples=self.create_inverse_triples,
+            entity_to_id=entity_to_id,
+            relation_to_id=relation_to_id,
+            keep_labeled_triples=self.keep_labeled_triples,
+        )
 
     def entity_word_cloud(self, top: Optional[int] = None):
         """Make a word cloud based on the frequency of occurrence of each entity in a Jupyter notebook.
@@ -565,8 +993,12 @@ def _tf_cleanup_randomized(
     """Cleanup a triples array, but randomly select testing triples and recalculate to minimize moves.
 
     1. Calculate ``move_id_mask`` as in :func:`_tf_cleanup_deterministic`
-    2. Choose a triple to move, recalculate move_id_mask
-    3. Continue until move_id_mask has no true bits
+    2. Visit the candidate triples in random order
+    3. Move a candidate only if it still contains an entity or relation which does not occur in the training triples,
+       and update the coverage of the training triples incrementally
+
+    Since moving triples only ever adds entities and relations to the training triples, this is equivalent to
+    repeatedly choosing a random triple among the remaining candidates, and recalculating ``move_id_mask``.
     """
     if random_state is None:
         random_state = np.random.randint(0, 2 ** 32 - 1)
@@ -574,36 +1006,42 @@ def _tf_cleanup_randomized(
     if isinstance(random_state, int):
         random_state = np.random.RandomState(random_state)
 
-    move_id_mask = _prepare_cleanup(training, testing)
-
-    # While there are still triples that should be moved to the training set
-    while move_id_mask.any():
-        # Pick a random triple to move over to the training triples
-        idx = random_state.choice(move_id_mask.nonzero()[0])
-        training = np.concatenate([training, testing[idx].reshape(1, -1)])
+    entity_covered = _get_coverage(training, testing, [0, 2])
+    relation_covered = _get_coverage(training, testing, [1])
+    candidates = _prepare_cleanup(training, testing).nonzero()[0]
+    random_state.shuffle(candidates)
 
-        # Recalculate the testing triples without that index
-        testing_mask = np.ones_like(move_id_mask)
-        testing_mask[idx] = False
-        testing = testing[testing_mask]
+    moved = []
+    for idx in candidates:
+        h, r, t = testing[idx]
+        if entity_covered[h] and entity_covered[t] and relation_covered[r]:
+            continue
+        entity_covered[h] = entity_covered[t] = relation_covered[r] = True
+        moved.append(idx)
 
-        # Recalculate the training entities, testing entities, to_move, and move_id_mask
-        move_id_mask = _prepare_cleanup(training, testing)
+    testing_mask = np.ones(testing.shape[0], dtype=bool)
+    testing_mask[moved] = False
+    training = np.concatenate([training, testing[moved].reshape(-1, testing.shape[1])])
+    testing = testing[testing_mask]
 
     return training, testing
 
 
-def _prepare_cleanup(training: np.ndarray, testing: np.ndarray) -> np.ndarray:
-    to_move_mask = None
-    for col in [[0, 2], 1]:
-        training_ids, test_ids = [np.unique(triples[:, col]) for triples in [training, testing]]
-        to_move = test_ids[~np.isin(test_ids, training_ids)]
-        this_to_move_mask = np.isin(testing[:, col], to_move)
-        if this_to_move_mask.ndim > 1:
-            this_to_move_mask = this_to_move_mask.any(axis=1)
-        if to_move_mask is None:
-            to_move_mask = this_to_move_mask
-        else:
-            to_move_mask = this_to_move_mask | to_move_mask
+def _get_coverage(training: np.ndarray, testing: np.ndarray, columns: List[int]) -> np.ndarray:
+    """Get a boolean array indicating for each ID if it occurs in the given columns of the training triples.
+
+    :param training: The training triples.
+    :param testing: The testing triples, which are only used to determine the size of the array.
+    :param columns: The columns of the triples, e.g., ``[0, 2]`` for entities and ``[1]`` for relations.
+    """
+    num_ids = max(training[:, columns].max(initial=-1), testing[:, columns].max(initial=-1)) + 1
+    return np.bincount(training[:, columns].ravel(), minlength=num_ids) > 0
+
 
+def _prepare_cleanup(training: np.ndarray, testing: np.ndarray) -> np.ndarray:
+    """Get a mask for the testing triples which contain an entity or relation not occurring in the training triples."""
+    to_move_mask = np.zeros(testing.shape[0], dtype=bool)
+    for columns in ([0, 2], [1]):
+        covered = _get_coverage(training, testing, columns)
+        to_move_mask |= ~covered[testing[:, columns]].all(axis=1)
     return to_move_mask
@@ -123,5 +123,6 @@ class TriplesNumericLiteralsFactory(TriplesFactory):
             relation_to_id=lcwa_instances.relation_to_id,
             numeric_literals=self.numeric_literals,
             literals_to_id=self.literals_to_id,
-            labels=lcwa_instances.labels,
+            label_offsets=lcwa_instances.label_offsets,
+            label_indices=lcwa_instances.label_indices,
         )
@@ -2,9 +2,17 @@
 
 """Instance creation utilities."""
 
-from typing import Callable, Mapping, TextIO, Union
+import csv
+import io
+import logging
+import os
+import timeit
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, List, Mapping, Optional, TextIO, Union
 
 import numpy as np
+import pandas as pd
 from pkg_resources import iter_entry_points
 
 from ..typing import LabeledTriples
@@ -13,6 +21,20 @@ __all__ = [
     'load_triples',
 ]
 
+logger = logging.getLogger(__name__)
+
+#: Lines starting with this marker are skipped
+COMMENT_MARKER = '@Comment@ Head Relation Tail'
+
+#: File extensions which are decompressed while streaming through the file
+COMPRESSED_EXTENSIONS = ('.gz', '.bz2', '.xz', '.zip')
+
+#: The number of bytes of an uncompressed file, which are parsed by one worker at a time
+CHUNK_SIZE = 2 ** 26
+
+#: The number of lines of a compressed file, which are parsed at a time
+CHUNK_LINES = 2 ** 20
+
 
 def _load_importers(group_subname: str) -> Mapping[str, Callable[[str], LabeledTriples]]:
     return {
@@ -27,13 +49,26 @@ PREFIX_IMPORTERS: Mapping[str, Callable[[str], LabeledTriples]] = _load_importer
 EXTENSION_IMPORTERS: Mapping[str, Callable[[str], LabeledTriples]] = _load_importers('extension_importer')
 
 
-def load_triples(path: Union[str, TextIO], delimiter: str = '\t') -> LabeledTriples:
+def load_triples(
+    path: Union[str, TextIO],
+    delimiter: str = '\t',
+    backend: str = 'pandas',
+    num_workers: Optional[int] = None,
+) -> LabeledTriples:
     """Load triples saved as tab separated values.
 
     Besides TSV handling, PyKEEN does not come with any importers pre-installed. A few can be found at:
 
     - :mod:`pybel.io.pykeen`
     - :mod:`bio2bel.io.pykeen`
+
+    :param path: The path to the file, or an open file.
+    :param delimiter: The delimiter of the columns.
+    :param backend: Either ``'pandas'``, which parses large files in chunks with a pool of threads and reads
+     compressed files (``.gz``, ``.bz2``, ``.xz``, ``.zip``) as a stream, or ``'numpy'``, which uses
+     :func:`numpy.loadtxt`. The ``'pandas'`` backend returns the labels as an array with dtype object instead of
+     a fixed-width unicode array, whose size is determined by the longest label.
+    :param num_workers: The number of threads used by the ``'pandas'`` backend. Defaults to the number of CPUs.
     """
     if isinstance(path, str):
         for extension, handler in EXTENSION_IMPORTERS.items():
@@ -44,9 +79,134 @@ def load_triples(path: Union[str, TextIO], delimiter: str = '\t') -> LabeledTrip
             if path.startswith(f'{prefix}:'):
                 return handler(path[len(f'{prefix}:'):])
 
-    return np.loadtxt(
-        fname=path,
+    if backend == 'numpy':
+        return np.loadtxt(
+            fname=path,
+            dtype=str,
+            comments=COMMENT_MARKER,
+            delimiter=delimiter,
+        )
+    elif backend == 'pandas':
+        return _load_triples_chunked(path, delimiter=delimiter, num_workers=num_workers)
+    raise ValueError(f'Invalid backend: {backend}')
+
+
+def _load_triples_chunked(
+    path: Union[str, TextIO],
+    delimiter: str = '\t',
+    num_workers: Optional[int] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> LabeledTriples:
+    """Load triples with pandas' C parser.
+
+    Large uncompressed files are split into byte ranges at line boundaries, which are parsed in parallel. Compressed
+    files and open files are streamed in chunks of lines.
+    """
+    start = timeit.default_timer()
+    if (
+        isinstance(path, str)
+        and not path.endswith(COMPRESSED_EXTENSIONS)
+        and os.path.getsize(path) > chunk_size
+    ):
+        offsets = _get_chunk_offsets(path, chunk_size=chunk_size)
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            chunks = list(executor.map(
+                partial(_read_byte_range, path, delimiter=delimiter),
+                offsets[:-1],
+                offsets[1:],
+            ))
+    else:
+        chunks = _read_stream(path, delimiter=delimiter)
+
+    chunks = [chunk for chunk in chunks if chunk.size > 0]
+    if not chunks:
+        return np.empty(shape=(0, 3), dtype=object)
+    triples = np.concatenate(chunks, axis=0)
+
+    logger.debug('Loading %d triples took %.2f seconds', triples.shape[0], timeit.default_timer() - start)
+    return triples
+
+
+def _drop_comments(triples: np.ndarray) -> np.ndarray:
+    """Drop the rows of comment lines."""
+    is_comment = np.asarray([label.startswith(COMMENT_MARKER) for label in triples[:, 0]], dtype=bool)
+    if is_comment.any():
+        triples = triples[~is_comment]
+    return triples
+
+
+def _check_columns(triples: np.ndarray) -> np.ndarray:
+    """Check that each row has exactly three non-empty columns, and drop the extra column used for the check.
+
+    :param triples: shape: (n, 4)
+        The parsed rows, cf. :func:`_get_read_csv_kwargs`. Missing fields of short rows are empty or NaN.
+
+    :return: shape: (n, 3)
+        The triples.
+
+    :raises ValueError:
+        If a row has less or more than three columns.
+    """
+    empty = pd.isna(triples) | (triples == '')
+    invalid = empty[:, :3].any(axis=1) | ~empty[:, 3]
+    if invalid.any():
+        i = invalid.argmax()
+        raise ValueError(f'Expected three columns, but got {triples[i][~empty[i]].tolist()}.')
+    return triples[:, :3]
+
+
+def _get_read_csv_kwargs(delimiter: str):
+    return dict(
+        sep=delimiter,
+        header=None,
+        # comment lines only have a single column, so the number of columns can not be inferred from the first line.
+        # The fourth column detects rows with too many columns, cf. _check_columns
+        names=[0, 1, 2, 3],
+        index_col=False,
         dtype=str,
-        comments='@Comment@ Head Relation Tail',
-        delimiter=delimiter,
+        # labels are taken as they are, e.g., "NA" is not a missing value and quotes are part of the label
+        na_filter=False,
+        quoting=csv.QUOTE_NONE,
     )
+
+
+def _get_chunk_offsets(path: str, chunk_size: int) -> List[int]:
+    """Split a file into byte ranges of roughly the given size, which end at line boundaries."""
+    size = os.path.getsize(path)
+    offsets = [0]
+    with open(path, 'rb') as file:
+        while offsets[-1] + chunk_size < size:
+            file.seek(offsets[-1] + chunk_size)
+            # move to the beginning of the next line
+            file.readline()
+            offsets.append(file.tell())
+    if offsets[-1] < size:
+        offsets.append(size)
+    return offsets
+
+
+def _read_byte_range(path: str, start: int, stop: int, delimiter: str) -> np.ndarray:
+    """Parse the lines of a file within the given byte range."""
+    with open(path, 'rb') as file:
+        file.seek(start)
+        data = file.read(stop - start)
+    try:
+        triples = pd.read_csv(io.BytesIO(data), **_get_read_csv_kwargs(delimiter)).values
+    except pd.errors.EmptyDataError:
+        return np.empty(shape=(0, 3), dtype=object)
+    # only look for comments row by row if there are any
+    if COMMENT_MARKER.encode() in data:
+        triples = _drop_comments(triples)
+    return _check_columns(triples)
+
+
+def _read_stream(path: Union[str, TextIO], delimiter: str) -> List[np.ndarray]:
+    """Parse a file in chunks of lines, decompressing it on the fly if necessary."""
+    try:
+        reader = pd.read_csv(path, chunksize=CHUNK_LINES, **_get_read_csv_kwargs(delimiter))
+    except pd.errors.EmptyDataError:
+        return []
+    try:
+        return [_check_columns(_drop_comments(chunk.values)) for chunk in reader]
+    finally:
+        reader.close()
@@ -3,8 +3,10 @@
 """Utilities for PyKEEN."""
 
 import ftplib
+import functools
 import json
 import logging
+import operator
 import random
 from io import BytesIO
 from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Type, TypeVar, Union
@@ -35,6 +37,8 @@ __all__ = [
     'get_until_first_blank',
     'flatten_dictionary',
     'get_embedding_in_canonical_shape',
+    'pairwise_distances',
+    'tensor_product_sum',
     'set_random_seed',
     'NoRandomSeedNecessary',
     'Result',
@@ -215,6 +219,73 @@ def get_embedding_in_canonical_shape(
     return e
 
 
+def tensor_product_sum(*factors: torch.FloatTensor) -> torch.FloatTensor:
+    """Compute the sum over the last dimension of the element-wise product of tensors in canonical shape.
+
+    If exactly one factor comprises several candidates, e.g., all entities, the other factors are first combined
+    into one query vector per batch element, and the scores are computed by a single matrix multiplication with the
+    candidates. Thereby, the intermediate tensor of shape (batch_size, num_candidates, d) is never created.
+
+    :param factors: shape: (batch_size, num, d)
+        The factors in canonical shape, cf. :func:`get_embedding_in_canonical_shape`.
+
+    :return: shape: (batch_size, num)
+    """
+    candidate_positions = [i for i, x in enumerate(factors) if x.shape[1] > 1]
+    if len(candidate_positions) != 1:
+        return functools.reduce(operator.mul, factors).sum(dim=-1)
+
+    candidates = factors[candidate_positions[0]]
+    # shape: (batch_size, 1, d)
+    query = functools.reduce(operator.mul, [x for i, x in enumerate(factors) if i != candidate_positions[0]])
+    if candidates.shape[0] == 1:
+        # all batch elements share the same candidates: (batch_size, d) @ (d, num_candidates)
+        return query[:, 0, :] @ candidates[0].t()
+    return (query @ candidates.transpose(1, 2))[:, 0, :]
+
+
+def pairwise_distances(
+    x: torch.FloatTensor,
+    y: torch.FloatTensor,
+    p: Union[int, float] = 2,
+    squared: bool = False,
+) -> torch.FloatTensor:
+    r"""Compute the p-norm distances between all pairs of rows, without creating the tensor of all differences.
+
+    For the Euclidean distance, the squared distance is expanded to $\|x\|^2 + \|y\|^2 - 2 x^T y$, such that
+    all distances are computed by a single matrix multiplication. The squared distances are clamped to be
+    non-negative, since rounding errors may lead to small negative values for (almost) identical rows. For all other
+    norms, :func:`torch.cdist` is used, which computes the distances block-wise.
+
+    :param x: shape: (n, d)
+        The first set of vectors, e.g., the queries.
+    :param y: shape: (m, d)
+        The second set of vectors, e.g., all entity embeddings.
+    :param p:
+        The norm type.
+    :param squared:
+        Whether to return the squared distances.
+
+    :return: shape: (n, m)
+        The distances.
+    """
+    if p != 2:
+        distances = torch.cdist(x, y, p=p)
+        if squared:
+            distances = distances ** 2
+        return distances
+
+    squared_distances = (
+        (x ** 2).sum(dim=-1).unsqueeze(dim=1)
+        + (y ** 2).sum(dim=-1).unsqueeze(dim=0)
+        - 2 * x @ y.t()
+    ).clamp_min(0)
+    if squared:
+        return squared_distances
+    # Note: the lower bound avoids infinite gradients of the square root for (almost) identical vectors
+    return squared_distances.clamp_min(1.0e-30).sqrt()
+
+
 def clamp_norm(
     x: torch.Tensor,
     maxnorm: float,
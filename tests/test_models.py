@@ -9,6 +9,7 @@ import traceback
 import unittest
 from typing import Any, ClassVar, Mapping, Optional, Type
 
+import numpy
 import pytest
 import torch
 from click.testing import CliRunner, Result
@@ -18,9 +19,12 @@ from torch.optim.adagrad import Adagrad
 
 import pykeen.experiments
 import pykeen.models
+import pykeen.regularizers
 from pykeen.datasets.kinships import KINSHIPS_TRAIN_PATH
 from pykeen.datasets.nations import NATIONS_TEST_PATH, NATIONS_TRAIN_PATH, Nations
-from pykeen.models.base import EntityEmbeddingModel, EntityRelationEmbeddingModel, Model, MultimodalModel, _extend_batch
+from pykeen.models.base import (
+    EntityEmbeddingModel, EntityRelationEmbeddingModel, Model, MultimodalModel, ProjectionCache, _extend_batch,
+)
 from pykeen.models.cli import build_cli_from_cls
 from pykeen.models.unimodal.rgcn import (
     inverse_indegree_edge_weights,
@@ -366,6 +370,110 @@ Traceback
         # check model constraints
         self._check_constraints()
 
+    def test_score_all_by_enumeration_sliced(self):
+        """Test that slicing the generic 1-to-all scoring does not change the scores."""
+        self.model.eval()
+        for method, batch in (
+            (Model.score_t, self.factory.mapped_triples[:self.batch_size, :2]),
+            (Model.score_h, self.factory.mapped_triples[:self.batch_size, 1:]),
+            (Model.score_r, self.factory.mapped_triples[:self.batch_size, [0, 2]]),
+        ):
+            batch = batch.to(self.model.device)
+            scores = method(self.model, batch, slice_size=4)
+            assert torch.allclose(scores, method(self.model, batch), atol=1e-06), method.__name__
+
+    def test_score_sliced(self):
+        """Test that every model supports slicing, and that it does not change the scores."""
+        self.model.eval()
+        assert self.model.can_slice_h and self.model.can_slice_r and self.model.can_slice_t
+        for name, batch in (
+            ('score_t', self.factory.mapped_triples[:self.batch_size, :2]),
+            ('score_h', self.factory.mapped_triples[:self.batch_size, 1:]),
+            ('score_r', self.factory.mapped_triples[:self.batch_size, [0, 2]]),
+        ):
+            batch = batch.to(self.model.device)
+            scores = getattr(self.model, f'{name}_sliced')(batch, slice_size=4)
+            assert torch.allclose(scores, getattr(self.model, name)(batch), atol=1e-05), name
+
+    def test_score_all_projection_cache(self):
+        """Test that cached projections in evaluation mode do not change the scores, and are cleared after updates."""
+        self.model.eval()
+        for name, batch in (
+            ('score_t', self.factory.mapped_triples[:self.batch_size, :2]),
+            ('score_h', self.factory.mapped_triples[:self.batch_size, 1:]),
+        ):
+            batch = batch.to(self.model.device)
+            expected_scores = getattr(self.model, name)(batch).detach()
+            with torch.no_grad():
+                for _ in range(2):
+                    scores = getattr(self.model, name)(batch)
+                    assert torch.allclose(scores, expected_scores, rtol=1.0e-04, atol=1.0e-04), name
+        self.model.post_parameter_update()
+        assert len(self.model.projection_cache) == 0
+
+    def test_score_candidates(self):
+        """Test that scoring candidates matches scoring the enumerated triples."""
+        self.model.eval()
+        num_candidates = 5
+        batch = self.factory.mapped_triples[:self.batch_size].to(self.model.device)
+        for name, pairs, dim in (
+            ('score_t_candidates', batch[:, :2], 2),
+            ('score_h_candidates', batch[:, 1:], 0),
+        ):
+            for candidates in (
+                # shared by all pairs
+                torch.randint(self.factory.num_entities, size=(num_candidates,), device=self.model.device),
+                # for each pair
+                torch.randint(
+                    self.factory.num_entities,
+                    size=(self.batch_size, num_candidates),
+                    device=self.model.device,
+                ),
+            ):
+                with torch.no_grad():
+                    scores = getattr(self.model, name)(pairs, candidates)
+                    expected_scores = self.model._score_candidates_by_enumeration(
+                        batch=pairs,
+                        candidates=candidates,
+                        dim=dim,
+                    )
+                assert scores.shape == (self.batch_size, num_candidates)
+                assert torch.allclose(scores, expected_scores, rtol=1.0e-04, atol=1.0e-04), name
+
+        # the enumeration matches score_hrt
+        candidates = batch[:, 2:]
+        with torch.no_grad():
+            assert torch.allclose(
+                self.model.score_t_candidates(batch[:, :2], candidates),
+                self.model.score_hrt(batch),
+                rtol=1.0e-04,
+                atol=1.0e-04,
+            )
+
+    def test_predict_novelty(self):
+        """Test that the predictions for a known pair mark exactly the known triples as not novel."""
+        h, r, t = self.factory.mapped_triples[0].tolist()
+        entity_labels = self.factory.entity_labels
+        relation_label = self.factory.relation_labels[r]
+        known_tails = {
+            tail_id
+            for head_id, relation_id, tail_id in self.factory.mapped_triples.tolist()
+            if head_id == h and relation_id == r
+        }
+        known_heads = {
+            head_id
+            for head_id, relation_id, tail_id in self.factory.mapped_triples.tolist()
+            if relation_id == r and tail_id == t
+        }
+        self.model.eval()
+        df = self.model.predict_tails(entity_labels[h], relation_label)
+        self.assertEqual(self.factory.num_entities, df.shape[0])
+        self.assertEqual(known_tails, set(df.loc[~df['novel'], 'tail_id']))
+        df = self.model.predict_heads(relation_label, entity_labels[t], remove_known=True)
+        self.assertEqual(self.factory.num_entities - len(known_heads), df.shape[0])
+        self.assertNotIn('novel', df.columns)
+        self.assertFalse(known_heads.intersection(df['head_id']))
+
     def _check_constraints(self):
         """Check model constraints."""
 
@@ -453,12 +561,60 @@ class _DistanceModelTestCase(_ModelTestCase):
         # Distance-based model
         assert (scores <= 0.0).all()
 
+    def test_score_all_with_large_embeddings(self):
+        """Test the 1-to-N scoring against the explicit scoring, for embeddings which violate the constraints."""
+        with torch.no_grad():
+            for parameter in self.model.parameters():
+                parameter.mul_(3.)
+        self.model.eval()
+        for method, batch in (
+            ('score_t', self.factory.mapped_triples[:self.batch_size, :2]),
+            ('score_h', self.factory.mapped_triples[:self.batch_size, 1:]),
+        ):
+            batch = batch.to(self.model.device)
+            scores = getattr(self.model, method)(batch)
+            expected_scores = getattr(super(self.model.__class__, self.model), method)(batch)
+            assert torch.allclose(scores, expected_scores, rtol=1.0e-04, atol=1.0e-04), method
+
 
 class TestComplex(_ModelTestCase, unittest.TestCase):
     """Test the ComplEx model."""
 
     model_cls = pykeen.models.ComplEx
 
+    def test_score_all_sliced(self):
+        """Test that slicing does not change the scores of score_t and score_h."""
+        self.model.eval()
+        for method, batch in (
+            (self.model.score_t, self.factory.mapped_triples[:self.batch_size, :2]),
+            (self.model.score_h, self.factory.mapped_triples[:self.batch_size, 1:]),
+        ):
+            batch = batch.to(self.model.device)
+            assert torch.allclose(method(batch), method(batch, slice_size=4), atol=1e-06)
+
+    def test_score_all_regularization(self):
+        """Test that score_t regularizes the same as scoring all triples explicitly."""
+        self.assertIsInstance(self.model.regularizer, pykeen.regularizers.LpRegularizer)
+        self.model.train()
+        batch = self.factory.mapped_triples[:self.batch_size, :2].to(self.model.device)
+        self.model.score_t(batch)
+        term = self.model.regularizer.regularization_term.clone()
+        self.model.regularizer.reset()
+        super(self.model.__class__, self.model).score_t(batch)
+        assert torch.allclose(term, self.model.regularizer.regularization_term)
+
+    def test_enumeration_regularization_slice_size(self):
+        """Test that the generic 1-to-all scoring collects one regularization term independent of the slice size."""
+        self.model.train()
+        batch = self.factory.mapped_triples[:self.batch_size, :2].to(self.model.device)
+        terms = []
+        for slice_size in (None, 4, 5):
+            self.model.regularizer.reset()
+            pykeen.models.base.Model.score_t(self.model, batch, slice_size=slice_size)
+            terms.append(self.model.regularizer.regularization_term.clone())
+        for term in terms[1:]:
+            assert torch.allclose(terms[0], term, atol=1e-06)
+
 
 class TestConvE(_ModelTestCase, unittest.TestCase):
     """Test the ConvE model."""
@@ -488,6 +644,22 @@ class TestConvKB(_ModelTestCase, unittest.TestCase):
     # two bias terms, one conv-filter
     num_constant_init = 3
 
+    def test_score_all_factorized(self):
+        """Test the factorized score_t and score_h for random filters, with and without slicing."""
+        with torch.no_grad():
+            self.model.conv.weight.normal_(generator=self.generator)
+            self.model.conv.bias.normal_(generator=self.generator)
+        self.model.eval()
+        for method, batch in (
+            ('score_t', self.factory.mapped_triples[:self.batch_size, :2]),
+            ('score_h', self.factory.mapped_triples[:self.batch_size, 1:]),
+        ):
+            batch = batch.to(self.model.device)
+            expected_scores = getattr(super(self.model.__class__, self.model), method)(batch)
+            for slice_size in (None, 4):
+                scores = getattr(self.model, method)(batch, slice_size=slice_size)
+                assert torch.allclose(scores, expected_scores, atol=1e-06), (method, slice_size)
+
 
 class TestDistMult(_ModelTestCase, unittest.TestCase):
     """Test the DistMult model."""
@@ -579,7 +751,7 @@ class _BaseNTNTest(_ModelTestCase, unittest.TestCase):
     def test_can_slice(self):
         """Test that the slicing properties are calculated correctly."""
         self.assertTrue(self.model.can_slice_h)
-        self.assertFalse(self.model.can_slice_r)
+        self.assertTrue(self.model.can_slice_r)
         self.assertTrue(self.model.can_slice_t)
 
 
@@ -626,6 +798,34 @@ class _TestRGCN(_ModelTestCase):
         """
         assert self.model.enriched_embeddings is None
 
+    def test_enrich_embeddings_relation_loop(self):
+        """Test that the vectorized message passing matches a loop over the relations."""
+        self.model.eval()
+        with torch.no_grad():
+            x = self.model.base_embeddings
+            sources, targets, edge_types = self.model.sources, self.model.targets, self.model.edge_types
+            for i in range(self.model.num_layers):
+                new_x = torch.zeros_like(x)
+                for r in range(self.model.num_relations):
+                    mask = edge_types == r
+                    sources_r, targets_r = sources[mask], targets[mask]
+                    sources_r, targets_r = torch.cat([sources_r, targets_r]), torch.cat([targets_r, sources_r])
+                    m_r = x[sources_r] @ self.model._get_relation_weights(i_layer=i, r=r)
+                    if self.model.edge_weighting is not None:
+                        m_r *= self.model.edge_weighting(source=sources_r, target=targets_r).unsqueeze(dim=-1)
+                    new_x.index_add_(dim=0, index=targets_r, source=m_r)
+                new_x += x @ self.model._get_relation_weights(i_layer=i, r=self.model.num_relations)
+                if self.model.use_bias:
+                    new_x += self.model.biases[i]
+                if self.model.use_batch_norm:
+                    new_x = self.model.batch_norms[i](new_x)
+                x = self.model.activations[i](new_x)
+            enriched = self.model._enrich_embeddings()
+        assert torch.allclose(enriched, x, atol=1.0e-05)
+
+        # the prepared edges of the full graph are cached
+        assert self.model._get_edges() is self.model._get_edges()
+
 
 class TestRGCNBasis(_TestRGCN, unittest.TestCase):
     """Test the R-GCN model."""
@@ -651,6 +851,57 @@ class TestRGCNBlock(_TestRGCN, unittest.TestCase):
     num_constant_init = 4
 
 
+class TestRGCNNeighborSampling(_TestRGCN, unittest.TestCase):
+    """Test the R-GCN model with neighbour sampling."""
+
+    model_kwargs = {
+        'num_neighbors': 3,
+        'inference_chunk_size': 17,
+    }
+    #: one bias per layer
+    num_constant_init = 2
+
+    def test_enrich_subgraph(self):
+        """Test that the subgraph enrichment matches the full enrichment if all neighbours are sampled."""
+        self.model.eval()
+        # sampling with replacement draws all neighbours with high probability
+        self.model.num_neighbors = 10_000
+        batch = self.factory.mapped_triples[:self.batch_size]
+        with torch.no_grad():
+            x, local_batch = self.model._enrich_subgraph(batch=batch)
+            enriched = self.model._enrich_embeddings()
+        assert x.shape[0] <= self.factory.num_entities
+        assert (local_batch[:, 1] == batch[:, 1]).all()
+        for column in (0, 2):
+            assert torch.allclose(x[local_batch[:, column]], enriched[batch[:, column]], atol=1.0e-05)
+
+    def test_train_subgraph(self):
+        """Test training on a graph which is larger than the sampled neighbourhoods."""
+        num_entities = 500
+        triples_factory = TriplesFactory(triples=numpy.asarray(
+            [
+                [f'e{i}', f'r{i % 3}', f'e{j}']
+                for i in range(num_entities)
+                for j in ((i + 1) % num_entities, (7 * i + 3) % num_entities)
+            ],
+            dtype=str,
+        ))
+        # the default number of bases exceeds the number of relations
+        model = self.model_cls(triples_factory, embedding_dim=16, num_neighbors=2, num_bases_or_blocks=2).to_device_()
+        trained_with = []
+        for optimizer_cls in (SGD, optim.Adam, Adagrad):
+            loop = SLCWATrainingLoop(
+                model=model,
+                optimizer=optimizer_cls(params=model.get_grad_params(), lr=0.001),
+            )
+            losses = loop.train(num_epochs=1, batch_size=64)
+            assert len(losses) == 1 and numpy.isfinite(losses[0])
+            # the decoder's entity embeddings keep their shape
+            assert model.base_model.entity_embeddings.weight.shape == (num_entities, 16)
+            trained_with.append(optimizer_cls)
+        assert trained_with == [SGD, optim.Adam, Adagrad]
+
+
 class TestRotatE(_ModelTestCase, unittest.TestCase):
     """Test the RotatE model."""
 
@@ -840,6 +1091,23 @@ class TestTransD(_DistanceModelTestCase, unittest.TestCase):
         assert (torch.norm(e_bot, dim=-1, p=2) <= 1.0 + 1.0e-06).all()
 
 
+class TestTransDSmallRelationDim(TestTransD):
+    """Test the TransD model with a relation dimension smaller than the entity dimension."""
+
+    model_kwargs = {
+        'relation_dim': 2,
+    }
+
+
+class TestTransEL2(_DistanceModelTestCase, unittest.TestCase):
+    """Test the TransE model with the L2 norm."""
+
+    model_cls = pykeen.models.TransE
+    model_kwargs = {
+        'scoring_fct_norm': 2,
+    }
+
+
 class TestTransE(_DistanceModelTestCase, unittest.TestCase):
     """Test the TransE model."""
 
@@ -925,6 +1193,19 @@ class TestTuckEr(_ModelTestCase, unittest.TestCase):
     #: 2xBN (bias & scale)
     num_constant_init = 4
 
+    def test_score_h_factorized(self):
+        """Test that the factorized score_h in evaluation mode matches the explicit computation."""
+        generator = torch.manual_seed(42)
+        for bn in (self.model.bn_0, self.model.bn_1):
+            for tensor in (bn.running_mean, bn.weight.data, bn.bias.data):
+                tensor.copy_(torch.rand(tensor.shape, generator=generator))
+            bn.running_var.copy_(torch.rand(bn.running_var.shape, generator=generator) + 0.5)
+        self.model.eval()
+        batch = self.factory.mapped_triples[:self.batch_size, 1:].to(self.model.device)
+        scores_h = self.model.score_h(batch)
+        scores_hrt = super(self.model.__class__, self.model).score_h(batch)
+        assert torch.allclose(scores_h, scores_hrt, atol=1e-05)
+
 
 class TestUM(_DistanceModelTestCase, unittest.TestCase):
     """Test the Unstructured Model."""
@@ -1042,6 +1323,35 @@ def test_extend_batch():
         assert actual_content == exp_content
 
 
+def test_projection_cache():
+    """Test the LRU eviction and the memory budget of :class:`ProjectionCache`."""
+    # each entry occupies 4 * 4 = 16 bytes
+    cache = ProjectionCache(max_entries=2, max_bytes=40)
+    for key in (0, 1, 0, 2):
+        cache.get(key=key, compute=lambda: [torch.zeros(4)])
+    assert (cache.hits, cache.misses) == (1, 3)
+    # 1 was the least recently used entry
+    assert set(cache._data.keys()) == {0, 2}
+    assert cache.num_bytes == 32
+
+    # values exceeding the budget are not stored
+    cache.get(key=3, compute=lambda: [torch.zeros(16)])
+    assert len(cache) == 2
+
+    # the budget is enforced by evicting entries
+    cache.get(key=4, compute=lambda: [torch.zeros(7)])
+    assert set(cache._data.keys()) == {4}
+
+    cache.clear()
+    assert len(cache) == 0 and cache.num_bytes == 0
+
+    # scoped usage releases the cached tensors on exit
+    with cache:
+        cache.get(key=0, compute=lambda: [torch.zeros(4)])
+        assert len(cache) == 1
+    assert len(cache) == 0 and cache.num_bytes == 0
+
+
 class MessageWeightingTests(unittest.TestCase):
     """unittests for message weighting."""
 
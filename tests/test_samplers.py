@@ -9,7 +9,9 @@ import numpy
 import torch
 
 from pykeen.datasets import Nations
-from pykeen.sampling import BasicNegativeSampler, BernoulliNegativeSampler, NegativeSampler
+from pykeen.sampling import BasicNegativeSampler, BernoulliNegativeSampler, NegativeSampler, UnigramNegativeSampler
+from pykeen.sampling.negative_sampler import _check_packable
+from pykeen.sampling.unigram_negative_sampler import _build_alias_table
 from pykeen.training.schlichtkrull_sampler import GraphSampler, _compute_compressed_adjacency_list
 from pykeen.triples import SLCWAInstances, TriplesFactory
 
@@ -84,6 +86,72 @@ class _NegativeSamplingTestCase:
         assert scaled_negative_batch.shape[0] == self.positive_batch.shape[0] * self.num_negs_per_pos
         assert scaled_negative_batch.shape[1] == self.positive_batch.shape[1]
 
+    def test_sample_with_head_mask(self) -> None:
+        """Test that the head mask reports the corrupted side of each negative triple."""
+        negative_batch, head_mask = self.scaling_negative_sampler.sample_with_head_mask(
+            positive_batch=self.positive_batch,
+        )
+        positive_batch = self.positive_batch.repeat(self.num_negs_per_pos, 1)
+        assert head_mask.shape == (negative_batch.shape[0],)
+        assert (negative_batch[head_mask, 0] != positive_batch[head_mask, 0]).all()
+        assert (negative_batch[head_mask, 1:] == positive_batch[head_mask, 1:]).all()
+        assert (negative_batch[~head_mask, :2] == positive_batch[~head_mask, :2]).all()
+        assert (negative_batch[~head_mask, 2] != positive_batch[~head_mask, 2]).all()
+
+    def test_sample_filtered(self) -> None:
+        """Test that filtering resamples negatives which are training triples."""
+        negative_sampler = self.negative_sampling_cls(
+            triples_factory=self.triples_factory,
+            num_negs_per_pos=self.num_negs_per_pos,
+            filtered=True,
+        )
+        torch.manual_seed(self.seed)
+        negative_batch = negative_sampler.sample(positive_batch=self.positive_batch)
+        assert negative_batch.shape == (self.batch_size * self.num_negs_per_pos, 3)
+
+        # check that all elements got corrupted
+        assert (negative_batch != self.positive_batch.repeat(self.num_negs_per_pos, 1)).any(dim=1).all()
+
+        # In Nations, some (h, r) pairs have all other entities as known tails, such that no valid negative exists,
+        # and some known triples may remain after the last round. They are reported as false negatives.
+        known = set(map(tuple, self.triples_factory.mapped_triples.tolist()))
+        num_false_negatives = sum(triple in known for triple in map(tuple, negative_batch.tolist()))
+        assert negative_sampler._is_known(negative_batch).sum().item() == num_false_negatives
+        assert negative_sampler._is_known(self.positive_batch).all()
+
+        # check the statistics, which are reset afterwards
+        statistics = negative_sampler.pop_filter_statistics()
+        assert 0 <= statistics['filter_rejection_rate'] <= 1
+        assert statistics['filter_false_negatives'] == num_false_negatives
+        assert num_false_negatives <= statistics['filter_rejection_rate'] * negative_batch.shape[0]
+        assert negative_sampler.pop_filter_statistics() == {}
+
+    def test_is_known_unused_ids(self) -> None:
+        """Test the membership check if the mapping contains IDs which do not occur in the triples."""
+        triples_factory = TriplesFactory(
+            triples=numpy.asarray([['a', 'r', 'd'], ['d', 's', 'b']], dtype=str),
+            entity_to_id={'a': 0, 'b': 1, 'c': 2, 'd': 3},
+            relation_to_id={'r': 0, 's': 1, 't': 2},
+        )
+        assert triples_factory.num_entities < len(triples_factory.entity_to_id)
+        negative_sampler = self.negative_sampling_cls(triples_factory=triples_factory, filtered=True)
+        triples = torch.cartesian_prod(torch.arange(4), torch.arange(3), torch.arange(4))
+        known = set(map(tuple, triples_factory.mapped_triples.tolist()))
+        expected = [triple in known for triple in map(tuple, triples.tolist())]
+        assert negative_sampler._is_known(triples).tolist() == expected
+
+    def test_sample_shared(self) -> None:
+        """Test sampling one pool of negative entities for the whole batch."""
+        negative_entities, head_mask = self.scaling_negative_sampler.sample_shared(positive_batch=self.positive_batch)
+
+        # check shape
+        assert negative_entities.shape == (self.num_negs_per_pos,)
+        assert head_mask.shape == (self.batch_size,)
+        assert head_mask.dtype == torch.bool
+
+        # check bounds
+        assert _array_check_bounds(negative_entities, low=0, high=self.triples_factory.num_entities)
+
 
 class BasicNegativeSamplerTest(_NegativeSamplingTestCase, unittest.TestCase):
     """Test the basic negative sampler."""
@@ -107,6 +175,12 @@ class BasicNegativeSamplerTest(_NegativeSamplingTestCase, unittest.TestCase):
         assert num_subj_corrupted - 1 <= self.positive_batch.shape[0]
         assert half_size - 1 <= num_subj_corrupted
 
+    def test_check_packable(self):
+        """Test that filtering refuses graphs whose packed triples overflow int64."""
+        _check_packable(num_entities=2 ** 31, num_relations=2)
+        with self.assertRaises(ValueError):
+            _check_packable(num_entities=2 ** 31, num_relations=3)
+
 
 class BernoulliNegativeSamplerTest(_NegativeSamplingTestCase, unittest.TestCase):
     """Test the Bernoulli negative sampler."""
@@ -122,6 +196,43 @@ class BernoulliNegativeSamplerTest(_NegativeSamplingTestCase, unittest.TestCase)
         assert (self.positive_batch[:, 1] == negative_batch[:, 1]).all()
 
 
+class UnigramNegativeSamplerTest(_NegativeSamplingTestCase, unittest.TestCase):
+    """Test the unigram negative sampler."""
+
+    negative_sampling_cls = UnigramNegativeSampler
+
+    def test_alias_table(self):
+        """Test that the alias table represents the distribution."""
+        probabilities = torch.rand(17)
+        probabilities = probabilities / probabilities.sum()
+        keep_probability, alias = _build_alias_table(probabilities=probabilities)
+
+        # every bucket has mass 1 / n, which is distributed among the bucket and its alias
+        reconstructed = torch.zeros_like(probabilities)
+        reconstructed.index_add_(0, torch.arange(17), keep_probability / 17)
+        reconstructed.index_add_(0, alias, (1 - keep_probability) / 17)
+        assert torch.allclose(reconstructed, probabilities, atol=1.0e-06)
+
+    def test_sample_unigram(self):
+        """Test that the entities are drawn from the frequency distribution."""
+        generator_state = torch.get_rng_state()
+        torch.manual_seed(self.seed)
+        num_samples = 200_000
+        empirical = torch.bincount(
+            self.negative_sampler._draw(num=num_samples, device=torch.device('cpu')),
+            minlength=self.triples_factory.num_entities,
+        ).float() / num_samples
+        torch.set_rng_state(generator_state)
+        assert torch.allclose(empirical, self.negative_sampler.probabilities, atol=1.0e-02)
+
+        # alpha = 0 is the uniform distribution
+        negative_sampler = self.negative_sampling_cls(triples_factory=self.triples_factory, alpha=0.0)
+        assert torch.allclose(
+            negative_sampler.probabilities,
+            torch.full_like(negative_sampler.probabilities, fill_value=1 / self.triples_factory.num_entities),
+        )
+
+
 class GraphSamplerTest(unittest.TestCase):
     """Test the GraphSampler."""
 
@@ -10,10 +10,13 @@ from torch import optim
 
 from pykeen.datasets import Nations
 from pykeen.losses import CrossEntropyLoss
-from pykeen.models import ConvE, TransE
+from pykeen.models import ConvE, ERMLP, TransE
 from pykeen.models.base import Model
 from pykeen.training import SLCWATrainingLoop
-from pykeen.training.training_loop import NonFiniteLossError, TrainingApproachLossMismatchError
+from pykeen.training.training_loop import (
+    NonFiniteLossError, TrainingApproachLossMismatchError, _updates_only_used_rows,
+)
+from pykeen.training.utils import PermutationBatchSampler
 from pykeen.typing import MappedTriples
 
 
@@ -121,3 +124,121 @@ class TrainingLoopTests(unittest.TestCase):
         )
         with self.assertRaises(TrainingApproachLossMismatchError):
             NaNTrainingLoop(model=model, patience=2)
+
+    def test_batch_shared_negatives(self):
+        """Test training with one pool of negative entities shared by the whole batch."""
+        model = TransE(triples_factory=self.triples_factory, automatic_memory_optimization=False)
+        training_loop = SLCWATrainingLoop(
+            model=model,
+            optimizer=optim.Adam(lr=0.01, params=model.get_grad_params()),
+            negative_sampler_kwargs=dict(num_negs_per_pos=7, batch_shared=True),
+        )
+        positive_batch = self.triples_factory.mapped_triples[:self.batch_size]
+        positive_scores, negative_scores = training_loop._score_batch_shared(positive_batch=positive_batch)
+        assert positive_scores.shape == (self.batch_size, 1)
+        assert negative_scores.shape == (7 * self.batch_size, 1)
+        losses = training_loop.train(num_epochs=2, batch_size=self.batch_size)
+        assert len(losses) == 2
+
+    def test_factorized_scoring(self):
+        """Test that scoring with encoding each (head, relation) pair once matches scoring the single triples."""
+        assert ERMLP.factorizes_hr
+        for triples_factory in (self.triples_factory, Nations(create_inverse_triples=True).training):
+            # By default, each negative is scored like the triple itself, also if inverse triples were created
+            model = ERMLP(triples_factory=triples_factory, automatic_memory_optimization=False, random_seed=42)
+            positive_batch = triples_factory.mapped_triples[:self.batch_size]
+            training_loop = SLCWATrainingLoop(model=model, negative_sampler_kwargs=dict(num_negs_per_pos=3))
+            # seed the sampler, such that the test does not depend on the other tests
+            torch.manual_seed(42)
+            negative_batch, head_mask = training_loop.negative_sampler.sample_with_head_mask(
+                positive_batch=positive_batch,
+            )
+            positive_scores, negative_scores = training_loop._score_factorized(
+                positive_batch=positive_batch,
+                negative_batch=negative_batch,
+                head_mask=head_mask,
+            )
+            assert torch.allclose(positive_scores, model.score_hrt(positive_batch), rtol=1.0e-04, atol=1.0e-04)
+            assert torch.allclose(negative_scores, model.score_hrt(negative_batch), rtol=1.0e-04, atol=1.0e-04)
+
+        # On request, head corruptions are scored as tail corruptions of the inverse triples
+        training_loop = SLCWATrainingLoop(
+            model=model,
+            negative_sampler_kwargs=dict(num_negs_per_pos=3),
+            use_inverse_for_head_corruption=True,
+        )
+        inverse_relation_ids = training_loop._get_inverse_relation_ids()
+        assert (inverse_relation_ids[inverse_relation_ids] == torch.arange(triples_factory.num_relations)).all()
+        torch.manual_seed(42)
+        negative_batch, head_mask = training_loop.negative_sampler.sample_with_head_mask(positive_batch=positive_batch)
+        _, negative_scores = training_loop._score_factorized(
+            positive_batch=positive_batch,
+            negative_batch=negative_batch,
+            head_mask=head_mask,
+        )
+        inverse_batch = torch.stack([
+            negative_batch[:, 2],
+            inverse_relation_ids[negative_batch[:, 1]],
+            negative_batch[:, 0],
+        ], dim=-1)
+        for mask, batch in ((head_mask, inverse_batch), (~head_mask, negative_batch)):
+            assert torch.allclose(negative_scores[mask], model.score_hrt(batch[mask]), rtol=1.0e-04, atol=1.0e-04)
+
+    def test_constrain_touched_rows(self):
+        """Test that the constraints are only enforced on the rows marked by the training loop."""
+        model = TransE(triples_factory=self.triples_factory, automatic_memory_optimization=False)
+        training_loop = SLCWATrainingLoop(model=model, optimizer=optim.SGD(lr=1.0, params=model.parameters()))
+
+        # violate the unit norm constraint for all entities
+        model.entity_embeddings.weight.data.mul_(2.)
+
+        batch = self.triples_factory.mapped_triples[:2]
+        training_loop._mark_touched(entity_ids=batch[:, [0, 2]], relation_ids=batch[:, 1])
+        touched_ids = training_loop._get_touched_ids()
+        assert set(touched_ids['entity_ids'].tolist()) == set(batch[:, [0, 2]].view(-1).tolist())
+        model.post_parameter_update(**touched_ids)
+
+        norms = model.entity_embeddings.weight.norm(p=2, dim=-1)
+        touched = torch.zeros(model.num_entities, dtype=torch.bool)
+        touched[touched_ids['entity_ids']] = True
+        assert torch.allclose(norms[touched], torch.ones_like(norms[touched]))
+        assert torch.allclose(norms[~touched], 2 * torch.ones_like(norms[~touched]))
+
+        # LCWA scores all entities, such that all rows are marked
+        training_loop._mark_touched(entity_ids=None, relation_ids=batch[:, 1])
+        assert training_loop._get_touched_ids()['entity_ids'] is None
+
+    def test_constrain_touched_rows_default(self):
+        """Test that only optimizers which leave unused rows unchanged constrain the touched rows by default."""
+        params = list(TransE(triples_factory=self.triples_factory).get_grad_params())
+        assert _updates_only_used_rows(optim.SGD(params=params, lr=1.0))
+        assert not _updates_only_used_rows(optim.SGD(params=params, lr=1.0, momentum=0.9))
+        assert not _updates_only_used_rows(optim.SGD(params=params, lr=1.0, weight_decay=0.1))
+        assert not _updates_only_used_rows(optim.Adam(params=params, lr=1.0))
+        assert not _updates_only_used_rows(optim.Adagrad(params=params, lr=1.0))
+
+    def test_permutation_batch_sampler(self):
+        """Test that the batch sampler yields each instance exactly once per epoch, in whole batches."""
+        num_instances = self.triples_factory.num_triples
+        sampler = PermutationBatchSampler(num_instances=num_instances, batch_size=self.batch_size)
+        batches = list(sampler)
+        assert len(batches) == len(sampler)
+        assert all(batch.shape == (self.batch_size,) for batch in batches[:-1])
+        assert sorted(torch.cat(batches).tolist()) == list(range(num_instances))
+
+        # the batches can be used to gather the instances directly
+        model = TransE(triples_factory=self.triples_factory, automatic_memory_optimization=False)
+        training_loop = SLCWATrainingLoop(model=model)
+        training_loop.training_instances = training_loop._create_instances()
+        data_loader = training_loop._create_data_loader(
+            batch_size=self.batch_size,
+            sampler=None,
+            shuffle=False,
+            num_workers=0,
+        )
+        batch = next(iter(data_loader))
+        assert (batch == self.triples_factory.mapped_triples[:self.batch_size]).all()
+
+        # incomplete batches can be dropped
+        sampler = PermutationBatchSampler(num_instances=num_instances, batch_size=self.batch_size, drop_last=True)
+        assert len(sampler) == num_instances // self.batch_size == len(list(sampler))
@@ -2,15 +2,23 @@
 
 """Unit tests for triples factories."""
 
+import gzip
+import os
+import shutil
+import tempfile
 import unittest
+from unittest import mock
 
 import numpy as np
 
 from pykeen.datasets import Nations
+from pykeen.datasets.nations import NATIONS_TRAIN_PATH
 from pykeen.triples import TriplesFactory, TriplesNumericLiteralsFactory
 from pykeen.triples.triples_factory import (
-    INVERSE_SUFFIX, _tf_cleanup_all, _tf_cleanup_deterministic, _tf_cleanup_randomized,
+    INVERSE_SUFFIX, _create_multi_label_instances, _map_labels_to_ids, _tf_cleanup_all, _tf_cleanup_deterministic,
+    _tf_cleanup_randomized,
 )
+from pykeen.triples.utils import _load_triples_chunked, load_triples
 
 triples = np.array(
     [
@@ -117,6 +125,262 @@ class TestTriplesFactory(unittest.TestCase):
         }
         self.assertEqual(reference_relation_to_id, factory.relation_to_id)
 
+    def test_inverse_triples_in_id_space(self):
+        """Test that creating inverse triples in ID space matches creating them from labels."""
+        factory = TriplesFactory(triples=triples, create_inverse_triples=True)
+        inverse_triples = np.stack([triples[:, 2], np.char.add(triples[:, 1], INVERSE_SUFFIX), triples[:, 0]], axis=-1)
+        reference = TriplesFactory(triples=np.concatenate([triples, inverse_triples]))
+        self.assertEqual(reference.relation_to_id, factory.relation_to_id)
+        self.assertEqual(reference.entity_to_id, factory.entity_to_id)
+        self.assertEqual(reference.mapped_triples.tolist(), factory.mapped_triples.tolist())
+        # the inverse labels are created on demand
+        self.assertEqual(
+            set(map(tuple, reference.triples.tolist())),
+            set(map(tuple, factory.triples.tolist())),
+        )
+
+    def test_compact_mode(self):
+        """Test that a factory without labeled triples behaves like a normal one."""
+        reference = TriplesFactory(triples=triples, create_inverse_triples=True)
+        factory = TriplesFactory(triples=triples, create_inverse_triples=True, keep_labeled_triples=False)
+        self.assertIsNone(factory._triples)
+        self.assertEqual(reference.mapped_triples.tolist(), factory.mapped_triples.tolist())
+        self.assertEqual(
+            set(map(tuple, reference.triples.tolist())),
+            set(map(tuple, factory.triples.tolist())),
+        )
+        # the labeled triples are reconstructed on demand, but not kept
+        self.assertIsNone(factory._triples)
+        for split_factory in factory.split(0.5, random_state=0):
+            self.assertFalse(split_factory.keep_labeled_triples)
+
+    def test_new_with_relations(self):
+        """Test that restricting the relations in ID space matches restricting the labeled triples."""
+        factory = Nations().training
+        relations = factory.get_most_frequent_relations(n=5)
+        self.assertEqual(5, len(relations))
+        idx = np.isin(factory.triples[:, 1], list(relations))
+        for new_factory, reference in (
+            (factory.new_with_relations(relations), TriplesFactory(triples=factory.triples[idx])),
+            (factory.new_without_relations(relations), TriplesFactory(triples=factory.triples[~idx])),
+        ):
+            self.assertEqual(reference.entity_to_id, new_factory.entity_to_id)
+            self.assertEqual(reference.relation_to_id, new_factory.relation_to_id)
+            self.assertEqual(reference.mapped_triples.tolist(), new_factory.mapped_triples.tolist())
+        self.assertEqual(
+            set(map(tuple, factory.triples[idx].tolist())),
+            set(map(tuple, factory.get_triples_for_relations(relations).tolist())),
+        )
+
+    def test_new_with_relations_inverse(self):
+        """Test that restricting the relations keeps the inverse relations and their triples consistent."""
+        factory = Nations(create_inverse_triples=True).training
+        relation = next(iter(factory.relation_to_inverse))
+        new_factory = factory.new_with_relations({relation})
+        self.assertEqual(2, new_factory.num_relations)
+        self.assertEqual(new_factory.num_relations, len(new_factory.relation_to_id))
+        self.assertEqual(
+            2 * int((factory.triples[:, 1] == relation).sum()),
+            new_factory.num_triples,
+        )
+
+    def test_known_triples(self):
+        """Test the lookup of known heads and tails."""
+        factory = Nations().training
+        mapped_triples = factory.mapped_triples.tolist()
+        for h, r, t in mapped_triples[::100]:
+            self.assertEqual(
+                sorted(tail for head, relation, tail in mapped_triples if head == h and relation == r),
+                factory.get_known_tails(h, r).tolist(),
+            )
+            self.assertEqual(
+                sorted(head for head, relation, tail in mapped_triples if relation == r and tail == t),
+                factory.get_known_heads(r, t).tolist(),
+            )
+        # pairs which do not occur
+        self.assertEqual([], factory.get_known_tails(factory.num_entities, 0).tolist())
+        self.assertEqual([], factory.get_known_heads(factory.num_relations, 0).tolist())
+
+    def test_map_labels_to_ids(self):
+        """Test the vectorized mapping of labels to IDs."""
+        label_to_id = {'a': 0, 'c': 2, 'b': 1}
+        labels = np.array(['c', 'd', 'a', 'a', ''], dtype=np.str)
+        expected = [2, -1, 0, 0, -1]
+        self.assertEqual(expected, _map_labels_to_ids(labels, label_to_id).tolist())
+        self.assertEqual(expected, _map_labels_to_ids(labels.astype(object), label_to_id).tolist())
+        self.assertEqual([-1, -1], _map_labels_to_ids(np.array(['a', 'b']), {}).tolist())
+
+    def test_map_unknown_triples(self):
+        """Test that triples with unknown labels are excluded from the mapping."""
+        factory = TriplesFactory(triples=triples)
+        mapped_triples = factory.map_triples_to_id(np.array(
+            [
+                ['peter', 'likes', 'unknown'],
+                ['peter', 'hates', 'pizza'],
+                ['susan', 'likes', 'pizza'],
+            ],
+            dtype=np.str,
+        ))
+        expected = [
+            [factory.entity_to_id['susan'], factory.relation_to_id['likes'], factory.entity_to_id['pizza']],
+        ]
+        self.assertEqual(expected, mapped_triples.tolist())
+
+
+class TestLoadTriples(unittest.TestCase):
+    """Test loading triples from files."""
+
+    def setUp(self) -> None:
+        """Set up the test case with the reference result of numpy."""
+        self.expected = load_triples(NATIONS_TRAIN_PATH, backend='numpy').tolist()
+
+    def test_pandas(self):
+        """Test the pandas backend."""
+        self.assertEqual(self.expected, load_triples(NATIONS_TRAIN_PATH).tolist())
+
+    def test_parallel_chunks(self):
+        """Test parsing a file in many chunks in parallel."""
+        triples = _load_triples_chunked(NATIONS_TRAIN_PATH, num_workers=2, chunk_size=1024)
+        self.assertEqual(self.expected, triples.tolist())
+
+    def test_compressed(self):
+        """Test streaming a compressed file."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'train.txt.gz')
+            with open(NATIONS_TRAIN_PATH, 'rb') as source, gzip.open(path, 'wb') as target:
+                shutil.copyfileobj(source, target)
+            self.assertEqual(self.expected, load_triples(path).tolist())
+
+    def test_comments(self):
+        """Test that comment lines are skipped."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'triples.tsv')
+            with open(path, 'w') as file:
+                print('@Comment@ Head Relation Tail', file=file)
+                print('NA\tnull\tb', file=file)
+            self.assertEqual([['NA', 'null', 'b']], load_triples(path).tolist())
+
+    def test_malformed(self):
+        """Test that rows with less or more than three columns are rejected, like by the numpy backend."""
+        for line in ('a\tb', 'a\tb\tc\td', 'a\tb\tc\td\te'):
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, 'triples.tsv')
+                with open(path, 'w') as file:
+                    print('a\tb\tc', file=file)
+                    print(line, file=file)
+                for backend in ('pandas', 'numpy'):
+                    with self.assertRaises(ValueError, msg=(backend, line)):
+                        load_triples(path, backend=backend)
+
+
+class TestMultiLabelInstances(unittest.TestCase):
+    """Test grouping triples for LCWA."""
+
+    def test_grouping(self):
+        """Test grouping triples by (head, relation) pairs."""
+        mapped_triples = np.array([
+            [2, 0, 1],
+            [0, 1, 3],
+            [0, 1, 2],
+            [2, 0, 1],
+            [0, 0, 3],
+        ])
+        pairs, offsets, indices = _create_multi_label_instances(
+            mapped_triples,
+            element_1_index=0,
+            element_2_index=1,
+            label_index=2,
+        )
+        self.assertEqual([[0, 0], [0, 1], [2, 0]], pairs.tolist())
+        self.assertEqual([0, 1, 3, 4], offsets.tolist())
+        self.assertEqual([3, 2, 3, 1], indices.tolist())
+
+    def test_empty(self):
+        """Test grouping no triples."""
+        pairs, offsets, indices = _create_multi_label_instances(
+            np.empty(shape=(0, 3), dtype=np.int64),
+            element_1_index=1,
+            element_2_index=2,
+            label_index=0,
+        )
+        self.assertEqual((0, 2), pairs.shape)
+        self.assertEqual([0], offsets.tolist())
+        self.assertEqual(0, indices.shape[0])
+
+    def test_lcwa_batch(self):
+        """Test that the targets of a batch of LCWA instances match the targets of the single instances."""
+        instances = Nations().training.create_lcwa_instances()
+        indices = [5, 0, 17, 3]
+        batch_pairs, batch_targets = instances[indices]
+        for i, index in enumerate(indices):
+            pair, target = instances[index]
+            self.assertEqual(pair.tolist(), batch_pairs[i].tolist())
+            self.assertEqual(target.tolist(), batch_targets[i].tolist())
+
+        _, sparse_targets = instances.get_batch(indices, sparse=True)
+        self.assertEqual(batch_targets.tolist(), sparse_targets.to_dense().tolist())
+
+
+class TestBinary(unittest.TestCase):
+    """Test storing triples factories in the binary format."""
+
+    def test_round_trip(self):
+        """Test that a factory can be restored from its binary format."""
+        factory = TriplesFactory(triples=triples, create_inverse_triples=True)
+        with tempfile.TemporaryDirectory() as directory:
+            factory.to_binary(directory)
+            loaded_factory = TriplesFactory.from_binary(directory)
+
+        self.assertEqual(factory.entity_to_id, loaded_factory.entity_to_id)
+        self.assertEqual(factory.relation_to_id, loaded_factory.relation_to_id)
+        self.assertEqual(factory.mapped_triples.tolist(), loaded_factory.mapped_triples.tolist())
+        self.assertEqual(factory.num_entities, loaded_factory.num_entities)
+        self.assertEqual(factory.num_relations, loaded_factory.num_relations)
+        self.assertTrue(loaded_factory.create_inverse_triples)
+        self.assertEqual(
+            set(map(tuple, factory.triples.tolist())),
+            set(map(tuple, loaded_factory.triples.tolist())),
+        )
+
+    def test_shared_mapping(self):
+        """Test that a factory can be loaded with the mappings of another factory."""
+        factory = TriplesFactory(triples=triples)
+        with tempfile.TemporaryDirectory() as directory:
+            factory.to_binary(directory)
+            loaded_factory = TriplesFactory.from_binary(
+                directory,
+                entity_to_id=factory.entity_to_id,
+                relation_to_id=factory.relation_to_id,
+            )
+        self.assertIs(factory.entity_to_id, loaded_factory.entity_to_id)
+        self.assertIs(factory.relation_to_id, loaded_factory.relation_to_id)
+
+    def test_dataset_cache_reference(self):
+        """Test that the cached evaluation factories are specific to the training factory's index."""
+        reference = set(map(tuple, Nations(binary_cache=False).testing.triples.tolist()))
+        with tempfile.TemporaryDirectory() as directory, mock.patch('pykeen.datasets.base.PYKEEN_HOME', directory):
+            for create_inverse_triples in (False, True, False):
+                testing = Nations(create_inverse_triples=create_inverse_triples).testing
+                self.assertEqual(reference, set(map(tuple, testing.triples.tolist())))
+
+    def test_memory_map(self):
+        """Test using a factory whose mapped triples are memory-mapped."""
+        factory = Nations().training
+        with tempfile.TemporaryDirectory() as directory:
+            factory.to_binary(directory)
+            loaded_factory = TriplesFactory.from_binary(directory, memory_map=True)
+
+            self.assertEqual(factory.num_triples, loaded_factory.num_triples)
+            instances = loaded_factory.create_slcwa_instances()
+            self.assertEqual(factory.mapped_triples[:5].tolist(), instances[:5].tolist())
+
+            # the counts are taken from the metadata, and the split does not depend on the memory mapping
+            self.assertEqual(factory.num_entities, loaded_factory._num_entities)
+            self.assertEqual(factory.num_relations, loaded_factory._num_relations)
+            for a, b in zip(loaded_factory.split(0.8, random_state=0), factory.split(0.8, random_state=0)):
+                self.assertEqual(a.mapped_triples.tolist(), b.mapped_triples.tolist())
+            del loaded_factory, instances
+
 
 class TestSplit(unittest.TestCase):
     """Test splitting."""
@@ -165,6 +429,12 @@ class TestSplit(unittest.TestCase):
         t0, t1, t2 = self.triples_factory.split(ratios)
         self._test_invariants(t0, t1, t2)
 
+    def test_split_randomized_cleanup(self):
+        """Test splitting a factory in three with the randomized cleanup."""
+        ratios = 0.80, 0.10
+        t0, t1, t2 = self.triples_factory.split(ratios, random_state=0, randomize_cleanup=True)
+        self._test_invariants(t0, t1, t2)
+
     def test_cleanup_deterministic(self):
         """Test that triples in a test set can get moved properly to the training set."""
         training = np.array([
@@ -16,6 +16,8 @@ from pykeen.utils import (
     get_embedding_in_canonical_shape,
     get_until_first_blank,
     l2_regularization,
+    pairwise_distances,
+    tensor_product_sum,
 )
 
 
@@ -196,6 +198,67 @@ class EmbeddingsInCanonicalShapeTests(unittest.TestCase):
         self.assertEqual(set(id_remapping.values()), set(compacted_mapping.values()))
 
 
+class TensorProductSumTests(unittest.TestCase):
+    """Tests for tensor_product_sum."""
+
+    def setUp(self) -> None:
+        """Set up the tensors."""
+        generator = torch.manual_seed(42)
+        self.batch_size, self.num_candidates, self.dim = 3, 7, 5
+        self.query = [torch.rand(self.batch_size, 1, self.dim, generator=generator) for _ in range(2)]
+        self.shared_candidates = torch.rand(1, self.num_candidates, self.dim, generator=generator)
+        self.candidates = torch.rand(self.batch_size, self.num_candidates, self.dim, generator=generator)
+
+    def _test(self, *factors: torch.FloatTensor, shape) -> None:
+        scores = tensor_product_sum(*factors)
+        self.assertEqual(shape, tuple(scores.shape))
+        expected = (factors[0] * factors[1] * factors[2]).sum(dim=-1)
+        assert torch.allclose(expected, scores, atol=1.0e-06)
+
+    def test_single(self):
+        """Test scoring single triples."""
+        self._test(*self.query, self.candidates[:, :1, :], shape=(self.batch_size, 1))
+
+    def test_shared_candidates(self):
+        """Test scoring against candidates shared by all batch elements, at each position."""
+        self._test(*self.query, self.shared_candidates, shape=(self.batch_size, self.num_candidates))
+        self._test(self.shared_candidates, *self.query, shape=(self.batch_size, self.num_candidates))
+
+    def test_batch_candidates(self):
+        """Test scoring against separate candidates for each batch element."""
+        self._test(self.query[0], self.candidates, self.query[1], shape=(self.batch_size, self.num_candidates))
+
+
+class PairwiseDistancesTests(unittest.TestCase):
+    """Tests for pairwise_distances."""
+
+    def setUp(self) -> None:
+        """Set up the tensors."""
+        generator = torch.manual_seed(42)
+        self.x = 3 * torch.rand(5, 50, generator=generator)
+        self.y = 3 * torch.rand(11, 50, generator=generator)
+        # include a row which is identical to a query
+        self.y[3] = self.x[1]
+
+    def test_distances(self):
+        """Test the distances against the explicit computation, within tolerance."""
+        for p in (1, 2, 3, float('inf')):
+            for squared in (False, True):
+                distances = pairwise_distances(self.x, self.y, p=p, squared=squared)
+                expected = torch.norm(self.x[:, None, :] - self.y[None, :, :], p=p, dim=-1)
+                if squared:
+                    expected = expected ** 2
+                self.assertEqual((5, 11), tuple(distances.shape))
+                assert (distances >= 0).all()
+                assert torch.allclose(distances, expected, rtol=1.0e-05, atol=1.0e-03 if squared else 1.0e-02)
+
+    def test_gradient_for_identical_rows(self):
+        """Test that the Euclidean distance has a finite gradient for identical rows."""
+        x = self.x.clone().requires_grad_(True)
+        pairwise_distances(x, self.y, p=2).sum().backward()
+        assert torch.isfinite(x.grad).all()
+
+
 def test_clamp_norm():
     """Test  clamp_norm() ."""
     max_norm = 1.0